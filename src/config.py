@@ -1,6 +1,7 @@
 """Configuration module for video processing parameters and paths."""
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -11,34 +12,221 @@ class Config:
     Attributes:
         object_detection_model_path: Path to the object detection model file.
         pose_model_path: Path to the pose landmarker model file.
+        model_profile: None to use the model paths as given, 'accurate',
+            'balanced' or 'fast' for a fixed tier pair, or 'auto' to pick
+            the most accurate profile that reaches model_target_fps.
+        model_target_fps: Processing FPS the auto profile has to reach.
+        model_calibration_path: JSON file caching per-machine model latencies.
+        model_benchmark_frames: Frames timed per model when calibrating.
+        detection_backend: Runtime of the ball detection model: 'mediapipe'
+            (ObjectDetector), 'onnxruntime' or 'tflite' (interpreter).
+        detection_backend_model_path: Model file of the onnxruntime/tflite
+            backend; None uses object_detection_model_path.
+        detection_num_threads: Intra-op threads of the onnxruntime/tflite
+            backend; None uses the runtime default.
+        detection_ball_class_id: Class index of 'sports ball' in the
+            backend model's outputs.
         reference_video_path: Path to the reference video file.
         detect_every_n_frames: Number of frames between object detections.
         max_velocity: Maximum pixels the ball can move per frame.
+        max_velocity_px_per_s: Maximum ball speed in pixels per second;
+            replaces max_velocity when set. None converts max_velocity at
+            the source frame rate when frames are subsampled.
         min_cycle_duration: Minimum frames between dribble cycle troughs.
+        min_cycle_duration_ms: Minimum milliseconds between dribble cycle
+            troughs; replaces min_cycle_duration when set, with the same
+            conversion as max_velocity_px_per_s.
         contact_threshold_k: Control threshold multiplier for hand contact.
         dominant_hand_delta: Margin threshold for dominant hand detection.
         min_contact_window_frames: Minimum frames for meaningful contact.
+        min_contact_window_ms: Minimum duration of a meaningful contact;
+            replaces min_contact_window_frames when set, with the same
+            conversion as max_velocity_px_per_s.
         detection_score_threshold: Minimum confidence score for object detection.
-        detection_max_results: Maximum number of detection results.
+        detection_max_results: Maximum number of detection candidates per
+            call; the runners-up become tracking fallbacks. Default raised
+            from 1 to 5 with candidate selection; 1 disables fallbacks.
+        candidate_detector_weight: Selection weight of the detector score.
+        candidate_orange_weight: Selection weight of the bbox orange ratio.
+        candidate_motion_weight: Selection weight of closeness to the
+            motion-predicted ball center.
+        candidate_track_weight: Selection weight of IoU with the tracker box.
+        candidate_fallback_max_age: Frames a runner-up candidate stays usable
+            as a tracking fallback.
+        blob_fast_path: Try locating the ball from orange mask blobs before
+            calling the neural detector.
+        blob_search_radius_ratio: Search radius around the predicted center,
+            relative to the larger frame dimension.
+        blob_max_aspect: Maximum blob bbox aspect ratio.
+        blob_min_fill: Minimum blob area / bbox area (a disk fills ~0.785).
+        blob_min_circularity: Minimum 4*pi*area/perimeter^2 of the blob.
+        motion_proposals: Run the ball detector only on crops around moving
+            orange regions (MOG2 foreground AND orange mask) and fall back
+            to the full frame when they hold no valid ball. For fixed cameras.
+        motion_proposal_accept_blobs: Accept a single proposal blob that
+            passes the bbox checks without running the detector.
+        motion_proposal_width: Width the background model runs at.
+        motion_proposal_history: MOG2 history length in frames.
+        motion_proposal_var_threshold: MOG2 squared Mahalanobis distance
+            above which a pixel is foreground.
+        motion_proposal_warmup_frames: Frames the background model learns
+            before regions are proposed.
+        motion_proposal_min_area_ratio: Minimum blob area as a fraction of
+            the frame.
+        motion_proposal_padding: Padding on each side of a blob, relative to
+            its size, in the detector crop.
+        motion_proposal_min_size: Minimum detector crop side in pixels.
+        motion_proposal_max_regions: Largest blobs proposed per frame.
+        motion_proposal_max_area_ratio: Crops covering more of the frame
+            than this go straight to full-frame detection.
         min_ball_area_ratio: Minimum ball bbox area ratio relative to frame.
         max_ball_area_ratio: Maximum ball bbox area ratio relative to frame.
         min_orange_ratio: Minimum orange pixel ratio inside bbox.
+        orange_integral_after_queries: Bbox orange-ratio checks per frame
+            counted directly before a summed-area table is built.
         min_detect_track_iou: Minimum IoU to consider detect/track agreement.
         max_track_acceleration: Maximum pixel acceleration between frames.
         force_detect_frames: Frames to force detection after a rejection.
         tracking_grace_frames: Frames to hold last good ball center after rejection.
+        tracker_backend: Ball tracker: 'csrt' (most accurate), 'kcf' or
+            'mosse' (fastest).
         crossover_hand_gap_tolerance: Cycles to skip when counting hand transitions.
+        crossover_hand_gap_ms: Maximum time between two cycles with a known
+            hand for their hand change to count; replaces
+            crossover_hand_gap_tolerance when set. None derives it from the
+            tolerance and the median cycle duration when frames are
+            subsampled.
         pose_detection_confidence: Minimum confidence for pose detection.
         pose_presence_confidence: Minimum confidence for pose presence.
         pose_tracking_confidence: Minimum confidence for pose tracking.
         num_poses: Maximum number of poses to detect.
+        pose_gating: Skip pose inference on frames with little motion in the
+            person region and infer landmarks from neighbouring measurements.
+        pose_motion_threshold: Mean absolute grayscale difference (0-255) in
+            the person region that triggers a new pose measurement.
+        pose_max_skip_frames: Maximum consecutive frames with inferred pose.
+        pose_roi_margin: Margin added around the landmark bbox, relative to
+            its size, when measuring person-region motion.
+        player_max_balls: Maximum balls tracked at once in multi-player mode.
+        player_match_distance: Maximum pixel movement between frames for a
+            ball or player to keep its identity.
+        player_max_missed_frames: Frames a ball or player may go undetected
+            before it is dropped.
+        player_assignment_smoothing: Weight of the previous smoothed
+            ball-to-wrist distance when assigning balls to players.
+        player_min_frames: Players seen in fewer frames get no summary.
+        offline_two_pass: Locate the ball in recorded videos from sparse
+            IMAGE-mode detections plus forward/backward tracking.
+        offline_detect_stride: Frames between detections in offline mode.
+        offline_agreement_distance: Maximum pixel distance between forward
+            and backward tracks that counts as agreement.
+        inference_batch_size: Frames decoded and run through pose inference
+            (and offline anchor detection) per group for recorded videos;
+            1 processes frame by frame. Ignored with pose_gating.
+        decode_processes: Decoder processes filling a shared-memory frame
+            ring for recorded videos; 0 decodes in the processing loop.
+        decode_ring_slots: Frame slots of the shared-memory ring.
+        decode_chunk_frames: Consecutive frames each decoder process takes
+            at a time; should span at least a keyframe interval.
+        analysis_stride: Analyze every analysis_stride-th decoded frame of
+            recorded videos; 1 analyzes every frame.
+        analysis_target_fps: Analysis rate of recorded videos in frames
+            per second, sampled by timestamp; None keeps the source rate.
+        decoder_timestamps: Timestamp frames with the decoder's presentation
+            time (CAP_PROP_POS_MSEC) instead of frame_index / fps.
+        skip_duplicate_frames: Reuse the previous frame's record, with the
+            new index and timestamp, for frames that repeat the last
+            analyzed frame instead of running perception on them.
+        duplicate_frame_max_diff: Largest grayscale difference (0-255) of
+            the downsampled fingerprints that still counts as a duplicate.
+        idle_detection: Suspend ball detection, tracking and pose during
+            idle stretches (no moving ball), probing sparsely for activity.
+        idle_motion_ratio: Fraction of thumbnail pixels that must change
+            between measured frames for a frame to be active.
+        idle_pixel_diff: Grayscale difference (0-255) above which a
+            thumbnail pixel counts as changed.
+        idle_min_orange_ratio: Fraction of the frame the orange mask must
+            cover for a frame to be active.
+        idle_enter_frames: Consecutive inactive frames before going idle.
+        idle_probe_every_n_frames: Frames between activity probes while idle.
+        quality_budget_s: Wall time budget for analyzing a recorded video;
+            the quality governor lowers detection cadence, analysis
+            resolution, pose rate and tracker cost to meet it. None
+            always runs at full quality.
+        governor_margin: Fraction of the remaining budget held back for
+            misprediction and the final analysis.
+        governor_upgrade_headroom: Extra fraction below the allowed frame
+            time a more accurate level must fit before switching back up.
+        governor_check_every_n_frames: Processed frames between governor
+            decisions.
+        governor_smoothing: Weight of the newest sample in the governor's
+            moving averages of stage costs.
         orange_mask_lower: Lower HSV bound for orange color mask.
         orange_mask_upper: Upper HSV bound for orange color mask.
+        live_source: Camera index or RTSP/HTTP URL for live mode (None reads
+            reference_video_path).
+        live_latency_budget_ms: Maximum capture-to-record latency in live mode.
+        live_detector_timeout_ms: Time to wait for an async live detection.
+        live_metrics_window_frames: Frames analyzed for rolling live metrics.
+        live_metrics_every_n_frames: Processed frames between rolling updates.
+        show_window: Display annotated frames in an OpenCV window.
+        output_video_path: Path of the annotated output video (None disables
+            it). Ignored with offline_two_pass, which draws no annotations.
+        output_video_backend: 'opencv' (cv2.VideoWriter) or 'ffmpeg' (pipe).
+        output_video_codec: FourCC for 'opencv' or encoder name for 'ffmpeg'.
+        output_video_size: Output (width, height); None keeps the source size.
+        output_video_stride: Write every Nth frame to the output video.
+        output_video_queue_size: Frames buffered for the background encoder.
+        output_video_block_when_full: Block instead of dropping frames when
+            the encoder falls behind.
+        service_host: Interface the analysis service listens on.
+        service_port: TCP port of the analysis service.
+        service_unix_socket: Unix socket path to listen on instead of TCP.
+        service_workers: Worker processes with preloaded detectors.
+        service_max_pending: Queued jobs accepted before submissions are
+            rejected with HTTP 503.
+        service_analyze_timeout_s: Seconds POST /analyze waits for its job
+            before cancelling it and replying 504 (None waits indefinitely).
+        stream_lookahead_frames: Frames seen after an outlier or trough
+            before the streaming analysis settles it.
+        stream_warmup_frames: Frames seen before the streaming contact labeler
+            labels the first frame.
+        stream_window_frames: Look-behind of the streaming shoulder width
+            median and trough search; longer cycles are dropped.
+        stream_analysis: Compute the summary of process() and stream() with
+            SessionAnalyzer.analyze_stream() while frames are processed, so
+            frame records are not kept for the whole video. Ignored with
+            offline_two_pass.
+        cpu_budget: Split CPU cores across processes and stages and set
+            OpenCV and detector thread counts from the split.
+        cpu_budget_cores: Cores shared by all processes; None uses every
+            core this process may run on.
+        cpu_process_index: Index of this process among cpu_process_count.
+        cpu_process_count: Processes sharing the budget (set per worker by
+            AnalysisService).
+        cpu_opencv_threads: cv2.setNumThreads value; None uses the
+            process's frame-loop cores.
+        cpu_inference_threads: Detector backend intra-op threads; None uses
+            the process's frame-loop cores.
+        cpu_pin_workers: Pin each process to its cores.
     """
     
     # Model paths
     object_detection_model_path: str = "models/efficientdet_lite0.tflite"
     pose_model_path: str = "models/pose_landmarker_full.task"
+    # Tier files (pose_landmarker_{lite,full,heavy}.task, efficientdet_lite{0,2}.tflite)
+    # are looked up next to pose_model_path; 'auto' benchmarks them once per machine
+    model_profile: Optional[str] = None
+    model_target_fps: float = 30.0
+    model_calibration_path: str = "models/calibration.json"
+    model_benchmark_frames: int = 30
+    # Non-MediaPipe detection backends run the model directly, with int8
+    # models, a thread count and batched input; outputs are filtered to the
+    # ball class here instead of by the ObjectDetector allowlist
+    detection_backend: str = 'mediapipe'
+    detection_backend_model_path: Optional[str] = None
+    detection_num_threads: Optional[int] = None
+    detection_ball_class_id: int = 36
     
     # Video paths
     reference_video_path: str = "videos/reference.mov"
@@ -46,9 +234,11 @@ class Config:
     # Detection parameters
     detect_every_n_frames: int = 10
     max_velocity: int = 100
+    max_velocity_px_per_s: Optional[float] = None
     # Minimum frames between troughs - lowered to allow fast bounces as separate cycles
     # Only filters obvious jitter troughs; real quick dribbles survive
     min_cycle_duration: int = 3
+    min_cycle_duration_ms: Optional[float] = None
 
     # Control threshold: d_thr = k * shoulder_width_session
     # Increased from 0.75 to 1.0 so L/R labels appear more often
@@ -60,27 +250,167 @@ class Config:
     # Minimum frames for meaningful contact window
     # Lowered to 2 so short but real hand contacts per bounce aren't discarded
     min_contact_window_frames: int = 2
+    min_contact_window_ms: Optional[float] = None
     
     # Object detection parameters
     detection_score_threshold: float = 0.3
-    detection_max_results: int = 1
+    # Raised from 1 to 5 so the candidate selector has runners-up to rank
+    # and fall back on
+    detection_max_results: int = 5
+
+    # Candidate selection: best-scoring candidate is tracked, runners-up are
+    # kept briefly as fallbacks so one false positive doesn't force a re-detect
+    candidate_detector_weight: float = 1.0
+    candidate_orange_weight: float = 1.0
+    candidate_motion_weight: float = 1.0
+    candidate_track_weight: float = 0.5
+    candidate_fallback_max_age: int = 5
+
+    # Blob fast path: accept a single unambiguous orange blob near the predicted
+    # position instead of running EfficientDet; ambiguous frames still detect
+    blob_fast_path: bool = False
+    blob_search_radius_ratio: float = 0.25
+    blob_max_aspect: float = 1.6
+    blob_min_fill: float = 0.55
+    blob_min_circularity: float = 0.6
+
+    # Motion region proposals: on a fixed camera, moving orange blobs are cheap
+    # to find, so the detector only sees crops around them; frames whose crops
+    # hold no valid ball still detect on the full frame
+    motion_proposals: bool = False
+    motion_proposal_accept_blobs: bool = False
+    motion_proposal_width: int = 320
+    motion_proposal_history: int = 120
+    motion_proposal_var_threshold: float = 16.0
+    motion_proposal_warmup_frames: int = 30
+    motion_proposal_min_area_ratio: float = 0.0002
+    motion_proposal_padding: float = 1.0
+    motion_proposal_min_size: int = 128
+    motion_proposal_max_regions: int = 2
+    motion_proposal_max_area_ratio: float = 0.5
 
     # Tracking validation parameters
     min_ball_area_ratio: float = 0.0003
     max_ball_area_ratio: float = 0.08
     min_orange_ratio: float = 0.08
+    # Direct ROI counts are ~100x cheaper than building the summed-area table,
+    # so the table is only built for frames with many candidate bboxes
+    orange_integral_after_queries: int = 8
     min_detect_track_iou: float = 0.1
     max_track_acceleration: float = 300.0
     force_detect_frames: int = 5
     tracking_grace_frames: int = 3
+    tracker_backend: str = 'csrt'
     crossover_hand_gap_tolerance: int = 1
+    crossover_hand_gap_ms: Optional[float] = None
     
     # Pose detection parameters
     pose_detection_confidence: float = 0.5
     pose_presence_confidence: float = 0.5
     pose_tracking_confidence: float = 0.5
     num_poses: int = 1
+
+    # Pose gating: measure pose only when the person region moved enough since
+    # the last measurement; skipped frames are extrapolated, then interpolated
+    pose_gating: bool = False
+    pose_motion_threshold: float = 4.0
+    pose_max_skip_frames: int = 4
+    pose_roi_margin: float = 0.2
+
+    # Multi-player mode (process_players): up to num_poses players; each ball
+    # goes to the player whose wrists stayed nearest to it over time
+    player_max_balls: int = 4
+    player_match_distance: float = 120.0
+    player_max_missed_frames: int = 15
+    player_assignment_smoothing: float = 0.8
+    player_min_frames: int = 30
+
+    # Offline two-pass mode: the detector runs only on every stride-th frame;
+    # the gaps are tracked forward and backward from those anchors
+    offline_two_pass: bool = False
+    offline_detect_stride: int = 15
+    offline_agreement_distance: float = 25.0
+    # Batched inference: decode groups of frames into reused buffers and run
+    # the detectors over each group back to back
+    inference_batch_size: int = 1
+    # Parallel decoding: decoder processes write frames into shared-memory
+    # slots that the processing loop reads in place; full overlap needs
+    # decode_ring_slots >= decode_processes * decode_chunk_frames
+    decode_processes: int = 0
+    decode_ring_slots: int = 32
+    decode_chunk_frames: int = 16
+    # Temporal subsampling: skipped frames are grabbed but not decoded or
+    # analyzed; thresholds switch to time units so metrics match full rate
+    analysis_stride: int = 1
+    analysis_target_fps: Optional[float] = None
+    decoder_timestamps: bool = True
+    # Duplicate frames: repeated frames (VFR phone recordings, screen
+    # captures) copy the previous record instead of re-running perception
+    skip_duplicate_frames: bool = False
+    duplicate_frame_max_diff: float = 2.0
+    # Idle detection: stretches without a moving ball (setup, rest) only get
+    # a cheap motion/orange probe; cycles are not paired across them
+    idle_detection: bool = False
+    idle_motion_ratio: float = 0.0005
+    idle_pixel_diff: int = 25
+    idle_min_orange_ratio: float = 0.0005
+    idle_enter_frames: int = 45
+    idle_probe_every_n_frames: int = 15
+
+    # Quality governor: measured stage costs predict the frame cost of each
+    # quality level; the most accurate level that still meets the deadline runs
+    quality_budget_s: Optional[float] = None
+    governor_margin: float = 0.1
+    governor_upgrade_headroom: float = 0.15
+    governor_check_every_n_frames: int = 30
+    governor_smoothing: float = 0.1
     
     # Orange mask HSV bounds
     orange_mask_lower: tuple[int, int, int] = (5, 100, 100)
     orange_mask_upper: tuple[int, int, int] = (20, 255, 255)
+
+    # Live mode: camera index ("0") or stream URL ("rtsp://...", "http://...")
+    # Frames older than the latency budget are dropped instead of queued
+    live_source: Optional[str] = None
+    live_latency_budget_ms: float = 250.0
+    live_detector_timeout_ms: float = 30.0
+    live_metrics_window_frames: int = 300
+    live_metrics_every_n_frames: int = 30
+
+    # Annotated output: encoded on a background thread fed by a bounded queue
+    # ffmpeg backend accepts hardware encoders (h264_videotoolbox, h264_nvenc, ...)
+    show_window: bool = True
+    output_video_path: Optional[str] = None
+    output_video_backend: str = "opencv"
+    output_video_codec: str = "mp4v"
+    output_video_size: Optional[tuple[int, int]] = None
+    output_video_stride: int = 1
+    output_video_queue_size: int = 64
+    output_video_block_when_full: bool = False
+
+    # Analysis service: jobs run on worker processes that keep the models
+    # loaded; submissions beyond max_pending queued jobs are rejected
+    service_host: str = "127.0.0.1"
+    service_port: int = 8765
+    service_unix_socket: Optional[str] = None
+    service_workers: int = 2
+    service_max_pending: int = 8
+    service_analyze_timeout_s: Optional[float] = 600.0
+
+    # Streaming analysis: processors keep bounded windows instead of the
+    # whole recording, so memory stays flat for arbitrarily long sessions
+    stream_lookahead_frames: int = 30
+    stream_warmup_frames: int = 90
+    stream_window_frames: int = 300
+    stream_analysis: bool = False
+
+    # CPU budget: cores are split into one slice per process; within a slice
+    # background stages reserve a core each and OpenCV and inference share
+    # the rest, since they run one after the other in the frame loop
+    cpu_budget: bool = False
+    cpu_budget_cores: Optional[int] = None
+    cpu_process_index: int = 0
+    cpu_process_count: int = 1
+    cpu_opencv_threads: Optional[int] = None
+    cpu_inference_threads: Optional[int] = None
+    cpu_pin_workers: bool = True
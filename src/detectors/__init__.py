@@ -1,6 +1,6 @@
 """Detectors package for ball and pose detection."""
 
-from .ball_detector import BallDetector
+from .ball_detector import BallCandidate, BallDetector
 from .pose_detector import PoseDetector
 
-__all__ = ['BallDetector', 'PoseDetector']
+__all__ = ['BallCandidate', 'BallDetector', 'PoseDetector']
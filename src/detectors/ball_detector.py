@@ -1,9 +1,34 @@
 """Ball detector module using MediaPipe ObjectDetector."""
 
-import mediapipe as mp
-from mediapipe.tasks.python import vision
+import threading
+from dataclasses import dataclass
+
 import numpy as np
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+# mediapipe takes most of a second to import, so it is only loaded when a
+# detector is created (and for the per-frame mp.Image wrapper)
+if TYPE_CHECKING:
+    import mediapipe as mp
+    from mediapipe.tasks.python import vision
+
+    from detectors.detector_backends import DetectorBackend
+
+from detectors.detector_clock import DetectorClock
+
+
+@dataclass
+class BallCandidate:
+    """
+    A single ball detection candidate.
+    
+    Attributes:
+        bbox: Tuple of (x, y, w, h) bounding box coordinates.
+        score: Detector confidence score.
+    """
+    
+    bbox: tuple[int, int, int, int]
+    score: float
 
 
 class BallDetector:
@@ -13,65 +38,252 @@ class BallDetector:
     This class wraps the MediaPipe ObjectDetector to detect basketballs
     (sports balls) in video frames.
     
+    In live-stream mode the detector runs asynchronously: detect() submits
+    the frame and returns the newest result delivered by MediaPipe, as long
+    as it is within the configured latency budget. In image mode every frame
+    is detected independently, for sparse detections on non-consecutive frames.
+    
+    With Config.detection_backend set to 'onnxruntime' or 'tflite', the
+    model runs on a DetectorBackend instead; backends are stateless and
+    synchronous, so the running mode does not apply, and
+    detect_candidates_batch() runs a group in one model call.
+    
     Attributes:
-        detector: MediaPipe ObjectDetector instance.
+        detector: MediaPipe ObjectDetector instance, or None with another backend.
+        backend: Non-MediaPipe DetectorBackend, or None.
         config: Configuration object with detection parameters.
+        live_stream: Whether the detector uses the LIVE_STREAM running mode.
+        image_mode: Whether the detector uses the IMAGE running mode.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, live_stream: bool = False, image_mode: bool = False):
         """
         Initializes the BallDetector.
         
         Args:
             config: Config object containing model path and detection parameters.
+            live_stream: Use MediaPipe LIVE_STREAM running mode instead of VIDEO.
+            image_mode: Use MediaPipe IMAGE running mode instead of VIDEO.
+        
+        Raises:
+            ValueError: If both live_stream and image_mode are set.
         """
+        if live_stream and image_mode:
+            raise ValueError("live_stream and image_mode are mutually exclusive")
         self.config = config
-        self.detector = self._create_detector()
+        self.live_stream = live_stream
+        self.image_mode = image_mode
+        self._result_lock = threading.Lock()
+        self._result_ready = threading.Event()
+        self._latest_result: Optional[tuple[int, list[BallCandidate]]] = None
+        self._clock = DetectorClock()
+        self.backend: Optional["DetectorBackend"] = None
+        self.detector: Optional["vision.ObjectDetector"] = None
+        if config.detection_backend == 'mediapipe':
+            self.detector = self._create_detector()
+        else:
+            from detectors.detector_backends import create_backend
+            self.backend = create_backend(config)
     
-    def _create_detector(self) -> vision.ObjectDetector:
+    def _create_detector(self) -> "vision.ObjectDetector":
         """
         Creates and configures a MediaPipe ObjectDetector.
         
         Returns:
             ObjectDetector: Configured detector instance for video processing.
         """
+        import mediapipe as mp
+        from mediapipe.tasks.python import vision
+
         base_options = mp.tasks.BaseOptions(
             model_asset_path=self.config.object_detection_model_path
         )
+        if self.live_stream:
+            mode_options = {
+                'running_mode': vision.RunningMode.LIVE_STREAM,
+                'result_callback': self._on_result,
+            }
+        elif self.image_mode:
+            mode_options = {'running_mode': vision.RunningMode.IMAGE}
+        else:
+            mode_options = {'running_mode': vision.RunningMode.VIDEO}
         options = vision.ObjectDetectorOptions(
             base_options=base_options,
             max_results=self.config.detection_max_results,
             score_threshold=self.config.detection_score_threshold,
             category_allowlist=['sports ball'],
-            running_mode=vision.RunningMode.VIDEO
+            **mode_options
         )
         return vision.ObjectDetector.create_from_options(options)
     
-    def detect(self, frame: np.ndarray, timestamp_ms: int) -> Optional[tuple[int, int, int, int]]:
+    @staticmethod
+    def _candidates_from_result(result) -> list[BallCandidate]:
+        candidates = []
+        for detection in result.detections:
+            bounding_box = detection.bounding_box
+            score = detection.categories[0].score if detection.categories else 0.0
+            candidates.append(
+                BallCandidate(
+                    bbox=(
+                        int(bounding_box.origin_x),
+                        int(bounding_box.origin_y),
+                        int(bounding_box.width),
+                        int(bounding_box.height)
+                    ),
+                    score=float(score)
+                )
+            )
+        return candidates
+    
+    def _on_result(self, result, output_image: "mp.Image", timestamp_ms: int) -> None:
+        """Receives asynchronous results in live-stream mode."""
+        with self._result_lock:
+            self._latest_result = (timestamp_ms, self._candidates_from_result(result))
+        self._result_ready.set()
+    
+    def _take_live_result(self, timestamp_ms: int) -> list[BallCandidate]:
         """
-        Detects basketball in a video frame.
+        Returns the newest live result once, if it is within the latency budget.
+        """
+        self._result_ready.wait(self.config.live_detector_timeout_ms / 1000)
+        with self._result_lock:
+            latest = self._latest_result
+            self._latest_result = None
+        if latest is None:
+            return []
+        result_timestamp_ms, candidates = latest
+        if timestamp_ms - result_timestamp_ms > self.config.live_latency_budget_ms:
+            return []
+        return candidates
+    
+    def detect_candidates(self, frame: np.ndarray, timestamp_ms: int) -> list[BallCandidate]:
+        """
+        Detects up to detection_max_results basketball candidates in a frame.
         
         Args:
             frame: Video frame as numpy array (BGR format).
-            timestamp_ms: Frame timestamp in milliseconds.
+            timestamp_ms: Frame timestamp in milliseconds (unused in image mode).
         
         Returns:
-            Tuple of (x, y, w, h) bounding box coordinates, or None if no ball detected.
+            List of candidates ordered by descending detector score.
         """
+        if self.backend is not None:
+            return self.backend.detect_batch([frame])[0]
+        
+        import mediapipe as mp
+
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+        if self.image_mode:
+            return self._candidates_from_result(self.detector.detect(mp_image))
+        
+        timestamp_ms = self._clock.map(timestamp_ms)
+        if self.live_stream:
+            self._result_ready.clear()
+            self.detector.detect_async(mp_image, timestamp_ms)
+            return self._take_live_result(timestamp_ms)
+        
         result = self.detector.detect_for_video(mp_image, timestamp_ms)
+        return self._candidates_from_result(result)
+    
+    def detect_candidates_batch(
+        self,
+        frames: Sequence[np.ndarray],
+        timestamps_ms: Sequence[int]
+    ) -> list[list[BallCandidate]]:
+        """
+        Detects candidates in a group of frames.
         
-        if result.detections:
-            detection = result.detections[0]
-            bounding_box = detection.bounding_box
-            
-            x = int(bounding_box.origin_x)
-            y = int(bounding_box.origin_y)
-            w = int(bounding_box.width)
-            h = int(bounding_box.height)
-            
-            return (x, y, w, h)
-        return None
+        MediaPipe Tasks graphs take one image per call, so this runs the
+        frames back to back with the per-call setup hoisted out of the loop;
+        results are identical to calling detect_candidates() per frame. Not
+        available in live-stream mode. Other backends take the whole group
+        as one batched input.
+        
+        Args:
+            frames: Video frames (BGR format), in timestamp order.
+            timestamps_ms: Timestamp of each frame in milliseconds.
+        
+        Returns:
+            One candidate list per frame, as from detect_candidates().
+        
+        Raises:
+            RuntimeError: If the detector runs in live-stream mode.
+        """
+        if self.backend is not None:
+            return self.backend.detect_batch(frames)
+        
+        import mediapipe as mp
+
+        if self.live_stream:
+            raise RuntimeError("detect_candidates_batch() requires VIDEO or IMAGE mode")
+        image_format = mp.ImageFormat.SRGB
+        results = []
+        for frame, timestamp_ms in zip(frames, timestamps_ms):
+            mp_image = mp.Image(image_format=image_format, data=frame)
+            if self.image_mode:
+                result = self.detector.detect(mp_image)
+            else:
+                result = self.detector.detect_for_video(mp_image, self._clock.map(timestamp_ms))
+            results.append(self._candidates_from_result(result))
+        return results
+    
+    def detect_regions(
+        self,
+        frame: np.ndarray,
+        regions: Sequence[tuple[int, int, int, int]],
+        timestamp_ms: int
+    ) -> list[BallCandidate]:
+        """
+        Detects candidates inside crops of a frame.
+        
+        Each (x, y, w, h) region is cropped and detected on its own, so the
+        detector input covers only the regions; other backends take the
+        crops as one batch. In VIDEO mode the crops of one frame share its
+        timestamp, which the detector clock spreads out. Not available in
+        live-stream mode.
+        
+        Args:
+            frame: Video frame as numpy array (BGR format).
+            regions: Regions to detect in, in frame coordinates.
+            timestamp_ms: Frame timestamp in milliseconds.
+        
+        Returns:
+            Candidates of all regions in frame coordinates, ordered by
+            descending detector score.
+        
+        Raises:
+            RuntimeError: If the detector runs in live-stream mode.
+        """
+        if self.live_stream:
+            raise RuntimeError("detect_regions() requires VIDEO or IMAGE mode")
+        crops = [np.ascontiguousarray(frame[y:y + h, x:x + w]) for x, y, w, h in regions]
+        if self.backend is not None:
+            results = self.backend.detect_batch(crops)
+        else:
+            results = [self.detect_candidates(crop, timestamp_ms) for crop in crops]
+        candidates = [
+            BallCandidate((x + cx, y + cy, cw, ch), candidate.score)
+            for (x, y, _, _), result in zip(regions, results)
+            for candidate in result
+            for cx, cy, cw, ch in (candidate.bbox,)
+        ]
+        candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+        return candidates
+    
+    def detect(self, frame: np.ndarray, timestamp_ms: int) -> Optional[tuple[int, int, int, int]]:
+        """
+        Detects basketball in a video frame.
+        
+        Args:
+            frame: Video frame as numpy array (BGR format).
+            timestamp_ms: Frame timestamp in milliseconds.
+        
+        Returns:
+            Tuple of (x, y, w, h) bounding box coordinates of the highest
+            scoring candidate, or None if no ball detected.
+        """
+        candidates = self.detect_candidates(frame, timestamp_ms)
+        return candidates[0].bbox if candidates else None
     
     def __enter__(self):
         """Context manager entry."""
@@ -79,4 +291,7 @@ class BallDetector:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.detector.close()
+        if self.backend is not None:
+            self.backend.close()
+        else:
+            self.detector.close()
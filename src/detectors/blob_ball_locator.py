@@ -0,0 +1,104 @@
+"""Blob ball locator module using the orange color mask."""
+
+import math
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class BlobBallLocator:
+    """
+    Locates the ball from orange mask blobs without running the neural detector.
+
+    Connected components of the orange mask are searched around the
+    predicted ball position. A bbox is returned only when exactly one blob
+    matches the ball area, aspect, fill and circularity bounds; anything
+    ambiguous is left to BallDetector.
+
+    Attributes:
+        config: Configuration object with area bounds and blob thresholds.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the BlobBallLocator.
+
+        Args:
+            config: Config object containing area bounds and blob thresholds.
+        """
+        self.config = config
+
+    def _search_region(
+        self,
+        frame_shape: tuple[int, ...],
+        predicted_center: Optional[tuple[int, int]]
+    ) -> tuple[int, int, int, int]:
+        height, width = frame_shape[:2]
+        if predicted_center is None:
+            return 0, 0, width, height
+        radius = int(self.config.blob_search_radius_ratio * max(height, width))
+        x1 = max(0, predicted_center[0] - radius)
+        y1 = max(0, predicted_center[1] - radius)
+        x2 = min(width, predicted_center[0] + radius)
+        y2 = min(height, predicted_center[1] + radius)
+        return x1, y1, max(0, x2 - x1), max(0, y2 - y1)
+
+    def _circularity(self, component: np.ndarray) -> float:
+        contours, _ = cv2.findContours(
+            component, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        )
+        if not contours:
+            return 0.0
+        contour = max(contours, key=cv2.contourArea)
+        perimeter = cv2.arcLength(contour, True)
+        if perimeter <= 0:
+            return 0.0
+        return 4 * math.pi * cv2.contourArea(contour) / (perimeter ** 2)
+
+    def locate(
+        self,
+        mask: np.ndarray,
+        predicted_center: Optional[tuple[int, int]] = None
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Finds a single unambiguous ball-shaped blob in the orange mask.
+
+        Args:
+            mask: Binary orange mask (0 or 255) of the frame.
+            predicted_center: Expected ball center; the whole frame is
+                searched when None.
+
+        Returns:
+            Tuple of (x, y, w, h) bbox in frame coordinates, or None when no
+            blob or more than one blob matches.
+        """
+        rx, ry, rw, rh = self._search_region(mask.shape, predicted_center)
+        if rw == 0 or rh == 0:
+            return None
+        roi = mask[ry:ry + rh, rx:rx + rw]
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(
+            roi, connectivity=8
+        )
+
+        frame_area = max(1, mask.shape[0] * mask.shape[1])
+        match = None
+        for label in range(1, count):
+            x, y, w, h, area = stats[label]
+            box_ratio = (w * h) / frame_area
+            if (
+                box_ratio < self.config.min_ball_area_ratio or
+                box_ratio > self.config.max_ball_area_ratio
+            ):
+                continue
+            if max(w, h) > self.config.blob_max_aspect * min(w, h):
+                continue
+            if area / (w * h) < self.config.blob_min_fill:
+                continue
+            component = (labels[y:y + h, x:x + w] == label).astype(np.uint8)
+            if self._circularity(component) < self.config.blob_min_circularity:
+                continue
+            if match is not None:
+                return None
+            match = (int(rx + x), int(ry + y), int(w), int(h))
+        return match
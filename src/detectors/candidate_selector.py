@@ -0,0 +1,111 @@
+"""Candidate selector module for choosing the best ball detection."""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from detectors.ball_detector import BallCandidate
+from utils.video_utils import bbox_area_ratio, bbox_iou
+
+
+@dataclass
+class ScoredCandidate:
+    """
+    A ball candidate that passed validation, with its selection score.
+
+    Attributes:
+        bbox: Tuple of (x, y, w, h) bounding box coordinates.
+        detector_score: Detector confidence score.
+        orange_ratio: Ratio of orange pixels inside bbox.
+        score: Combined selection score (higher is better).
+    """
+
+    bbox: tuple[int, int, int, int]
+    detector_score: float
+    orange_ratio: float
+    score: float
+
+
+class BallCandidateSelector:
+    """
+    Scores detection candidates against validation bounds and motion.
+
+    Candidates outside the ball area bounds or below the minimum orange
+    ratio are discarded. The rest are scored by a weighted sum of detector
+    confidence, orange ratio, closeness to the motion prediction and
+    overlap with the active tracker box.
+
+    Attributes:
+        config: Configuration object with validation bounds and weights.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the BallCandidateSelector.
+
+        Args:
+            config: Config object containing validation bounds and weights.
+        """
+        self.config = config
+
+    def rank(
+        self,
+        candidates: list[BallCandidate],
+        frame_shape: tuple[int, ...],
+        orange_ratio: Callable[[tuple[int, int, int, int]], float],
+        predicted_center: Optional[tuple[int, int]] = None,
+        tracker_bbox: Optional[tuple[int, int, int, int]] = None
+    ) -> list[ScoredCandidate]:
+        """
+        Validates and orders candidates from best to worst.
+
+        Args:
+            candidates: Raw detector candidates.
+            frame_shape: Shape of the frame the candidates come from.
+            orange_ratio: Function returning the orange ratio of a bbox.
+            predicted_center: Expected ball center from recent motion.
+            tracker_bbox: Current tracker bbox, if tracking is active.
+
+        Returns:
+            Candidates that passed validation, best first.
+        """
+        frame_diagonal = math.hypot(frame_shape[0], frame_shape[1])
+        scored = []
+        for candidate in candidates:
+            area_ratio = bbox_area_ratio(candidate.bbox, frame_shape)
+            if (
+                area_ratio < self.config.min_ball_area_ratio or
+                area_ratio > self.config.max_ball_area_ratio
+            ):
+                continue
+            ratio = orange_ratio(candidate.bbox)
+            if ratio < self.config.min_orange_ratio:
+                continue
+
+            score = (
+                self.config.candidate_detector_weight * candidate.score +
+                self.config.candidate_orange_weight * ratio
+            )
+            if predicted_center is not None:
+                x, y, w, h = candidate.bbox
+                distance = math.hypot(
+                    x + w / 2 - predicted_center[0],
+                    y + h / 2 - predicted_center[1]
+                )
+                score += self.config.candidate_motion_weight * (
+                    1.0 - min(1.0, distance / (0.25 * frame_diagonal))
+                )
+            if tracker_bbox is not None:
+                score += self.config.candidate_track_weight * bbox_iou(
+                    candidate.bbox, tracker_bbox
+                )
+            scored.append(
+                ScoredCandidate(
+                    bbox=candidate.bbox,
+                    detector_score=candidate.score,
+                    orange_ratio=ratio,
+                    score=score
+                )
+            )
+        scored.sort(key=lambda c: c.score, reverse=True)
+        return scored
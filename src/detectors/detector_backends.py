@@ -0,0 +1,390 @@
+"""Detector backend module running the ball detection model outside MediaPipe."""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Any, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from detectors.ball_detector import BallCandidate, BallDetector
+from utils.video_utils import bbox_iou
+
+BACKENDS = ('mediapipe', 'onnxruntime', 'tflite')
+
+
+class DetectorBackend(ABC):
+    """
+    Base class of the non-MediaPipe ball detection backends.
+
+    Backends run an SSD-style detection model whose outputs follow the
+    TFLite detection post-processing layout, in this order: boxes (N, K, 4)
+    as normalized (ymin, xmin, ymax, xmax), class indices (N, K), scores
+    (N, K) and an optional detection count (N,). This is what the
+    EfficientDet-Lite TFLite models produce, and what their ONNX conversions
+    keep. Frames are resized to the model input without letterboxing and
+    passed in the channel order the MediaPipe backend receives.
+
+    Inputs are fed as the model expects them: uint8 models get raw pixels,
+    float models pixels scaled to [-1, 1], and int8 models the [-1, 1]
+    values quantized with the input tensor's scale and zero point.
+
+    Attributes:
+        config: Configuration object with detection parameters.
+        model_path: Path of the model file.
+        num_threads: Intra-op threads, or None for the runtime default.
+        input_height: Model input height.
+        input_width: Model input width.
+        input_dtype: Model input dtype.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the DetectorBackend.
+
+        Args:
+            config: Config object containing detection_backend_model_path
+                (falls back to object_detection_model_path),
+                detection_num_threads, detection_ball_class_id and the
+                detection score and result limits.
+        """
+        self.config = config
+        self.model_path = config.detection_backend_model_path or config.object_detection_model_path
+        self.num_threads = config.detection_num_threads
+        self.input_height = 0
+        self.input_width = 0
+        self.input_dtype = np.dtype(np.uint8)
+        self._input_quantization = (0.0, 0)
+        self._inputs: Optional[np.ndarray] = None
+
+    def _prepare_inputs(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """Resizes the frames into a reused (N, H, W, 3) batch in the model's dtype."""
+        count = len(frames)
+        if self._inputs is None or len(self._inputs) < count:
+            self._inputs = np.empty(
+                (count, self.input_height, self.input_width, 3), dtype=np.uint8
+            )
+        size = (self.input_width, self.input_height)
+        for slot, frame in enumerate(frames):
+            cv2.resize(frame, size, dst=self._inputs[slot], interpolation=cv2.INTER_LINEAR)
+        pixels = self._inputs[:count]
+        if self.input_dtype == np.uint8:
+            return pixels
+        values = (pixels.astype(np.float32) - 127.5) / 127.5
+        scale, zero_point = self._input_quantization
+        if scale:
+            info = np.iinfo(self.input_dtype)
+            values = np.clip(np.round(values / scale + zero_point), info.min, info.max)
+        return values.astype(self.input_dtype)
+
+    def _candidates(
+        self,
+        boxes: np.ndarray,
+        classes: np.ndarray,
+        scores: np.ndarray,
+        frame_shape: tuple[int, ...]
+    ) -> list[BallCandidate]:
+        """Converts one frame's raw outputs into ranked ball candidates."""
+        height, width = frame_shape[:2]
+        keep = (
+            (classes.astype(np.int64) == self.config.detection_ball_class_id) &
+            (scores >= self.config.detection_score_threshold)
+        )
+        order = np.argsort(-scores[keep], kind='stable')[:self.config.detection_max_results]
+        candidates = []
+        for box, score in zip(boxes[keep][order], scores[keep][order]):
+            ymin, xmin, ymax, xmax = np.clip(box, 0.0, 1.0)
+            candidates.append(
+                BallCandidate(
+                    bbox=(
+                        int(xmin * width),
+                        int(ymin * height),
+                        int((xmax - xmin) * width),
+                        int((ymax - ymin) * height)
+                    ),
+                    score=float(score)
+                )
+            )
+        return candidates
+
+    @abstractmethod
+    def _run(self, inputs: np.ndarray) -> list[np.ndarray]:
+        """Runs the model on a prepared batch and returns its float outputs."""
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> list[list[BallCandidate]]:
+        """
+        Detects ball candidates in a group of frames with one model call.
+
+        Args:
+            frames: Video frames, as passed to BallDetector.
+
+        Returns:
+            One candidate list per frame, ordered by descending score.
+        """
+        if not frames:
+            return []
+        boxes, classes, scores = self._run(self._prepare_inputs(frames))[:3]
+        return [
+            self._candidates(boxes[slot], classes[slot], scores[slot], frame.shape)
+            for slot, frame in enumerate(frames)
+        ]
+
+    def close(self) -> None:
+        """Releases the runtime session."""
+
+
+class OnnxRuntimeBackend(DetectorBackend):
+    """
+    Ball detection on ONNX Runtime's CPU execution provider.
+
+    Models with a dynamic batch dimension run a whole group in one call;
+    fixed-batch models run it in chunks of their batch size. Quantized
+    models with float or uint8 inputs (the usual QDQ and QOperator exports)
+    need no special handling; int8 inputs are rejected, since ONNX Runtime
+    does not expose the input tensor's scale and zero point. NCHW models are
+    fed transposed inputs.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the OnnxRuntimeBackend.
+
+        Args:
+            config: Config object, see DetectorBackend.
+
+        Raises:
+            RuntimeError: If onnxruntime is not installed.
+            ValueError: If the model takes int8 inputs.
+        """
+        super().__init__(config)
+        try:
+            import onnxruntime as ort
+        except ImportError as error:
+            raise RuntimeError("detection_backend='onnxruntime' requires onnxruntime") from error
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if self.num_threads is not None:
+            options.intra_op_num_threads = self.num_threads
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._channels_first = model_input.shape[1] == 3
+        if self._channels_first:
+            self.input_height, self.input_width = model_input.shape[2:4]
+        else:
+            self.input_height, self.input_width = model_input.shape[1:3]
+        if model_input.type == 'tensor(int8)':
+            raise ValueError(
+                f"{self.model_path}: int8 model inputs are not supported by the "
+                "onnxruntime backend; export the model with float or uint8 inputs"
+            )
+        self.input_dtype = np.dtype(np.uint8 if model_input.type == 'tensor(uint8)' else np.float32)
+        # Integer batch dimension means the model was exported with a fixed batch
+        batch = model_input.shape[0]
+        self._max_batch = batch if isinstance(batch, int) and batch > 0 else None
+
+    def _run(self, inputs: np.ndarray) -> list[np.ndarray]:
+        if self._channels_first:
+            inputs = np.ascontiguousarray(inputs.transpose(0, 3, 1, 2))
+        count = len(inputs)
+        chunk = self._max_batch or count
+        if count % chunk:
+            # Fixed-batch models need full chunks; padded slots are dropped below
+            padding = np.zeros((chunk - count % chunk, *inputs.shape[1:]), dtype=inputs.dtype)
+            inputs = np.concatenate([inputs, padding])
+        outputs = [
+            self.session.run(None, {self._input_name: inputs[start:start + chunk]})
+            for start in range(0, len(inputs), chunk)
+        ]
+        return [
+            np.concatenate([output[index] for output in outputs])[:count].astype(np.float32)
+            for index in range(len(outputs[0]))
+        ]
+
+
+class TFLiteBackend(DetectorBackend):
+    """
+    Ball detection on the TFLite interpreter (ai-edge-litert, tflite-runtime
+    or TensorFlow, whichever is installed).
+
+    The input tensor is resized to the group size so a whole group runs in
+    one invoke(). Models whose post-processing op only supports batch 1 are
+    detected on the first resize and run frame by frame from then on.
+    Quantized (uint8 or int8) models are fed and dequantized with the
+    tensors' own quantization parameters.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the TFLiteBackend.
+
+        Args:
+            config: Config object, see DetectorBackend.
+
+        Raises:
+            RuntimeError: If no TFLite interpreter package is installed.
+        """
+        super().__init__(config)
+        self.interpreter = self._create_interpreter()
+        self.interpreter.allocate_tensors()
+        model_input = self.interpreter.get_input_details()[0]
+        self._input_index = model_input['index']
+        self.input_height, self.input_width = model_input['shape'][1:3]
+        self.input_dtype = np.dtype(model_input['dtype'])
+        self._input_quantization = model_input['quantization']
+        self._batch_size = 1
+        self._batching = True
+
+    def _create_interpreter(self):
+        for module_name in ('ai_edge_litert.interpreter', 'tflite_runtime.interpreter', 'tensorflow.lite'):
+            try:
+                module = __import__(module_name, fromlist=['Interpreter'])
+            except ImportError:
+                continue
+            return module.Interpreter(model_path=self.model_path, num_threads=self.num_threads)
+        raise RuntimeError(
+            "detection_backend='tflite' requires ai-edge-litert, tflite-runtime or tensorflow"
+        )
+
+    def _resize(self, batch_size: int) -> bool:
+        if batch_size == self._batch_size:
+            return True
+        try:
+            self.interpreter.resize_tensor_input(
+                self._input_index, [batch_size, self.input_height, self.input_width, 3]
+            )
+            self.interpreter.allocate_tensors()
+        except (RuntimeError, ValueError):
+            self.interpreter.resize_tensor_input(
+                self._input_index, [1, self.input_height, self.input_width, 3]
+            )
+            self.interpreter.allocate_tensors()
+            self._batch_size = 1
+            return False
+        self._batch_size = batch_size
+        return True
+
+    def _invoke(self, inputs: np.ndarray) -> list[np.ndarray]:
+        self.interpreter.set_tensor(self._input_index, inputs)
+        self.interpreter.invoke()
+        outputs = []
+        for detail in self.interpreter.get_output_details():
+            output = self.interpreter.get_tensor(detail['index']).astype(np.float32)
+            scale, zero_point = detail['quantization']
+            if scale:
+                output = (output - zero_point) * scale
+            outputs.append(output)
+        return outputs
+
+    def _run(self, inputs: np.ndarray) -> list[np.ndarray]:
+        if self._batching and len(inputs) != self._batch_size:
+            self._batching = self._resize(len(inputs))
+        if self._batching:
+            return self._invoke(inputs)
+        self._resize(1)
+        outputs = [self._invoke(inputs[slot:slot + 1]) for slot in range(len(inputs))]
+        return [
+            np.concatenate([output[index] for output in outputs])
+            for index in range(len(outputs[0]))
+        ]
+
+
+def create_backend(config) -> DetectorBackend:
+    """
+    Creates the backend selected by Config.detection_backend.
+
+    Raises:
+        ValueError: If detection_backend is 'mediapipe' (handled by
+            BallDetector itself) or unknown.
+    """
+    if config.detection_backend == 'onnxruntime':
+        return OnnxRuntimeBackend(config)
+    if config.detection_backend == 'tflite':
+        return TFLiteBackend(config)
+    raise ValueError(f"No backend class for detection_backend={config.detection_backend!r}")
+
+
+def compare_backends(
+    config,
+    frames: Sequence[np.ndarray],
+    backends: Sequence[str] = BACKENDS,
+    batch_size: int = 8,
+    iou_threshold: float = 0.5
+) -> list[dict[str, Any]]:
+    """
+    Times the ball detector backends on the same frames and compares their
+    detections with the first backend's.
+
+    Without labeled ground truth, accuracy is agreement with the reference
+    backend (normally MediaPipe): a frame agrees when both backends find no
+    ball, or their top candidates overlap by at least iou_threshold.
+    Backends that cannot be created (missing runtime or model) are reported
+    with their error instead.
+
+    Args:
+        config: Config object; detection_backend is overridden per row.
+        frames: Frames to detect on, as passed to BallDetector.
+        backends: Backend names, reference first.
+        batch_size: Group size of the batched timing pass.
+        iou_threshold: Minimum IoU of two top candidates that agree.
+
+    Returns:
+        One row per backend with single_ms and batch_ms (median per-frame
+        latency, the first group excluded as warm-up), detection_rate,
+        agreement and mean_iou (over frames where both found a ball).
+
+    Raises:
+        ValueError: If frames is empty.
+    """
+    if not frames:
+        raise ValueError("compare_backends() needs at least one frame")
+    rows = []
+    reference: Optional[list[Optional[tuple[int, int, int, int]]]] = None
+    for backend in backends:
+        try:
+            detector = BallDetector(replace(config, detection_backend=backend), image_mode=True)
+        except (RuntimeError, ValueError, OSError) as error:
+            rows.append({'backend': backend, 'error': str(error)})
+            continue
+        with detector:
+            single_ms = []
+            top_boxes = []
+            for index, frame in enumerate(frames):
+                start = time.perf_counter()
+                candidates = detector.detect_candidates(frame, index * 33)
+                single_ms.append((time.perf_counter() - start) * 1000)
+                top_boxes.append(candidates[0].bbox if candidates else None)
+            batch_ms = []
+            for start_index in range(0, len(frames), batch_size):
+                group = frames[start_index:start_index + batch_size]
+                start = time.perf_counter()
+                detector.detect_candidates_batch(
+                    group, [index * 33 for index in range(start_index, start_index + len(group))]
+                )
+                batch_ms.append((time.perf_counter() - start) * 1000 / len(group))
+
+        if reference is None:
+            reference = top_boxes
+        agreements = 0
+        ious = []
+        for box, reference_box in zip(top_boxes, reference):
+            if box is None or reference_box is None:
+                agreements += box is None and reference_box is None
+                continue
+            iou = bbox_iou(box, reference_box)
+            ious.append(iou)
+            agreements += iou >= iou_threshold
+        rows.append({
+            'backend': backend,
+            'single_ms': float(np.median(single_ms[min(batch_size, len(single_ms) - 1):])),
+            'batch_ms': float(np.median(batch_ms[1:] or batch_ms)),
+            'detection_rate': sum(box is not None for box in top_boxes) / max(1, len(frames)),
+            'agreement': agreements / max(1, len(frames)),
+            'mean_iou': float(np.mean(ious)) if ious else None,
+        })
+    return rows
@@ -0,0 +1,30 @@
+"""Detector clock module keeping MediaPipe timestamps strictly increasing."""
+
+
+class DetectorClock:
+    """
+    Maps frame timestamps onto a strictly increasing detector clock.
+
+    MediaPipe VIDEO and LIVE_STREAM graphs reject timestamps that do not
+    increase. A detector kept loaded between videos sees every new video
+    start again at 0 ms, so timestamps are shifted past the last one the
+    graph has seen whenever they would go backwards. Within one video the
+    mapping is a constant offset, so frame spacing is preserved.
+    """
+
+    def __init__(self):
+        """Initializes the DetectorClock."""
+        self._offset_ms = 0
+        self._last_ms = -1
+
+    def map(self, timestamp_ms: int) -> int:
+        """
+        Returns the detector timestamp for a frame timestamp.
+
+        Args:
+            timestamp_ms: Frame timestamp in milliseconds.
+        """
+        if timestamp_ms + self._offset_ms <= self._last_ms:
+            self._offset_ms = self._last_ms + 1 - timestamp_ms
+        self._last_ms = timestamp_ms + self._offset_ms
+        return self._last_ms
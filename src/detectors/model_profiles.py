@@ -0,0 +1,222 @@
+"""Model profile module for choosing pose and detection model tiers."""
+
+import json
+import os
+import platform
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from detectors.ball_detector import BallDetector
+from detectors.pose_detector import PoseDetector
+
+POSE_MODEL_FILES = {
+    'lite': 'pose_landmarker_lite.task',
+    'full': 'pose_landmarker_full.task',
+    'heavy': 'pose_landmarker_heavy.task',
+}
+
+DETECTION_MODEL_FILES = {
+    'lite': 'efficientdet_lite0.tflite',
+    'full': 'efficientdet_lite2.tflite',
+}
+
+
+@dataclass
+class ModelProfile:
+    """
+    A pair of pose and detection model tiers.
+
+    Attributes:
+        name: Profile name used in Config.model_profile.
+        pose_tier: Key of POSE_MODEL_FILES.
+        detection_tier: Key of DETECTION_MODEL_FILES.
+    """
+
+    name: str
+    pose_tier: str
+    detection_tier: str
+
+
+# Ordered from most accurate to fastest; auto mode picks the first one that
+# reaches the target FPS and falls back towards the end of the list
+MODEL_PROFILES = [
+    ModelProfile('accurate', 'heavy', 'full'),
+    ModelProfile('balanced', 'full', 'lite'),
+    ModelProfile('fast', 'lite', 'lite'),
+]
+
+
+class ModelProfileSelector:
+    """
+    Resolves Config.model_profile into concrete model paths.
+
+    A named profile ('accurate', 'balanced', 'fast') selects its pose and
+    detection tiers directly. 'auto' estimates the throughput of every
+    profile on this machine and picks the most accurate one that reaches
+    model_target_fps. Per-model latencies are read from the calibration
+    file when it has an entry for this machine and model file, and
+    benchmarked and cached otherwise.
+
+    Profiles whose model files are missing are skipped, falling back to the
+    next faster profile. When nothing fits, the configured paths are kept.
+
+    Attributes:
+        config: Configuration object with model paths and profile settings.
+        models_dir: Directory holding the tier model files.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the ModelProfileSelector.
+
+        Args:
+            config: Config object containing model paths and profile settings.
+        """
+        self.config = config
+        self.models_dir = os.path.dirname(config.pose_model_path)
+
+    def _paths(self, profile: ModelProfile) -> tuple[str, str]:
+        return (
+            os.path.join(self.models_dir, POSE_MODEL_FILES[profile.pose_tier]),
+            os.path.join(self.models_dir, DETECTION_MODEL_FILES[profile.detection_tier])
+        )
+
+    def _available(self, profile: ModelProfile) -> bool:
+        return all(os.path.exists(path) for path in self._paths(profile))
+
+    @staticmethod
+    def _machine_key() -> str:
+        return f"{platform.node()}|{platform.machine()}|{platform.processor()}|{os.cpu_count()}"
+
+    @staticmethod
+    def _model_key(path: str) -> str:
+        return f"{os.path.basename(path)}:{os.path.getsize(path)}"
+
+    def _load_calibration(self) -> dict:
+        try:
+            with open(self.config.model_calibration_path) as calibration_file:
+                return json.load(calibration_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_calibration(self, calibration: dict) -> None:
+        try:
+            with open(self.config.model_calibration_path, 'w') as calibration_file:
+                json.dump(calibration, calibration_file, indent=2)
+        except OSError as error:
+            print(f"[MODELS] could not write calibration: {error}")
+
+    def _benchmark_frames(self) -> list[np.ndarray]:
+        frames = []
+        cap = cv2.VideoCapture(self.config.reference_video_path)
+        while len(frames) < self.config.model_benchmark_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        if not frames:
+            frames = [np.zeros((720, 1280, 3), dtype=np.uint8)] * self.config.model_benchmark_frames
+        return frames
+
+    def _benchmark_ms(self, path: str, frames: list[np.ndarray]) -> float:
+        """Returns the median per-frame latency of one model, warm-up excluded."""
+        if path.endswith('.task'):
+            detector = PoseDetector(replace(self.config, pose_model_path=path))
+            run = detector.detect
+        else:
+            detector = BallDetector(replace(self.config, object_detection_model_path=path))
+            run = detector.detect_candidates
+        timings = []
+        with detector:
+            for index, frame in enumerate(frames):
+                start = time.perf_counter()
+                run(frame, index * 33)
+                timings.append((time.perf_counter() - start) * 1000)
+        warm = timings[min(3, len(timings) - 1):]
+        return float(np.median(warm))
+
+    def estimate_fps(self) -> dict[str, float]:
+        """
+        Returns the estimated processing FPS of every available profile.
+
+        Pose runs on every frame and detection on every
+        detect_every_n_frames-th frame, so the frame cost is
+        pose_ms + detection_ms / detect_every_n_frames.
+        """
+        calibration = self._load_calibration()
+        machine = calibration.setdefault(self._machine_key(), {})
+        frames: Optional[list[np.ndarray]] = None
+        updated = False
+        estimates = {}
+        for profile in MODEL_PROFILES:
+            if not self._available(profile):
+                continue
+            latencies = []
+            for path in self._paths(profile):
+                key = self._model_key(path)
+                if key not in machine:
+                    if frames is None:
+                        frames = self._benchmark_frames()
+                    machine[key] = self._benchmark_ms(path, frames)
+                    updated = True
+                latencies.append(machine[key])
+            pose_ms, detection_ms = latencies
+            frame_ms = pose_ms + detection_ms / max(1, self.config.detect_every_n_frames)
+            estimates[profile.name] = 1000.0 / max(frame_ms, 1e-6)
+        if updated:
+            self._save_calibration(calibration)
+        return estimates
+
+    def select(self) -> Optional[ModelProfile]:
+        """
+        Returns the profile to use, or None to keep the configured paths.
+
+        Raises:
+            ValueError: If model_profile is not None, 'auto' or a profile name.
+        """
+        requested = self.config.model_profile
+        if requested is None:
+            return None
+        names = [profile.name for profile in MODEL_PROFILES]
+        if requested != 'auto' and requested not in names:
+            raise ValueError(f"Unknown model profile: {requested}")
+
+        if requested == 'auto':
+            estimates = self.estimate_fps()
+            for name, fps in estimates.items():
+                print(f"[MODELS] profile={name} est_fps={fps:.1f}")
+            candidates = [p for p in MODEL_PROFILES if p.name in estimates]
+            for profile in candidates:
+                if estimates[profile.name] >= self.config.model_target_fps:
+                    return profile
+            # Nothing reaches the target: use the fastest available profile
+            return candidates[-1] if candidates else None
+
+        for profile in MODEL_PROFILES[names.index(requested):]:
+            if self._available(profile):
+                if profile.name != requested:
+                    print(f"[MODELS] profile={requested} unavailable, using {profile.name}")
+                return profile
+        return None
+
+    def resolve(self):
+        """
+        Returns a copy of the config with model paths set from the selected profile.
+        """
+        profile = self.select()
+        if profile is None:
+            if self.config.model_profile is not None:
+                print("[MODELS] no profile models found, keeping configured paths")
+            return self.config
+        pose_path, detection_path = self._paths(profile)
+        print(f"[MODELS] using profile={profile.name} pose={pose_path} detection={detection_path}")
+        return replace(
+            self.config,
+            pose_model_path=pose_path,
+            object_detection_model_path=detection_path
+        )
@@ -1,10 +1,18 @@
 """Pose detector module using MediaPipe PoseLandmarker."""
 
-import mediapipe as mp
-from mediapipe.tasks.python import vision
+import threading
+
 import cv2
 import numpy as np
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Sequence
+
+# mediapipe takes most of a second to import, so it is only loaded when a
+# detector is created (and for the per-frame mp.Image wrapper)
+if TYPE_CHECKING:
+    import mediapipe as mp
+    from mediapipe.tasks.python import vision
+
+from detectors.detector_clock import DetectorClock
 
 
 class PoseDetector:
@@ -14,34 +22,54 @@ class PoseDetector:
     This class wraps the MediaPipe PoseLandmarker to detect human body
     landmarks in video frames.
     
+    In live-stream mode the landmarker runs asynchronously: detect() submits
+    the frame and returns the newest landmarks delivered by MediaPipe, as long
+    as they are within the configured latency budget.
+    
     Attributes:
         landmarker: MediaPipe PoseLandmarker instance.
         config: Configuration object with pose detection parameters.
+        live_stream: Whether the landmarker uses the LIVE_STREAM running mode.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, live_stream: bool = False):
         """
         Initializes the PoseDetector.
         
         Args:
             config: Config object containing model path and pose detection parameters.
+            live_stream: Use MediaPipe LIVE_STREAM running mode instead of VIDEO.
         """
         self.config = config
+        self.live_stream = live_stream
+        self._result_lock = threading.Lock()
+        self._latest_result: Optional[tuple[int, Optional[dict[str, tuple[int, int]]]]] = None
+        self._clock = DetectorClock()
         self.landmarker = self._create_landmarker()
     
-    def _create_landmarker(self) -> vision.PoseLandmarker:
+    def _create_landmarker(self) -> "vision.PoseLandmarker":
         """
         Creates and configures a MediaPipe PoseLandmarker.
         
         Returns:
             PoseLandmarker: Configured pose landmarker instance.
         """
+        import mediapipe as mp
+        from mediapipe.tasks.python import vision
+
         base_options = mp.tasks.BaseOptions(
             model_asset_path=self.config.pose_model_path
         )
+        if self.live_stream:
+            mode_options = {
+                'running_mode': vision.RunningMode.LIVE_STREAM,
+                'result_callback': self._on_result,
+            }
+        else:
+            mode_options = {'running_mode': vision.RunningMode.VIDEO}
         options = vision.PoseLandmarkerOptions(
             base_options=base_options,
-            running_mode=vision.RunningMode.VIDEO,
+            **mode_options,
             num_poses=self.config.num_poses,
             min_pose_detection_confidence=self.config.pose_detection_confidence,
             min_pose_presence_confidence=self.config.pose_presence_confidence,
@@ -49,31 +77,19 @@ class PoseDetector:
         )
         return vision.PoseLandmarker.create_from_options(options)
     
-    def detect(self, frame: np.ndarray, timestamp_ms: int) -> Optional[dict[str, tuple[int, int]]]:
-        """
-        Detects human pose landmarks in a frame.
-        
-        Args:
-            frame: Video frame as numpy array (BGR format).
-            timestamp_ms: Timestamp of the frame in milliseconds.
-        
-        Returns:
-            Dictionary containing landmark positions or None if no pose detected.
-            Keys: 'left_wrist', 'right_wrist', 'left_elbow', 'right_elbow',
-                  'left_shoulder', 'right_shoulder', 'left_hip', 'right_hip',
-                  'left_knee', 'right_knee', 'hip_center'
-        """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        
-        results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
-        
+    @staticmethod
+    def _landmarks_from_result(
+        results,
+        w: int,
+        h: int
+    ) -> Optional[dict[str, tuple[int, int]]]:
         if not results.pose_landmarks or len(results.pose_landmarks) == 0:
             return None
         
-        landmarks = results.pose_landmarks[0]
-        h, w = frame.shape[:2]
-        
+        return PoseDetector._landmarks_from_pose(results.pose_landmarks[0], w, h)
+    
+    @staticmethod
+    def _landmarks_from_pose(landmarks, w: int, h: int) -> dict[str, tuple[int, int]]:
         # MediaPipe Pose landmark indices
         left_wrist = landmarks[15]
         right_wrist = landmarks[16]
@@ -103,6 +119,144 @@ class PoseDetector:
             'hip_center': (int(hip_center_x * w), int(hip_center_y * h))
         }
     
+    def _on_result(self, results, output_image: "mp.Image", timestamp_ms: int) -> None:
+        """Receives asynchronous results in live-stream mode."""
+        pose_data = self._landmarks_from_result(
+            results, output_image.width, output_image.height
+        )
+        with self._result_lock:
+            self._latest_result = (timestamp_ms, pose_data)
+    
+    def _latest_live_result(self, timestamp_ms: int) -> Optional[dict[str, tuple[int, int]]]:
+        """
+        Returns the newest live landmarks if they are within the latency budget.
+        
+        Unlike ball detections, landmarks are not consumed: the body moves
+        slowly enough that the newest pose is the best estimate for every
+        frame submitted while the landmarker is still busy.
+        """
+        with self._result_lock:
+            latest = self._latest_result
+        if latest is None:
+            return None
+        result_timestamp_ms, pose_data = latest
+        if timestamp_ms - result_timestamp_ms > self.config.live_latency_budget_ms:
+            return None
+        return pose_data
+    
+    def detect(
+        self,
+        frame: np.ndarray,
+        timestamp_ms: int,
+        frame_rgb: Optional[np.ndarray] = None
+    ) -> Optional[dict[str, tuple[int, int]]]:
+        """
+        Detects human pose landmarks in a frame.
+        
+        Args:
+            frame: Video frame as numpy array (BGR format).
+            timestamp_ms: Timestamp of the frame in milliseconds.
+            frame_rgb: Optional RGB conversion of frame, to avoid converting again.
+        
+        Returns:
+            Dictionary containing landmark positions or None if no pose detected.
+            Keys: 'left_wrist', 'right_wrist', 'left_elbow', 'right_elbow',
+                  'left_shoulder', 'right_shoulder', 'left_hip', 'right_hip',
+                  'left_knee', 'right_knee', 'hip_center'
+        """
+        import mediapipe as mp
+
+        timestamp_ms = self._clock.map(timestamp_ms)
+        if frame_rgb is None:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        
+        if self.live_stream:
+            self.landmarker.detect_async(mp_image, timestamp_ms)
+            return self._latest_live_result(timestamp_ms)
+        
+        results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        h, w = frame.shape[:2]
+        return self._landmarks_from_result(results, w, h)
+    
+    def detect_batch(
+        self,
+        frames_rgb: Sequence[np.ndarray],
+        timestamps_ms: Sequence[int]
+    ) -> list[Optional[dict[str, tuple[int, int]]]]:
+        """
+        Detects pose landmarks in a group of consecutive frames.
+        
+        MediaPipe Tasks graphs take one image per call, so this runs the
+        frames back to back; it saves the per-frame conversion and call
+        setup, and results are identical to calling detect() per frame.
+        Only available in VIDEO running mode.
+        
+        Args:
+            frames_rgb: Frames in RGB format, in timestamp order (e.g. the
+                slots of a FrameBatch).
+            timestamps_ms: Timestamp of each frame in milliseconds.
+        
+        Returns:
+            One landmark dictionary (or None) per frame, as from detect().
+        
+        Raises:
+            RuntimeError: If the landmarker runs in live-stream mode.
+        """
+        import mediapipe as mp
+
+        if self.live_stream:
+            raise RuntimeError("detect_batch() requires the VIDEO running mode")
+        image_format = mp.ImageFormat.SRGB
+        detect_for_video = self.landmarker.detect_for_video
+        results = []
+        for frame_rgb, timestamp_ms in zip(frames_rgb, timestamps_ms):
+            h, w = frame_rgb.shape[:2]
+            result = detect_for_video(
+                mp.Image(image_format=image_format, data=frame_rgb),
+                self._clock.map(timestamp_ms)
+            )
+            results.append(self._landmarks_from_result(result, w, h))
+        return results
+    
+    def detect_all(
+        self,
+        frame: np.ndarray,
+        timestamp_ms: int,
+        frame_rgb: Optional[np.ndarray] = None
+    ) -> list[dict[str, tuple[int, int]]]:
+        """
+        Detects the landmarks of every person in a frame (up to num_poses).
+        
+        Only available in VIDEO running mode.
+        
+        Args:
+            frame: Video frame as numpy array (BGR format).
+            timestamp_ms: Timestamp of the frame in milliseconds.
+            frame_rgb: Optional RGB conversion of frame, to avoid converting again.
+        
+        Returns:
+            One landmark dictionary per detected person, with the keys of detect().
+        
+        Raises:
+            RuntimeError: If the landmarker runs in live-stream mode.
+        """
+        import mediapipe as mp
+
+        if self.live_stream:
+            raise RuntimeError("detect_all() requires the VIDEO running mode")
+        timestamp_ms = self._clock.map(timestamp_ms)
+        if frame_rgb is None:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
+        
+        results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+        h, w = frame.shape[:2]
+        return [
+            self._landmarks_from_pose(landmarks, w, h)
+            for landmarks in results.pose_landmarks or []
+        ]
+    
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -0,0 +1,216 @@
+"""Pose scheduler module for motion-gated pose inference."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+Landmarks = dict[str, tuple[int, int]]
+
+
+class PoseScheduler:
+    """
+    Decides per frame whether pose inference is needed and fills skipped frames.
+
+    Motion energy is the mean absolute difference between the grayscale
+    thumbnail of the current frame and the thumbnail stored at the last pose
+    measurement, restricted to the person region (landmark bbox plus a
+    margin). Pose is measured when the energy reaches pose_motion_threshold,
+    after pose_max_skip_frames skipped frames, or when no pose is known yet.
+
+    Skipped frames get landmarks extrapolated from the last two measurements.
+    When the next measurement arrives, the skipped frames' records are
+    rewritten with landmarks interpolated between the two measurements
+    that bracket them, so offline analysis sees interpolated values.
+
+    Independently of motion, every_n_frames > 1 caps measurements at one
+    every every_n_frames frames (the quality governor lowers the pose rate
+    this way).
+
+    Attributes:
+        config: Configuration object with pose gating parameters.
+        every_n_frames: Measure at most every every_n_frames-th frame.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the PoseScheduler.
+
+        Args:
+            config: Config object containing pose gating parameters.
+        """
+        self.config = config
+        self.every_n_frames = 1
+        self._reference: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._previous: Optional[tuple[int, Landmarks]] = None
+        self._last: Optional[tuple[int, Landmarks]] = None
+        self._pending: list[dict] = []
+        self._skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether frames are skipped; when False every frame is measured."""
+        return self.config.pose_gating or self.every_n_frames > 1
+
+    def _person_roi(
+        self,
+        landmarks: Landmarks,
+        scale: float,
+        shape: tuple[int, int]
+    ) -> tuple[int, int, int, int]:
+        xs = [point[0] for point in landmarks.values()]
+        ys = [point[1] for point in landmarks.values()]
+        margin_x = self.config.pose_roi_margin * (max(xs) - min(xs))
+        margin_y = self.config.pose_roi_margin * (max(ys) - min(ys))
+        height, width = shape
+        x1 = max(0, int((min(xs) - margin_x) * scale))
+        y1 = max(0, int((min(ys) - margin_y) * scale))
+        x2 = min(width, int((max(xs) + margin_x) * scale) + 1)
+        y2 = min(height, int((max(ys) + margin_y) * scale) + 1)
+        return x1, y1, x2, y2
+
+    def motion_energy(self, thumbnail: np.ndarray, scale: float) -> Optional[float]:
+        """
+        Returns the person-region motion since the last measurement.
+
+        Args:
+            thumbnail: Grayscale thumbnail of the current frame.
+            scale: Thumbnail width divided by frame width.
+
+        Returns:
+            Mean absolute grayscale difference, or None when there is no
+            reference measurement to compare against.
+        """
+        if (
+            self._last is None or
+            self._reference is None or
+            self._reference.shape != thumbnail.shape
+        ):
+            return None
+        x1, y1, x2, y2 = self._person_roi(self._last[1], scale, thumbnail.shape)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        diff = self._diff[y1:y2, x1:x2]
+        cv2.absdiff(thumbnail[y1:y2, x1:x2], self._reference[y1:y2, x1:x2], dst=diff)
+        return float(cv2.mean(diff)[0])
+
+    def should_measure(self, thumbnail: np.ndarray, scale: float) -> bool:
+        """
+        Returns True when pose inference should run on the current frame.
+
+        Args:
+            thumbnail: Grayscale thumbnail of the current frame.
+            scale: Thumbnail width divided by frame width.
+        """
+        if not self.enabled or self._last is None:
+            return True
+        if self._skipped + 1 < self.every_n_frames:
+            return False
+        if not self.config.pose_gating:
+            return True
+        if self._skipped >= self.config.pose_max_skip_frames:
+            return True
+        energy = self.motion_energy(thumbnail, scale)
+        return energy is None or energy >= self.config.pose_motion_threshold
+
+    def record_measurement(
+        self,
+        pose_data: Optional[Landmarks],
+        thumbnail: np.ndarray,
+        timestamp_ms: int
+    ) -> None:
+        """
+        Stores a measured pose and back-fills the frames skipped before it.
+
+        Args:
+            pose_data: Landmarks returned by PoseDetector, or None.
+            thumbnail: Grayscale thumbnail of the measured frame.
+            timestamp_ms: Timestamp of the measured frame.
+        """
+        if not self.enabled:
+            # every_n_frames was just lowered back to 1: settle the frames
+            # skipped before this measurement, then stop tracking
+            if self._last is not None and pose_data is not None:
+                self._fill_pending(timestamp_ms, pose_data)
+            self._pending.clear()
+            self._previous = None
+            self._last = None
+            return
+        self._skipped = 0
+        if pose_data is None:
+            # Nothing to compare against: measure again on the next frame
+            self._previous = None
+            self._last = None
+            self._pending.clear()
+            return
+
+        if self._last is not None:
+            self._fill_pending(timestamp_ms, pose_data)
+        self._pending.clear()
+
+        self._previous = self._last
+        self._last = (timestamp_ms, pose_data)
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            self._reference = np.empty_like(thumbnail)
+            self._diff = np.empty_like(thumbnail)
+        np.copyto(self._reference, thumbnail)
+
+    def _fill_pending(self, timestamp_ms: int, pose_data: Landmarks) -> None:
+        for frame_data in self._pending:
+            interpolated = self._blend(
+                self._last, (timestamp_ms, pose_data), frame_data['timestamp_ms']
+            )
+            for name, point in interpolated.items():
+                if name in frame_data:
+                    frame_data[name] = point
+
+    def infer(self, timestamp_ms: int) -> Optional[Landmarks]:
+        """
+        Returns landmarks for a skipped frame, extrapolated from the last measurements.
+
+        Args:
+            timestamp_ms: Timestamp of the skipped frame.
+        """
+        self._skipped += 1
+        if self._last is None:
+            return None
+        if self._previous is None:
+            return dict(self._last[1])
+        return self._blend(self._previous, self._last, timestamp_ms)
+
+    def track_inferred(self, frame_data: dict) -> None:
+        """
+        Registers a frame record whose landmarks were inferred.
+
+        The record's landmark entries are replaced with interpolated values
+        once the next measurement is recorded.
+
+        Args:
+            frame_data: Frame record built from infer() landmarks.
+        """
+        self._pending.append(frame_data)
+
+    def is_pending(self, frame_data: dict) -> bool:
+        """Returns True while a tracked record still waits for its interpolated landmarks."""
+        return any(pending is frame_data for pending in self._pending)
+
+    @staticmethod
+    def _blend(
+        start: tuple[int, Landmarks],
+        end: tuple[int, Landmarks],
+        timestamp_ms: int
+    ) -> Landmarks:
+        (t0, p0), (t1, p1) = start, end
+        alpha = (timestamp_ms - t0) / (t1 - t0) if t1 != t0 else 1.0
+        blended = {}
+        for name, (x1, y1) in p1.items():
+            if name not in p0:
+                blended[name] = (x1, y1)
+                continue
+            x0, y0 = p0[name]
+            blended[name] = (
+                int(round(x0 + alpha * (x1 - x0))),
+                int(round(y0 + alpha * (y1 - y0)))
+            )
+        return blended
@@ -0,0 +1,182 @@
+"""Region proposer module finding moving orange regions for the ball detector."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+_DILATE_ITERATIONS = 2
+
+
+@dataclass
+class RegionProposal:
+    """
+    A moving orange region that may contain the ball.
+
+    Attributes:
+        bbox: Tuple of (x, y, w, h) of the motion-and-orange blob.
+        crop: Tuple of (x, y, w, h) of the padded region the detector sees.
+    """
+
+    bbox: tuple[int, int, int, int]
+    crop: tuple[int, int, int, int]
+
+
+class MotionRegionProposer:
+    """
+    Proposes ball search regions from background subtraction and the orange mask.
+
+    A MOG2 background model (cv2.createBackgroundSubtractorMOG2) is updated
+    with every analyzed frame at motion_proposal_width, which is cheap next
+    to a detector call. On detection frames the foreground mask is
+    intersected with the orange mask; the remaining blobs are moving orange
+    things, which on a fixed camera is mostly the ball. Each blob is padded
+    into a crop of at least motion_proposal_min_size pixels, overlapping
+    crops are merged, and the largest motion_proposal_max_regions are
+    returned.
+
+    Until the background model has seen motion_proposal_warmup_frames
+    frames, or after the frame size changes, no regions are proposed.
+
+    Attributes:
+        config: Configuration object with the motion_proposal_* settings.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the MotionRegionProposer.
+
+        Args:
+            config: Config object containing the motion_proposal_* settings.
+        """
+        self.config = config
+        self._subtractor: Optional[cv2.BackgroundSubtractorMOG2] = None
+        self._frame_shape: Optional[tuple[int, int]] = None
+        self._small: Optional[np.ndarray] = None
+        self._foreground: Optional[np.ndarray] = None
+        self._orange: Optional[np.ndarray] = None
+        self._frames_seen = 0
+
+    def _allocate(self, shape: tuple[int, ...]) -> None:
+        height, width = shape[:2]
+        small_width = min(width, self.config.motion_proposal_width)
+        small_height = max(1, round(height * small_width / width))
+        self._small = np.empty((small_height, small_width, 3), dtype=np.uint8)
+        self._foreground = np.empty((small_height, small_width), dtype=np.uint8)
+        self._orange = np.empty_like(self._foreground)
+        self._subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=self.config.motion_proposal_history,
+            varThreshold=self.config.motion_proposal_var_threshold,
+            detectShadows=False
+        )
+        self._frame_shape = (height, width)
+        self._frames_seen = 0
+
+    def update(self, frame: np.ndarray) -> None:
+        """
+        Feeds an analyzed frame to the background model.
+
+        Args:
+            frame: Video frame as numpy array (BGR format).
+        """
+        if self._frame_shape != frame.shape[:2]:
+            self._allocate(frame.shape)
+        height, width = self._foreground.shape
+        cv2.resize(frame, (width, height), dst=self._small, interpolation=cv2.INTER_AREA)
+        self._subtractor.apply(self._small, self._foreground)
+        self._frames_seen += 1
+
+    def _crop(
+        self,
+        bbox: tuple[int, int, int, int],
+        frame_height: int,
+        frame_width: int
+    ) -> tuple[int, int, int, int]:
+        x, y, w, h = bbox
+        side = max(
+            self.config.motion_proposal_min_size,
+            round(max(w, h) * (1 + 2 * self.config.motion_proposal_padding))
+        )
+        x1 = max(0, min(x + w // 2 - side // 2, frame_width - side))
+        y1 = max(0, min(y + h // 2 - side // 2, frame_height - side))
+        return x1, y1, min(side, frame_width - x1), min(side, frame_height - y1)
+
+    @staticmethod
+    def _merge(crops: list[tuple[int, int, int, int]]) -> list[tuple[int, int, int, int]]:
+        merged = list(crops)
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(merged)):
+                for j in range(i + 1, len(merged)):
+                    ax, ay, aw, ah = merged[i]
+                    bx, by, bw, bh = merged[j]
+                    if ax >= bx + bw or bx >= ax + aw or ay >= by + bh or by >= ay + ah:
+                        continue
+                    x1, y1 = min(ax, bx), min(ay, by)
+                    x2, y2 = max(ax + aw, bx + bw), max(ay + ah, by + bh)
+                    merged[i] = (x1, y1, x2 - x1, y2 - y1)
+                    del merged[j]
+                    changed = True
+                    break
+                if changed:
+                    break
+        return merged
+
+    def propose(self, orange_mask: np.ndarray) -> list[RegionProposal]:
+        """
+        Returns the moving orange regions of the last updated frame.
+
+        Args:
+            orange_mask: Binary orange mask (0 or 255) of that frame.
+
+        Returns:
+            Proposals ordered by descending blob area, at most
+            motion_proposal_max_regions; empty during warm-up or when
+            nothing orange moves.
+        """
+        if self._frames_seen < self.config.motion_proposal_warmup_frames:
+            return []
+        height, width = self._foreground.shape
+        # Any orange pixel in a cell keeps it; INTER_AREA averages, so > 0 works as OR
+        cv2.resize(orange_mask, (width, height), dst=self._orange, interpolation=cv2.INTER_AREA)
+        cv2.threshold(self._orange, 0, 255, cv2.THRESH_BINARY, dst=self._orange)
+        cv2.bitwise_and(self._foreground, self._orange, dst=self._orange)
+        # Joins blobs MOG2 split; each iteration grows them by a pixel per side
+        cv2.dilate(self._orange, None, dst=self._orange, iterations=_DILATE_ITERATIONS)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(self._orange, connectivity=8)
+
+        min_area = self.config.motion_proposal_min_area_ratio * width * height
+        blobs = sorted(
+            (stats[label] for label in range(1, count) if stats[label][4] >= min_area),
+            key=lambda blob: blob[4],
+            reverse=True
+        )[:self.config.motion_proposal_max_regions]
+        frame_height, frame_width = self._frame_shape
+        scale = frame_width / width
+        proposals = []
+        for x, y, w, h, _ in blobs:
+            grown = _DILATE_ITERATIONS
+            x, y = x + grown, y + grown
+            w, h = max(1, w - 2 * grown), max(1, h - 2 * grown)
+            bbox = (
+                int(x * scale), int(y * scale),
+                max(1, round(w * scale)), max(1, round(h * scale))
+            )
+            proposals.append(RegionProposal(bbox, self._crop(bbox, frame_height, frame_width)))
+        crops = self._merge([proposal.crop for proposal in proposals])
+        if len(crops) < len(proposals):
+            # Blobs whose crops merged share the merged crop
+            for proposal in proposals:
+                x, y, _, _ = proposal.crop
+                proposal.crop = next(
+                    crop for crop in crops
+                    if crop[0] <= x < crop[0] + crop[2] and crop[1] <= y < crop[1] + crop[3]
+                )
+        return proposals
+
+    @staticmethod
+    def crops(proposals: list[RegionProposal]) -> list[tuple[int, int, int, int]]:
+        """Returns the distinct detector crops of a proposal list, in order."""
+        return list(dict.fromkeys(proposal.crop for proposal in proposals))
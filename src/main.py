@@ -1,26 +1,57 @@
 """Main video processing module with VideoProcessor orchestrator."""
 
+import asyncio
+import contextlib
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from queue import SimpleQueue
+
+# Measured so cold start (imports + model loading + first frame) can be reported
+_IMPORT_START = time.perf_counter()
+
 import cv2
-from typing import Optional
+import numpy as np
+from typing import AsyncIterator, Callable, Iterator, Optional
 
 from config import Config
-from detectors.ball_detector import BallDetector
+from detectors.ball_detector import BallCandidate, BallDetector
 from detectors.pose_detector import PoseDetector
+from detectors.candidate_selector import BallCandidateSelector
+from detectors.blob_ball_locator import BlobBallLocator
+from detectors.model_profiles import ModelProfileSelector
+from detectors.pose_scheduler import PoseScheduler
+from detectors.region_proposer import MotionRegionProposer
 from trackers.ball_tracker import BallTracker
-from processors.data_cleaner import DataCleaner
-from processors.normalizer import CoordinateNormalizer
-from processors.cycle_detector import CycleDetector
-from processors.contact_labeler import ContactLabeler
-from processors.cycle_metrics import CycleMetrics
-from processors.session_aggregator import SessionAggregator
+from trackers.bidirectional_filler import BidirectionalGapFiller
+from trackers.multi_ball_tracker import MultiBallTracker
+from trackers.player_tracker import PlayerTracker
+from models.session_summary import SessionSummary
+from processors.session_analyzer import SessionAnalyzer
+from processors.rolling_cycle_analyzer import RollingCycleAnalyzer
 from visualizers.frame_visualizer import FrameVisualizer
+from visualizers.video_writer import AnnotatedVideoWriter
+from utils.frame_batch import FrameBatch
+from utils.activity_monitor import ActivityMonitor
+from utils.duplicate_frames import DuplicateFrameDetector
+from utils.frame_sampler import FrameSampler, SampledCapture
+from utils.frame_buffers import FrameBuffers
+from utils.live_source import LiveFrameSource, LiveStats, parse_live_source
+from utils.perception_stats import PerceptionStats
+from utils.quality_governor import QualityGovernor, QualityLevel
+from utils.pipeline_event import CYCLE, FRAME, SUMMARY, PipelineEvent
+from utils.shared_frame_ring import SharedFrameRing, decode_to_ring
+from utils.thread_budget import ThreadAllocation, ThreadBudget
 from utils.video_utils import (
-    apply_orange_mask,
     bbox_area_ratio,
-    bbox_orange_ratio,
+    bbox_center,
     bbox_iou
 )
 
+IMPORT_MS = (time.perf_counter() - _IMPORT_START) * 1000
+
 
 class VideoProcessor:
     """
@@ -31,44 +62,320 @@ class VideoProcessor:
     
     Attributes:
         config: Configuration object with all parameters.
-        ball_detector: Ball detection component.
-        pose_detector: Pose detection component.
+        ball_detector: Ball detection component, created on first use.
+        pose_detector: Pose detection component, created on first use.
+        warm: Keep detectors loaded after each job so the next job skips
+            model loading.
         ball_tracker: Ball tracking component.
+        candidate_selector: Scores detection candidates against motion and masks.
+        blob_locator: Orange-blob fast path tried before the neural detector.
+        region_proposer: Moving orange regions the detector is limited to,
+            or None unless motion_proposals is set (not used in live mode).
+        pose_scheduler: Motion gate deciding which frames run pose inference.
         data_cleaner: Data cleaning component.
         normalizer: Coordinate normalization component.
         cycle_detector: Dribble cycle detection component.
+        session_analyzer: Evaluation chain from frame records to SessionSummary.
+        live_stats: Latency and frame-drop counters of the last live session.
         visualizer: Frame visualization component.
-        frame_data_list: List to store raw detection data from each frame.
+        video_writer: Background writer for the annotated video, if enabled.
+        frame_buffers: Reused per-frame HSV, mask, masked and RGB buffers.
+        duplicate_detector: Repeated-frame check run before perception, or
+            None unless skip_duplicate_frames is set.
+        activity_monitor: Idle-stretch detector, or None unless
+            idle_detection is set.
+        quality_governor: Deadline-driven quality control of the current
+            process() job, or None unless quality_budget_s is set.
+        detect_every_n_frames: Detection interval in effect (the governor
+            lengthens it).
+        analysis_scale: Scale frames are resized to before perception
+            (the governor lowers it); records stay in source coordinates.
+        frame_data_list: List to store raw detection data from each frame
+            (process_live() keeps only the latest one).
+        multi_ball_tracker: Ball tracks of multi-player mode.
+        player_tracker: Player identities and ball ownership of multi-player mode.
+        player_frame_data: Raw frame records per player id in multi-player mode.
+        fallback_candidates: Runner-up candidates from the last detection.
+        perception_stats: Detector, tracker and fallback counters.
+        startup_ms: Cold start timings (imports, model profile, detector
+            loading, first frame) in milliseconds.
+        thread_allocation: Cores and thread counts applied when cpu_budget
+            is set, else None.
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, warm: bool = False):
         """
         Initializes the VideoProcessor.
         
+        MediaPipe graphs are not built here: each detector is created the
+        first time it is used, so runs that only post-process frame records
+        never load the models.
+        
+        With cpu_budget set, the process's thread budget is applied here,
+        before any detector threads exist.
+        
         Args:
             config: Config object containing all paths and parameters.
+            warm: Keep detectors loaded between process() calls.
         """
+        self.thread_allocation: Optional[ThreadAllocation] = None
+        if config.cpu_budget:
+            budget = ThreadBudget(config)
+            config = budget.apply()
+            self.thread_allocation = budget.allocation
         self.config = config
-        self.ball_detector = BallDetector(config)
-        self.pose_detector = PoseDetector(config)
-        self.ball_tracker = BallTracker()
-        self.data_cleaner = DataCleaner(config.max_velocity)
-        self.normalizer = CoordinateNormalizer()
-        self.cycle_detector = CycleDetector(config.min_cycle_duration)
-        self.contact_labeler = ContactLabeler(
-            k=config.contact_threshold_k,
-            min_window_frames=config.min_contact_window_frames
-        )
-        self.cycle_metrics = None
-        self.session_aggregator = SessionAggregator(
-            crossover_hand_gap_tolerance=config.crossover_hand_gap_tolerance
-        )
+        self.warm = warm
+        self.startup_ms: dict[str, float] = {'imports': IMPORT_MS}
+        self._models_resolved = False
+        self._ball_detector: Optional[BallDetector] = None
+        self._pose_detector: Optional[PoseDetector] = None
+        self.ball_tracker = BallTracker(config.tracker_backend)
+        self.candidate_selector = BallCandidateSelector(config)
+        self.blob_locator = BlobBallLocator(config)
+        self.session_analyzer = SessionAnalyzer(config)
+        self.data_cleaner = self.session_analyzer.data_cleaner
+        self.normalizer = self.session_analyzer.normalizer
+        self.cycle_detector = self.session_analyzer.cycle_detector
+        self.contact_labeler = self.session_analyzer.contact_labeler
+        self.session_aggregator = self.session_analyzer.session_aggregator
+        self.live_stats: Optional[LiveStats] = None
         self.visualizer = FrameVisualizer()
+        self.video_writer: Optional[AnnotatedVideoWriter] = None
+        self.frame_buffers = FrameBuffers(
+            config.orange_mask_lower,
+            config.orange_mask_upper,
+            integral_after=config.orange_integral_after_queries
+        )
+        self.reset_session()
+
+    def reset_session(self) -> None:
+        """
+        Clears per-video state so the processor can start another video.
+        """
+        self.ball_tracker.reset()
+        self.ball_tracker.backend = self.config.tracker_backend
+        self.pose_scheduler = PoseScheduler(self.config)
+        self.quality_governor: Optional[QualityGovernor] = None
+        self.detect_every_n_frames = self.config.detect_every_n_frames
+        self.analysis_scale = 1.0
+        self._scaled_frame: Optional[np.ndarray] = None
         self.frame_data_list: list[dict] = []
         self.recent_ball_centers: list[tuple[int, int]] = []
         self.force_detect_frames: int = 0
         self.grace_frames_left: int = 0
         self.last_good_ball_center: Optional[tuple[int, int]] = None
+        self.fallback_candidates: list[tuple[int, int, int, int]] = []
+        self.fallback_age: int = 0
+        self.perception_stats = PerceptionStats()
+        self.duplicate_detector = (
+            DuplicateFrameDetector(self.config.duplicate_frame_max_diff)
+            if self.config.skip_duplicate_frames else None
+        )
+        self.activity_monitor = (
+            ActivityMonitor(self.config) if self.config.idle_detection else None
+        )
+        self.region_proposer = (
+            MotionRegionProposer(self.config)
+            if self.config.motion_proposals and self.config.live_source is None else None
+        )
+        self._last_overlay: Optional[np.ndarray] = None
+        self.multi_ball_tracker = MultiBallTracker(
+            max_balls=self.config.player_max_balls,
+            match_distance=self.config.player_match_distance,
+            max_missed_frames=self.config.player_max_missed_frames,
+            tracker_backend=self.config.tracker_backend
+        )
+        self.player_tracker = PlayerTracker(
+            max_players=self.config.num_poses,
+            match_distance=self.config.player_match_distance,
+            max_missed_frames=self.config.player_max_missed_frames,
+            smoothing=self.config.player_assignment_smoothing
+        )
+        self.player_frame_data: dict[int, list[dict]] = {}
+        self._batched_poses: deque[Optional[dict[str, tuple[int, int]]]] = deque()
+        self._batched_anchors: dict[int, list[BallCandidate]] = {}
+        self._batched_duplicates: dict[int, bool] = {}
+
+    def _resolve_models(self) -> None:
+        if self._models_resolved:
+            return
+        start = time.perf_counter()
+        self.config = ModelProfileSelector(self.config).resolve()
+        self.startup_ms['model_profile'] = (time.perf_counter() - start) * 1000
+        self._models_resolved = True
+
+    @property
+    def ball_detector(self) -> BallDetector:
+        if self._ball_detector is None:
+            self._resolve_models()
+            start = time.perf_counter()
+            live_stream = self.config.live_source is not None
+            self._ball_detector = BallDetector(
+                self.config,
+                live_stream=live_stream,
+                image_mode=self.config.offline_two_pass and not live_stream
+            )
+            self.startup_ms['ball_detector'] = (time.perf_counter() - start) * 1000
+        return self._ball_detector
+
+    @property
+    def pose_detector(self) -> PoseDetector:
+        if self._pose_detector is None:
+            self._resolve_models()
+            start = time.perf_counter()
+            self._pose_detector = PoseDetector(
+                self.config, live_stream=self.config.live_source is not None
+            )
+            self.startup_ms['pose_detector'] = (time.perf_counter() - start) * 1000
+        return self._pose_detector
+
+    def warm_up(self, frame_shape: tuple[int, int, int] = (720, 1280, 3)) -> None:
+        """
+        Loads both detectors and runs one inference each on a blank frame.
+
+        The first inference of a MediaPipe graph allocates its buffers, so
+        warming up moves that cost out of the first real frame.
+
+        Args:
+            frame_shape: Shape of the blank frame used for the warm-up call.
+        """
+        frame = np.zeros(frame_shape, dtype=np.uint8)
+        ball_detector = self.ball_detector
+        pose_detector = self.pose_detector
+        start = time.perf_counter()
+        ball_detector.detect_candidates(frame, 0)
+        pose_detector.detect(frame, 0)
+        self.startup_ms['warm_up'] = (time.perf_counter() - start) * 1000
+
+    def close(self) -> None:
+        """Releases the loaded detectors; they are recreated if used again."""
+        if self._ball_detector is not None:
+            self._ball_detector.__exit__(None, None, None)
+            self._ball_detector = None
+        if self._pose_detector is not None:
+            self._pose_detector.__exit__(None, None, None)
+            self._pose_detector = None
+
+    @contextlib.contextmanager
+    def _job(self) -> Iterator[float]:
+        """Starts a new session and releases detectors afterwards unless warm."""
+        self.reset_session()
+        try:
+            yield time.perf_counter()
+        finally:
+            if not self.warm:
+                self.close()
+
+    def _record_first_frame(self, job_start: float) -> None:
+        if 'first_frame' in self.startup_ms:
+            return
+        self.startup_ms['first_frame'] = (time.perf_counter() - job_start) * 1000
+        print(f"Startup: {self.startup_line()}")
+
+    @contextlib.contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        """Reports the duration of a perception stage to the quality governor."""
+        if self.quality_governor is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.quality_governor.record_stage(stage, (time.perf_counter() - start) * 1000)
+
+    def _start_quality_governor(
+        self,
+        cap: cv2.VideoCapture,
+        job_start: float
+    ) -> Optional[QualityGovernor]:
+        """
+        Creates the quality governor of a process() job when quality_budget_s is set.
+        
+        Lower analysis resolution needs records in source coordinates, so
+        the governor only runs the frame-by-frame online path; it is not
+        started for offline_two_pass or batched inference, nor when the
+        video does not report its frame count.
+        """
+        if self.config.quality_budget_s is None:
+            return None
+        if self.config.offline_two_pass or self.config.inference_batch_size > 1:
+            print("[GOVERNOR] quality_budget_s ignored: needs the frame-by-frame online path")
+            return None
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_frames <= 0:
+            print("[GOVERNOR] quality_budget_s ignored: unknown frame count")
+            return None
+        print(
+            f"[GOVERNOR] budget={self.config.quality_budget_s:.1f}s "
+            f"for {total_frames} source frames"
+        )
+        return QualityGovernor(self.config, total_frames, job_start)
+
+    def _apply_quality_level(self, level: QualityLevel) -> None:
+        """
+        Switches perception to a quality level chosen by the governor.
+        
+        A new analysis scale invalidates every position kept in analysis
+        coordinates, so tracking restarts with a detection. A new tracker
+        backend takes effect at the next tracker initialization.
+        """
+        self.detect_every_n_frames = self.quality_governor.detect_every_n_frames(level)
+        self.pose_scheduler.every_n_frames = level.pose_every_n_frames
+        self.ball_tracker.backend = self.quality_governor.tracker_backend(level)
+        # The overlay is drawn in source coordinates
+        scale = level.analysis_scale
+        if self.video_writer is not None or self.config.show_window:
+            scale = 1.0
+        if scale != self.analysis_scale:
+            self.analysis_scale = scale
+            self.ball_tracker.reset()
+            self.recent_ball_centers.clear()
+            self.grace_frames_left = 0
+            self.last_good_ball_center = None
+            self.fallback_candidates = []
+
+    def _scale_for_analysis(self, frame: cv2.Mat) -> cv2.Mat:
+        """Resizes a frame to analysis_scale into a reused buffer."""
+        if self.analysis_scale == 1.0:
+            return frame
+        height, width = frame.shape[:2]
+        size = (
+            max(1, round(width * self.analysis_scale)),
+            max(1, round(height * self.analysis_scale))
+        )
+        if self._scaled_frame is None or self._scaled_frame.shape[1::-1] != size:
+            self._scaled_frame = np.empty((size[1], size[0], frame.shape[2]), dtype=frame.dtype)
+        return cv2.resize(frame, size, dst=self._scaled_frame, interpolation=cv2.INTER_AREA)
+
+    def _to_source(self, point: Optional[tuple[int, int]]) -> Optional[tuple[int, int]]:
+        """Maps a point from analysis to source frame coordinates."""
+        if point is None or self.analysis_scale == 1.0:
+            return point
+        return (
+            int(round(point[0] / self.analysis_scale)),
+            int(round(point[1] / self.analysis_scale))
+        )
+
+    def _landmarks_to_source(
+        self,
+        pose_data: Optional[dict[str, tuple[int, int]]]
+    ) -> Optional[dict[str, tuple[int, int]]]:
+        if pose_data is None or self.analysis_scale == 1.0:
+            return pose_data
+        return {name: self._to_source(point) for name, point in pose_data.items()}
+
+    def startup_line(self) -> str:
+        """Returns the cold start timings as a single log line."""
+        return " ".join(f"{name}={ms:.0f}ms" for name, ms in self.startup_ms.items())
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
 
     def _log_rejection(
         self,
@@ -81,7 +388,6 @@ class VideoProcessor:
     def _bbox_passes_checks(
         self,
         frame: cv2.Mat,
-        masked_frame: cv2.Mat,
         bbox: tuple[int, int, int, int]
     ) -> bool:
         area_ratio = bbox_area_ratio(bbox, frame.shape)
@@ -90,7 +396,7 @@ class VideoProcessor:
             area_ratio > self.config.max_ball_area_ratio
         ):
             return False
-        orange_ratio = bbox_orange_ratio(masked_frame, bbox)
+        orange_ratio = self.frame_buffers.orange_ratio(bbox)
         return orange_ratio >= self.config.min_orange_ratio
 
     def _passes_motion_gate(self, ball_center: tuple[int, int]) -> bool:
@@ -103,7 +409,160 @@ class VideoProcessor:
         v2x = ball_center[0] - prev[0]
         v2y = ball_center[1] - prev[1]
         accel = ((v2x - v1x) ** 2 + (v2y - v1y) ** 2) ** 0.5
-        return accel <= self.config.max_track_acceleration
+        return accel <= self.config.max_track_acceleration * self.analysis_scale
+
+    def _predict_ball_center(self) -> Optional[tuple[int, int]]:
+        if not self.recent_ball_centers:
+            return None
+        prev = self.recent_ball_centers[-1]
+        if len(self.recent_ball_centers) < 2:
+            return prev
+        prev_prev = self.recent_ball_centers[-2]
+        return (2 * prev[0] - prev_prev[0], 2 * prev[1] - prev_prev[1])
+
+    def _initialize_tracker(
+        self,
+        masked_frame: cv2.Mat,
+        bbox: tuple[int, int, int, int]
+    ) -> None:
+        with self._timed('track'):
+            self.ball_tracker.initialize(masked_frame, bbox)
+        self.perception_stats.tracker_inits += 1
+
+    def _update_tracker(self, masked_frame: cv2.Mat) -> Optional[tuple[int, int, int, int]]:
+        with self._timed('track'):
+            return self.ball_tracker.update(masked_frame)
+
+    def _select_detection(
+        self,
+        frame: cv2.Mat,
+        frame_index: int,
+        timestamp_ms: int
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Locates the ball for a detection frame.
+        
+        When blob_fast_path is enabled, a single unambiguous orange blob near
+        the predicted position is accepted without running the neural
+        detector. With motion_proposals, the detector first runs on crops
+        around moving orange regions only. Otherwise, or when those hold no
+        valid ball, the detector runs on the full frame and the best
+        candidate is picked; runners-up that also passed validation are kept
+        as fallbacks for the next candidate_fallback_max_age frames. A
+        detection without valid candidates leaves the previous fallbacks
+        (and their age) in place, so the tracker can still recover on them.
+        """
+        predicted_center = self._predict_ball_center()
+        if self.config.blob_fast_path:
+            bbox = self.blob_locator.locate(self.frame_buffers.mask, predicted_center)
+            if bbox and self._bbox_passes_checks(frame, bbox):
+                self.perception_stats.blob_fast_path_hits += 1
+                self.fallback_candidates = []
+                return bbox
+        
+        tracker_bbox = (
+            self.ball_tracker.last_bbox if self.ball_tracker.is_active() else None
+        )
+        ranked = []
+        if self.region_proposer is not None:
+            ranked = self._detect_in_proposals(frame, timestamp_ms, predicted_center, tracker_bbox)
+        if not ranked:
+            with self._timed('detect'):
+                candidates = self.ball_detector.detect_candidates(frame, timestamp_ms)
+            self.perception_stats.detector_calls += 1
+            self.perception_stats.detector_candidates += len(candidates)
+            self.perception_stats.detector_pixels += frame.shape[0] * frame.shape[1]
+            ranked = self.candidate_selector.rank(
+                candidates,
+                frame.shape,
+                self.frame_buffers.orange_ratio,
+                predicted_center=predicted_center,
+                tracker_bbox=tracker_bbox
+            )
+            if candidates and not ranked:
+                self._log_rejection(frame_index, timestamp_ms, "detect_bbox_checks")
+        if not ranked:
+            return None
+        self.fallback_candidates = [candidate.bbox for candidate in ranked[1:]]
+        self.fallback_age = 0
+        return ranked[0].bbox
+
+    def _detect_in_proposals(
+        self,
+        frame: cv2.Mat,
+        timestamp_ms: int,
+        predicted_center: Optional[tuple[int, int]],
+        tracker_bbox: Optional[tuple[int, int, int, int]]
+    ) -> list[BallCandidate]:
+        """
+        Searches for the ball inside motion region proposals only.
+        
+        With motion_proposal_accept_blobs, a single proposal blob that
+        passes the bbox checks is taken as is; otherwise the detector runs
+        on the proposal crops.
+        
+        Returns:
+            Ranked candidates, or an empty list when the proposals hold no
+            valid ball and the full frame has to be searched.
+        """
+        proposals = self.region_proposer.propose(self.frame_buffers.mask)
+        if not proposals:
+            return []
+        frame_pixels = frame.shape[0] * frame.shape[1]
+        if (
+            self.config.motion_proposal_accept_blobs and
+            len(proposals) == 1 and
+            self._bbox_passes_checks(frame, proposals[0].bbox)
+        ):
+            self.perception_stats.proposal_hits += 1
+            self.perception_stats.proposal_pixels_saved += frame_pixels
+            return [BallCandidate(proposals[0].bbox, 1.0)]
+        
+        crops = MotionRegionProposer.crops(proposals)
+        crop_pixels = sum(w * h for _, _, w, h in crops)
+        if crop_pixels > self.config.motion_proposal_max_area_ratio * frame_pixels:
+            return []
+        with self._timed('detect'):
+            candidates = self.ball_detector.detect_regions(frame, crops, timestamp_ms)
+        self.perception_stats.detector_calls += len(crops)
+        self.perception_stats.detector_candidates += len(candidates)
+        self.perception_stats.detector_pixels += crop_pixels
+        ranked = self.candidate_selector.rank(
+            candidates,
+            frame.shape,
+            self.frame_buffers.orange_ratio,
+            predicted_center=predicted_center,
+            tracker_bbox=tracker_bbox
+        )
+        if ranked:
+            self.perception_stats.proposal_hits += 1
+            self.perception_stats.proposal_pixels_saved += frame_pixels - crop_pixels
+        else:
+            self.perception_stats.proposal_fallbacks += 1
+        return ranked
+
+    def _recover_from_fallback(
+        self,
+        frame: cv2.Mat,
+        masked_frame: cv2.Mat
+    ) -> Optional[tuple[int, int, int, int]]:
+        """
+        Re-initializes tracking on a recent runner-up candidate.
+        
+        Used when the tracked box is lost: if the tracker had locked onto a
+        false positive, a runner-up from the last detection that still
+        passes the bbox checks is a cheaper recovery than a forced
+        re-detection burst.
+        """
+        if self.fallback_age > self.config.candidate_fallback_max_age:
+            self.fallback_candidates = []
+        while self.fallback_candidates:
+            bbox = self.fallback_candidates.pop(0)
+            if self._bbox_passes_checks(frame, bbox):
+                self._initialize_tracker(masked_frame, bbox)
+                self.perception_stats.fallback_recoveries += 1
+                return bbox
+        return None
 
     def _use_grace_center(self) -> Optional[tuple[int, int]]:
         if self.config.tracking_grace_frames <= 0:
@@ -117,12 +576,127 @@ class VideoProcessor:
         self.grace_frames_left -= 1
         return self.last_good_ball_center
     
+    def _detect_pose(
+        self,
+        frame: cv2.Mat,
+        timestamp_ms: int
+    ) -> tuple[Optional[dict[str, tuple[int, int]]], bool]:
+        """
+        Measures or, when pose gating skips the frame, infers the pose.
+        
+        Expects frame_buffers to be prepared for frame.
+        
+        Returns:
+            Tuple of (pose_data, pose_inferred).
+        """
+        if self._batched_poses:
+            self.perception_stats.pose_calls += 1
+            return self._batched_poses.popleft(), False
+        thumbnail = None
+        if self.pose_scheduler.enabled:
+            thumbnail = self.frame_buffers.thumbnail()
+        # Landmarks are kept in source coordinates, also at a reduced analysis_scale
+        if self.pose_scheduler.should_measure(
+            thumbnail, self.frame_buffers.thumbnail_scale() * self.analysis_scale
+        ):
+            with self._timed('pose'):
+                pose_data = self.pose_detector.detect(
+                    frame, timestamp_ms, frame_rgb=self.frame_buffers.rgb()
+                )
+            pose_data = self._landmarks_to_source(pose_data)
+            self.pose_scheduler.record_measurement(pose_data, thumbnail, timestamp_ms)
+            self.perception_stats.pose_calls += 1
+            return pose_data, False
+        self.perception_stats.pose_inferred += 1
+        return self.pose_scheduler.infer(timestamp_ms), True
+
+    @staticmethod
+    def _frame_record(
+        frame_index: int,
+        timestamp_ms: int,
+        ball_center: Optional[tuple[int, int]],
+        pose_data: Optional[dict[str, tuple[int, int]]]
+    ) -> dict:
+        return {
+            'frame_index': frame_index,
+            'timestamp_ms': timestamp_ms,
+            'ball_center': ball_center,
+            'left_wrist': pose_data.get('left_wrist') if pose_data else None,
+            'right_wrist': pose_data.get('right_wrist') if pose_data else None,
+            'left_elbow': pose_data.get('left_elbow') if pose_data else None,
+            'right_elbow': pose_data.get('right_elbow') if pose_data else None,
+            'left_shoulder': pose_data.get('left_shoulder') if pose_data else None,
+            'right_shoulder': pose_data.get('right_shoulder') if pose_data else None,
+            'left_knee': pose_data.get('left_knee') if pose_data else None,
+            'right_knee': pose_data.get('right_knee') if pose_data else None,
+            'hip_center': pose_data.get('hip_center') if pose_data else None
+        }
+
+    def _is_duplicate(self, frame: cv2.Mat, frame_index: int) -> bool:
+        if self.duplicate_detector is None:
+            return False
+        # Batched frames were checked by _read_frames() before inference
+        duplicate = self._batched_duplicates.pop(frame_index, None)
+        if duplicate is None:
+            duplicate = self.duplicate_detector.is_duplicate(frame)
+        return duplicate and bool(self.frame_data_list)
+
+    def _repeat_record(self, frame_index: int, timestamp_ms: int) -> dict:
+        """Appends a copy of the previous frame record for a duplicate frame."""
+        frame_data = dict(
+            self.frame_data_list[-1], frame_index=frame_index, timestamp_ms=timestamp_ms
+        )
+        if frame_data.get('pose_inferred'):
+            self.pose_scheduler.track_inferred(frame_data)
+        self.perception_stats.duplicate_frames += 1
+        self.frame_data_list.append(frame_data)
+        return frame_data
+
+    def _update_activity(self, frame_index: int, timestamp_ms: int) -> bool:
+        """
+        Feeds the prepared frame to the activity monitor.
+        
+        Entering an idle stretch drops the tracker, so the first active
+        frame afterwards runs a fresh detection.
+        
+        Returns:
+            True when the frame belongs to an idle stretch.
+        """
+        mask = self.frame_buffers.mask
+        changed = self.activity_monitor.update(
+            self.frame_buffers.thumbnail(), cv2.countNonZero(mask) / mask.size
+        )
+        if changed and self.activity_monitor.idle:
+            print(f"[IDLE] frame={frame_index} ts_ms={timestamp_ms} suspending full processing")
+            self.perception_stats.idle_periods += 1
+            self.ball_tracker.reset()
+            self.recent_ball_centers.clear()
+            self.grace_frames_left = 0
+            self.last_good_ball_center = None
+        elif changed:
+            print(f"[IDLE] frame={frame_index} ts_ms={timestamp_ms} activity resumed")
+        return self.activity_monitor.idle
+
+    def _idle_record(self, frame: cv2.Mat, frame_index: int, timestamp_ms: int) -> dict:
+        """Appends the record of a frame skipped in an idle stretch."""
+        # Batched pose results were computed for every non-duplicate frame
+        if self._batched_poses:
+            self._batched_poses.popleft()
+        frame_data = self._frame_record(frame_index, timestamp_ms, None, None)
+        frame_data['idle'] = True
+        self.perception_stats.idle_frames += 1
+        self.frame_data_list.append(frame_data)
+        if self.video_writer is not None:
+            self.video_writer.submit(frame.copy(), frame_index)
+        return frame_data
+
     def _process_frame(
         self, 
         frame: cv2.Mat, 
         frame_index: int, 
         fps: float, 
-        frames_since_detection: int
+        frames_since_detection: int,
+        timestamp_ms: Optional[int] = None
     ) -> tuple[Optional[tuple[int, int]], str, int]:
         """
         Processes a single video frame for ball detection and tracking.
@@ -132,34 +706,58 @@ class VideoProcessor:
             frame_index: Current frame number.
             fps: Frames per second of the video.
             frames_since_detection: Number of frames since last detection.
+            timestamp_ms: Frame timestamp; derived from frame_index and fps
+                when not given.
         
         Returns:
             Tuple of (ball_center, method_used, updated_frames_since_detection).
         """
-        original_frame = frame.copy()
-        masked_frame = apply_orange_mask(
-            frame, 
-            self.config.orange_mask_lower, 
-            self.config.orange_mask_upper
-        )
+        if timestamp_ms is None:
+            timestamp_ms = int(frame_index / fps * 1000)
+        if self._is_duplicate(frame, frame_index):
+            frame_data = self._repeat_record(frame_index, timestamp_ms)
+            if self.video_writer is not None and self._last_overlay is not None:
+                self.video_writer.submit(self._last_overlay, frame_index)
+            return frame_data['ball_center'], "duplicate", frames_since_detection
+        if (
+            self.activity_monitor is not None and
+            self.activity_monitor.idle and
+            not self.activity_monitor.probe_due()
+        ):
+            self._idle_record(frame, frame_index, timestamp_ms)
+            return None, "idle", frames_since_detection
+        
+        with self._timed('mask'):
+            masked_frame = self.frame_buffers.prepare(frame)
+        if self.activity_monitor is not None and self._update_activity(frame_index, timestamp_ms):
+            self._idle_record(frame, frame_index, timestamp_ms)
+            return None, "idle", frames_since_detection
+        if self.region_proposer is not None:
+            with self._timed('mask'):
+                self.region_proposer.update(frame)
+        # Annotations go to a separate overlay, and only when something shows
+        # or stores it; detection always sees the clean frame.
+        overlay = None
+        if self.video_writer is not None:
+            overlay = self.frame_buffers.overlay(owned=True)
+        elif self.config.show_window:
+            overlay = self.frame_buffers.overlay(owned=False)
         
-        timestamp_ms = int(frame_index / fps * 1000)
+        self.perception_stats.frames += 1
+        self.fallback_age += 1
         ball_center = None
         method_used = None
         
         should_detect = (
             not self.ball_tracker.is_active() or
-            frames_since_detection >= self.config.detect_every_n_frames
+            frames_since_detection >= self.detect_every_n_frames
         )
         if self.force_detect_frames > 0:
             should_detect = True
             self.force_detect_frames -= 1
         
         if should_detect:
-            bbox = self.ball_detector.detect(original_frame, timestamp_ms)
-            if bbox and not self._bbox_passes_checks(original_frame, masked_frame, bbox):
-                self._log_rejection(frame_index, timestamp_ms, "detect_bbox_checks")
-                bbox = None
+            bbox = self._select_detection(frame, frame_index, timestamp_ms)
             
             if bbox:
                 if self.ball_tracker.is_active() and self.ball_tracker.last_bbox:
@@ -169,20 +767,22 @@ class VideoProcessor:
                             self.force_detect_frames, self.config.force_detect_frames
                         )
                         method_used = "detection_reinit"
+                        self.perception_stats.detection_reinits += 1
                 x, y, w, h = bbox
                 ball_center = (x + w // 2, y + h // 2)
                 
-                self.ball_tracker.initialize(masked_frame, bbox)
+                self._initialize_tracker(masked_frame, bbox)
                 frames_since_detection = 0
                 method_used = method_used or "detection"
                 
-                self.visualizer.draw_bounding_box(
-                    original_frame, bbox, (0, 255, 0), "DETECT"
-                )
+                if overlay is not None:
+                    self.visualizer.draw_bounding_box(
+                        overlay, bbox, (0, 255, 0), "DETECT"
+                    )
                 
             elif self.ball_tracker.is_active():
-                bbox = self.ball_tracker.update(masked_frame)
-                if bbox and not self._bbox_passes_checks(original_frame, masked_frame, bbox):
+                bbox = self._update_tracker(masked_frame)
+                if bbox and not self._bbox_passes_checks(frame, bbox):
                     self._log_rejection(frame_index, timestamp_ms, "tracking_fallback_bbox_checks")
                     bbox = None
                 
@@ -192,27 +792,40 @@ class VideoProcessor:
                     frames_since_detection += 1
                     method_used = "tracking_fallback"
                     
-                    self.visualizer.draw_bounding_box(
-                        original_frame, bbox, (0, 165, 255), "TRACK (FB)"
-                    )
+                    if overlay is not None:
+                        self.visualizer.draw_bounding_box(
+                            overlay, bbox, (0, 165, 255), "TRACK (FB)"
+                        )
                 else:
-                    self.force_detect_frames = max(
-                        self.force_detect_frames, self.config.force_detect_frames
-                    )
-                    grace_center = self._use_grace_center()
-                    if grace_center:
-                        ball_center = grace_center
+                    bbox = self._recover_from_fallback(frame, masked_frame)
+                    if bbox:
+                        x, y, w, h = bbox
+                        ball_center = (x + w // 2, y + h // 2)
                         frames_since_detection += 1
-                        method_used = "tracking_grace"
+                        method_used = "fallback_candidate"
+                        
+                        if overlay is not None:
+                            self.visualizer.draw_bounding_box(
+                                overlay, bbox, (255, 0, 255), "FALLBACK"
+                            )
                     else:
-                        self.ball_tracker.reset()
-                        method_used = "lost"
+                        self.force_detect_frames = max(
+                            self.force_detect_frames, self.config.force_detect_frames
+                        )
+                        grace_center = self._use_grace_center()
+                        if grace_center:
+                            ball_center = grace_center
+                            frames_since_detection += 1
+                            method_used = "tracking_grace"
+                        else:
+                            self.ball_tracker.reset()
+                            method_used = "lost"
             else:
                 method_used = "lost"
         
         else:
-            bbox = self.ball_tracker.update(masked_frame)
-            if bbox and not self._bbox_passes_checks(original_frame, masked_frame, bbox):
+            bbox = self._update_tracker(masked_frame)
+            if bbox and not self._bbox_passes_checks(frame, bbox):
                 self._log_rejection(frame_index, timestamp_ms, "tracking_bbox_checks")
                 bbox = None
             
@@ -222,24 +835,37 @@ class VideoProcessor:
                 frames_since_detection += 1
                 method_used = "tracking"
                 
-                self.visualizer.draw_bounding_box(
-                    original_frame, bbox, (255, 0, 0), "TRACK"
-                )
+                if overlay is not None:
+                    self.visualizer.draw_bounding_box(
+                        overlay, bbox, (255, 0, 0), "TRACK"
+                    )
             else:
-                self.force_detect_frames = max(
-                    self.force_detect_frames, self.config.force_detect_frames
-                )
-                grace_center = self._use_grace_center()
-                if grace_center:
-                    ball_center = grace_center
+                bbox = self._recover_from_fallback(frame, masked_frame)
+                if bbox:
+                    x, y, w, h = bbox
+                    ball_center = (x + w // 2, y + h // 2)
                     frames_since_detection += 1
-                    method_used = "tracking_grace"
+                    method_used = "fallback_candidate"
+                    
+                    if overlay is not None:
+                        self.visualizer.draw_bounding_box(
+                            overlay, bbox, (255, 0, 255), "FALLBACK"
+                        )
                 else:
-                    self.ball_tracker.reset()
-                    frames_since_detection = self.config.detect_every_n_frames
-                    method_used = "lost"
+                    self.force_detect_frames = max(
+                        self.force_detect_frames, self.config.force_detect_frames
+                    )
+                    grace_center = self._use_grace_center()
+                    if grace_center:
+                        ball_center = grace_center
+                        frames_since_detection += 1
+                        method_used = "tracking_grace"
+                    else:
+                        self.ball_tracker.reset()
+                        frames_since_detection = self.detect_every_n_frames
+                        method_used = "lost"
 
-        if ball_center and method_used in {"tracking", "tracking_fallback"}:
+        if ball_center and method_used in {"tracking", "tracking_fallback", "fallback_candidate"}:
             if not self._passes_motion_gate(ball_center):
                 self._log_rejection(frame_index, timestamp_ms, "tracking_motion_gate")
                 self.force_detect_frames = max(
@@ -252,11 +878,12 @@ class VideoProcessor:
                 else:
                     ball_center = None
                     self.ball_tracker.reset()
-                    frames_since_detection = self.config.detect_every_n_frames
+                    frames_since_detection = self.detect_every_n_frames
                     method_used = "rejected_motion"
         
         if ball_center:
-            self.visualizer.draw_ball_center(original_frame, ball_center)
+            if overlay is not None:
+                self.visualizer.draw_ball_center(overlay, ball_center)
             if method_used != "tracking_grace":
                 self.last_good_ball_center = ball_center
                 self.grace_frames_left = 0
@@ -264,142 +891,934 @@ class VideoProcessor:
                 if len(self.recent_ball_centers) > 3:
                     self.recent_ball_centers.pop(0)
         else:
-            self.visualizer.draw_ball_lost(original_frame)
+            self.perception_stats.ball_lost_frames += 1
+            if overlay is not None:
+                self.visualizer.draw_ball_lost(overlay)
         
-        pose_data = self.pose_detector.detect(original_frame, timestamp_ms)
-        if pose_data:
-            self.visualizer.draw_pose_landmarks(original_frame, pose_data)
+        pose_data, pose_inferred = self._detect_pose(frame, timestamp_ms)
+        if pose_data and overlay is not None:
+            self.visualizer.draw_pose_landmarks(overlay, pose_data)
         
-        frame_data = {
-            'frame_index': frame_index,
-            'timestamp_ms': timestamp_ms,
-            'ball_center': ball_center,
-            'left_wrist': pose_data.get('left_wrist') if pose_data else None,
-            'right_wrist': pose_data.get('right_wrist') if pose_data else None,
-            'left_elbow': pose_data.get('left_elbow') if pose_data else None,
-            'right_elbow': pose_data.get('right_elbow') if pose_data else None,
-            'left_shoulder': pose_data.get('left_shoulder') if pose_data else None,
-            'right_shoulder': pose_data.get('right_shoulder') if pose_data else None,
-            'left_knee': pose_data.get('left_knee') if pose_data else None,
-            'right_knee': pose_data.get('right_knee') if pose_data else None,
-            'hip_center': pose_data.get('hip_center') if pose_data else None
-        }
+        frame_data = self._frame_record(
+            frame_index, timestamp_ms, self._to_source(ball_center), pose_data
+        )
+        frame_data['pose_inferred'] = pose_inferred
+        if pose_inferred:
+            self.pose_scheduler.track_inferred(frame_data)
         self.frame_data_list.append(frame_data)
         
-        self.visualizer.draw_info(
-            original_frame, frame_index, method_used, frames_since_detection
-        )
+        if overlay is not None:
+            self.visualizer.draw_info(
+                overlay, frame_index, method_used, frames_since_detection
+            )
         
-        cv2.imshow('Hybrid Ball Tracking', original_frame)
+        if self.config.show_window:
+            cv2.imshow('Hybrid Ball Tracking', overlay)
+        if self.video_writer is not None:
+            self.video_writer.submit(overlay, frame_index)
+            self._last_overlay = overlay
         
         return ball_center, method_used, frames_since_detection
     
-    def process(self) -> None:
+    def _process_online(
+        self,
+        frames: Iterator[tuple[int, int, cv2.Mat]],
+        fps: float,
+        job_start: float,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[dict]:
+        """
+        Runs the frame-by-frame path of process(), yielding each frame's record.
+        
+        The quality governor, when set, re-plans after every frame.
+        """
+        frames_since_detection = 0
+        for frame_index, timestamp_ms, frame in frames:
+            _, method_used, frames_since_detection = self._process_frame(
+                self._scale_for_analysis(frame), frame_index, fps,
+                frames_since_detection, timestamp_ms=timestamp_ms
+            )
+            self._record_first_frame(job_start)
+            if self.quality_governor is not None:
+                self.quality_governor.frame_done(
+                    analyzed=method_used not in {"duplicate", "idle"}
+                )
+                level = self.quality_governor.update(frame_index)
+                if level is not None:
+                    self._apply_quality_level(level)
+            yield self.frame_data_list[-1]
+            
+            if self.config.show_window and cv2.waitKey(5) & 0xFF == 27:
+                break
+            if should_stop is not None and should_stop():
+                print("Processing stopped early")
+                break
+
+    def _release_settled(self, held: deque[dict]) -> Iterator[dict]:
+        """
+        Pops records off the front of held once their landmarks are final.
+        
+        Records with inferred landmarks stay until the pose scheduler has
+        rewritten them from the next measurement. Only the last record is
+        kept in frame_data_list, for duplicate frames to copy.
+        """
+        del self.frame_data_list[:-1]
+        while held and not self.pose_scheduler.is_pending(held[0]):
+            yield held.popleft()
+
+    def _settled_records(self, records: Iterator[dict]) -> Iterator[dict]:
+        """Passes frame records on in order as their landmarks become final."""
+        held: deque[dict] = deque()
+        for frame_data in records:
+            held.append(frame_data)
+            yield from self._release_settled(held)
+        yield from held
+
+    def _open_video_writer(self, fps: float) -> Optional[AnnotatedVideoWriter]:
+        if self.config.output_video_path is None:
+            return None
+        return AnnotatedVideoWriter(
+            self.config.output_video_path,
+            fps,
+            codec=self.config.output_video_codec,
+            frame_size=self.config.output_video_size,
+            frame_stride=self.config.output_video_stride,
+            queue_size=self.config.output_video_queue_size,
+            backend=self.config.output_video_backend,
+            block_when_full=self.config.output_video_block_when_full
+        )
+
+    def _close_video_writer(self) -> None:
+        if self.video_writer is None:
+            return
+        self.video_writer.close()
+        print(
+            f"Annotated video written to {self.video_writer.output_path} "
+            f"({self.video_writer.frames_written} frames, "
+            f"{self.video_writer.frames_dropped} dropped)"
+        )
+        self.video_writer = None
+
+    def _print_summary(self, summary: SessionSummary) -> None:
+        print("Session Summary:")
+        print(f"  Total cycles: {len(summary.cycles)}")
+        print(f"  Avg duration: {summary.duration_mean:.1f}ms")
+        print(f"  Duration variance: {summary.duration_variance:.2f}")
+        print(f"  Max height mean: {summary.max_height_mean:.3f}")
+        print(f"  Controlled time ratio mean: {summary.controlled_time_ratio_mean:.3f}")
+        print(f"  Control deviation mean: {summary.control_deviation_mean:.4f}")
+        print(f"  Crossovers: {summary.crossovers_count}")
+        print(
+            f"  Hand ratios (L/R): {summary.left_hand_ratio:.2f} / {summary.right_hand_ratio:.2f}"
+        )
+
+    def process(
+        self,
+        video_path: Optional[str] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> SessionSummary:
         """
         Main method to process video with hybrid ball detection and tracking.
         
         Uses MediaPipe object detection and OpenCV tracking to locate and follow
         a basketball throughout the video. Applies orange color masking to improve
         detection accuracy. Displays the processed video with bounding boxes and
-        tracking information overlayed.
+        tracking information overlayed, and optionally writes it to
+        output_video_path.
+        
+        Detectors are released afterwards unless the processor is warm, in
+        which case the next call reuses them.
+        
+        With stream_analysis, the frame records feed
+        SessionAnalyzer.analyze_stream() as they are produced instead of
+        being collected for a final analyze() call.
+        
+        Args:
+            video_path: Video to process; defaults to reference_video_path.
+            should_stop: Polled once per frame; processing stops early (as
+                with ESC) when it returns True.
+        
+        Returns:
+            SessionSummary computed from the collected frame data.
         """
-        with self.ball_detector, self.pose_detector:
-            cap = cv2.VideoCapture(self.config.reference_video_path)
+        with self._job() as job_start:
+            cap = cv2.VideoCapture(video_path or self.config.reference_video_path)
             fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_index = 0
-            frames_since_detection = 0
+            sampler = self._frame_sampler()
+            if not self.config.offline_two_pass:
+                self.video_writer = self._open_video_writer(self._output_fps(fps))
+            elif self.config.output_video_path is not None:
+                print("output_video_path ignored: offline_two_pass draws no annotations")
             
             print(f"Starting video processing...")
             print(f"Video FPS: {fps}")
+            self._print_sampling(sampler)
             print(f"Will detect every {self.config.detect_every_n_frames} frames")
             print("-" * 50)
             
-            while cap.isOpened():
-                success, frame = cap.read()
+            if self.config.decode_processes > 0:
+                frames = self._read_shared_frames(
+                    video_path or self.config.reference_video_path, cap, fps, sampler
+                )
+            else:
+                frames = self._read_frames(
+                    SampledCapture(cap, sampler, fps, self.config.decoder_timestamps)
+                )
+            try:
+                self.quality_governor = self._start_quality_governor(cap, job_start)
+                self.session_analyzer.set_time_thresholds(fps if sampler.active else None)
+                summary = None
+                if self.config.offline_two_pass:
+                    if self.config.stream_analysis:
+                        print("stream_analysis ignored: offline_two_pass settles records at the end")
+                    self._process_offline(frames, job_start, should_stop)
+                elif self.config.stream_analysis:
+                    summary = self.session_analyzer.analyze_stream(
+                        self._settled_records(
+                            self._process_online(frames, fps, job_start, should_stop)
+                        ),
+                        fps
+                    )
+                else:
+                    for _ in self._process_online(frames, fps, job_start, should_stop):
+                        pass
+            finally:
+                frames.close()
+                cap.release()
+                if self.config.show_window:
+                    cv2.destroyAllWindows()
+                self._close_video_writer()
+            
+            print("-" * 50)
+            total_frames = summary.total_frames if summary is not None else len(self.frame_data_list)
+            print(f"Processing complete! Collected data from {total_frames} frames.")
+            if self.duplicate_detector is not None:
+                print(
+                    f"Skipped {self.perception_stats.duplicate_frames} duplicate frames "
+                    f"(records copied from the previous frame)"
+                )
+            if self.activity_monitor is not None:
+                print(
+                    f"Idle: {self.perception_stats.idle_periods} stretches, "
+                    f"{self.perception_stats.idle_frames} frames skipped"
+                )
+            if self.region_proposer is not None:
+                stats = self.perception_stats
+                searched = stats.detector_pixels + stats.proposal_pixels_saved
+                print(
+                    f"Region proposals: {stats.proposal_hits} hits, "
+                    f"{stats.proposal_fallbacks} full-frame fallbacks, "
+                    f"{stats.proposal_pixels_saved / max(1, searched):.0%} of detector area saved"
+                )
+            print(f"Perception: {self.perception_stats.summary_line()}")
+            
+            if summary is None:
+                summary = self.session_analyzer.analyze(self.frame_data_list, fps)
+            if self.quality_governor is not None:
+                summary.quality_decisions = self.quality_governor.decisions
+                print(
+                    f"[GOVERNOR] finished in {time.perf_counter() - job_start:.1f}s "
+                    f"of {self.config.quality_budget_s:.1f}s, "
+                    f"{len(summary.quality_decisions) - 1} level changes"
+                )
+
+            print("-" * 50)
+            print(
+                f"Final normalized dataset: {summary.valid_frames} valid frames"
+            )
+            print(f"Detected {len(summary.cycles)} complete dribble cycles")
+            print("-" * 50)
+            self._print_summary(summary)
+            print("-" * 50)
+            return summary
+
+    def _detect_anchor(
+        self,
+        frame: cv2.Mat,
+        frame_index: int,
+        timestamp_ms: int
+    ) -> Optional[tuple[int, int, int, int]]:
+        candidates = self._batched_anchors.pop(frame_index, None)
+        if candidates is None:
+            candidates = self.ball_detector.detect_candidates(frame, timestamp_ms)
+        self.perception_stats.detector_calls += 1
+        self.perception_stats.detector_candidates += len(candidates)
+        self.perception_stats.detector_pixels += frame.shape[0] * frame.shape[1]
+        ranked = self.candidate_selector.rank(
+            candidates,
+            frame.shape,
+            self.frame_buffers.orange_ratio,
+            predicted_center=self.last_good_ball_center
+        )
+        if not ranked:
+            return None
+        self.last_good_ball_center = bbox_center(ranked[0].bbox)
+        return ranked[0].bbox
+
+    def _frame_sampler(self) -> FrameSampler:
+        """Returns a FrameSampler for the analysis_stride/analysis_target_fps settings."""
+        return FrameSampler(self.config.analysis_stride, self.config.analysis_target_fps)
+
+    def _output_fps(self, fps: float) -> float:
+        """Frame rate of the annotated video, which only holds analyzed frames."""
+        rate = fps / max(1, self.config.analysis_stride)
+        if self.config.analysis_target_fps is not None:
+            rate = min(rate, self.config.analysis_target_fps)
+        return rate
+
+    @staticmethod
+    def _print_sampling(sampler: FrameSampler) -> None:
+        if not sampler.active:
+            return
+        target = f"{sampler.target_fps} fps" if sampler.target_fps is not None else "source rate"
+        print(f"Analyzing every {sampler.stride} frames at up to {target}")
+
+    def _read_frames(self, capture: SampledCapture) -> Iterator[tuple[int, int, cv2.Mat]]:
+        """
+        Yields (frame_index, timestamp_ms, frame) for the sampled frames of a
+        recorded video, in order.
+        
+        With inference_batch_size > 1 (and pose gating off), frames are
+        decoded in groups into a FrameBatch, converted to RGB in one call,
+        and the pose landmarker, plus the offline anchor detections, runs
+        over the group before its frames are yielded; _detect_pose() and
+        _detect_anchor() then take the precomputed results. Duplicate frames
+        are found before the batch inference and left out of it. Otherwise
+        each frame is decoded into the previous frame's buffer.
+        """
+        batch_size = self.config.inference_batch_size
+        if batch_size <= 1 or self.pose_scheduler.enabled:
+            frame = None
+            while True:
+                # Decode into the previous frame's buffer instead of a new array
+                success, frame = capture.read(frame)
                 if not success:
                     print("End of video reached")
-                    break
-                
-                _, _, frames_since_detection = self._process_frame(
-                    frame, frame_index, fps, frames_since_detection
+                    return
+                yield capture.frame_index, capture.timestamp_ms, frame
+        
+        batch = FrameBatch(batch_size)
+        stride = max(1, self.config.offline_detect_stride)
+        # Anchors follow the position among analyzed frames, as in _process_offline()
+        position = 0
+        while batch.read(capture):
+            timestamps_ms = batch.timestamps_ms
+            analyzed = list(range(batch.count))
+            if self.duplicate_detector is not None:
+                for slot in range(batch.count):
+                    self._batched_duplicates[batch.frame_indices[slot]] = (
+                        self.duplicate_detector.is_duplicate(batch.bgr[slot])
+                    )
+                analyzed = [
+                    slot for slot in analyzed
+                    if not self._batched_duplicates[batch.frame_indices[slot]]
+                ]
+            frames_rgb = batch.convert_rgb()
+            self._batched_poses.extend(
+                self.pose_detector.detect_batch(
+                    [frames_rgb[slot] for slot in analyzed],
+                    [timestamps_ms[slot] for slot in analyzed]
                 )
-                
-                frame_index += 1
-                
-                if cv2.waitKey(5) & 0xFF == 27:
+            )
+            if self.config.offline_two_pass:
+                anchors = [
+                    slot for offset, slot in enumerate(analyzed)
+                    if (position + offset) % stride == 0
+                ]
+                results = self.ball_detector.detect_candidates_batch(
+                    [batch.bgr[slot] for slot in anchors],
+                    [timestamps_ms[slot] for slot in anchors]
+                )
+                for slot, candidates in zip(anchors, results):
+                    self._batched_anchors[batch.frame_indices[slot]] = candidates
+            for slot in range(batch.count):
+                yield batch.frame_indices[slot], timestamps_ms[slot], batch.bgr[slot]
+            position += len(analyzed)
+        print("End of video reached")
+
+    def _read_shared_frames(
+        self,
+        video_path: str,
+        cap: cv2.VideoCapture,
+        fps: float,
+        sampler: FrameSampler
+    ) -> Iterator[tuple[int, int, cv2.Mat]]:
+        """
+        Yields (frame_index, timestamp_ms, frame) for the sampled frames of a
+        recorded video decoded by decoder processes.
+        
+        decode_processes decoders write into a SharedFrameRing and frames
+        are yielded in order as views of their slots, each slot being
+        released when the next frame is requested. Frames the sampler skips
+        are released unread. Decoders are stopped and the ring freed when
+        the generator is closed.
+        
+        Raises:
+            RuntimeError: If a decoder process fails.
+        """
+        frame_shape = (
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            3
+        )
+        ring = SharedFrameRing.create(self.config.decode_ring_slots, frame_shape)
+        context = multiprocessing.get_context('spawn')
+        decoders = [
+            context.Process(
+                target=decode_to_ring,
+                args=(
+                    video_path, ring, index,
+                    self.config.decode_processes, self.config.decode_chunk_frames
+                ),
+                daemon=True
+            )
+            for index in range(self.config.decode_processes)
+        ]
+        for decoder in decoders:
+            decoder.start()
+        try:
+            seq = 0
+            while True:
+                item = ring.read(seq, timeout=1.0)
+                if item is None:
+                    if any(decoder.is_alive() for decoder in decoders) and not ring.ended(seq):
+                        continue
+                    if any(decoder.exitcode for decoder in decoders):
+                        raise RuntimeError("A decoder process failed before the end of the video")
+                    print("End of video reached")
+                    return
+                frame, timestamp_ms = item
+                if not self.config.decoder_timestamps:
+                    timestamp_ms = int(seq / fps * 1000)
+                if sampler.keep(seq, timestamp_ms):
+                    yield seq, timestamp_ms, frame
+                ring.release(seq)
+                seq += 1
+        finally:
+            ring.stop()
+            for decoder in decoders:
+                decoder.join(timeout=5.0)
+                if decoder.is_alive():
+                    decoder.terminate()
+            ring.close()
+
+    def _process_offline(
+        self,
+        frames: Iterator[tuple[int, int, cv2.Mat]],
+        job_start: float,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """
+        Two-pass ball localization for recorded videos.
+        
+        The detector runs in IMAGE mode on every offline_detect_stride-th
+        frame only. The frames between two such anchors are tracked forward
+        as they are decoded and, when the forward track does not connect to
+        the next anchor, backward from it; BidirectionalGapFiller reconciles
+        both. Only the frames of one segment are buffered. Pose runs per
+        frame as in process(); annotations are not drawn.
+        """
+        stride = max(1, self.config.offline_detect_stride)
+        filler = BidirectionalGapFiller(self.config)
+        pending: list[dict] = []
+        duplicates: list[tuple[dict, dict]] = []
+        position = 0
+        print(f"Offline two-pass: detecting every {stride} frames")
+        
+        def resolve(centers: list[Optional[tuple[int, int]]]) -> None:
+            for frame_data, ball_center in zip(pending, centers):
+                frame_data['ball_center'] = ball_center
+                if ball_center is None:
+                    self.perception_stats.ball_lost_frames += 1
+            pending.clear()
+        
+        for frame_index, timestamp_ms, frame in frames:
+            if self._is_duplicate(frame, frame_index):
+                # The source record may still be waiting for its segment
+                source = self.frame_data_list[-1]
+                duplicates.append((self._repeat_record(frame_index, timestamp_ms), source))
+                if should_stop is not None and should_stop():
+                    print("Processing stopped early")
                     break
+                continue
             
-            cap.release()
-            cv2.destroyAllWindows()
+            masked_frame = self.frame_buffers.prepare(frame)
+            self.perception_stats.frames += 1
             
-            print("-" * 50)
-            print(f"Processing complete! Collected data from {len(self.frame_data_list)} frames.")
+            pose_data, pose_inferred = self._detect_pose(frame, timestamp_ms)
+            frame_data = self._frame_record(frame_index, timestamp_ms, None, pose_data)
+            frame_data['pose_inferred'] = pose_inferred
+            if pose_inferred:
+                self.pose_scheduler.track_inferred(frame_data)
+            self.frame_data_list.append(frame_data)
             
-            self.frame_data_list = self.data_cleaner.clean(self.frame_data_list)
+            if position % stride == 0:
+                bbox = self._detect_anchor(frame, frame_index, timestamp_ms)
+                resolve(filler.close_segment(masked_frame, bbox))
+                if bbox is None:
+                    self.perception_stats.ball_lost_frames += 1
+                else:
+                    frame_data['ball_center'] = bbox_center(bbox)
+            else:
+                filler.push(masked_frame)
+                pending.append(frame_data)
+            self._record_first_frame(job_start)
+            position += 1
             
-            normalized_data_list = self.normalizer.normalize(self.frame_data_list)
-            valid_frames = [frame for frame in normalized_data_list if frame is not None]
+            if should_stop is not None and should_stop():
+                print("Processing stopped early")
+                break
+        
+        resolve(filler.flush())
+        for frame_data, source in duplicates:
+            frame_data['ball_center'] = source['ball_center']
+        self.perception_stats.offline_backward_passes += filler.backward_passes
+        self.perception_stats.offline_disagreements += filler.disagreements
 
-            labeled_frames, shoulder_width_session = self.contact_labeler.label_frames(
-                valid_frames
+    def _process_players_frame(
+        self,
+        frame: cv2.Mat,
+        frame_index: int,
+        timestamp_ms: int,
+        frames_since_detection: int
+    ) -> int:
+        """
+        Processes one frame in multi-player mode.
+        
+        Detection runs every detect_every_n_frames frames, or whenever a
+        ball is not tracked; all poses are measured every frame. Each
+        tracked player gets a frame record with their own landmarks and the
+        ball assigned to them.
+        
+        Returns:
+            Updated frames_since_detection.
+        """
+        masked_frame = self.frame_buffers.prepare(frame)
+        overlay = None
+        if self.video_writer is not None:
+            overlay = self.frame_buffers.overlay(owned=True)
+        elif self.config.show_window:
+            overlay = self.frame_buffers.overlay(owned=False)
+        self.perception_stats.frames += 1
+        
+        detections = None
+        if (
+            frames_since_detection >= self.detect_every_n_frames or
+            self.multi_ball_tracker.needs_detection()
+        ):
+            candidates = self.ball_detector.detect_candidates(frame, timestamp_ms)
+            self.perception_stats.detector_calls += 1
+            self.perception_stats.detector_candidates += len(candidates)
+            self.perception_stats.detector_pixels += frame.shape[0] * frame.shape[1]
+            ranked = self.candidate_selector.rank(
+                candidates, frame.shape, self.frame_buffers.orange_ratio
             )
-            d_thr = self.config.contact_threshold_k * shoulder_width_session
-            self.cycle_metrics = CycleMetrics(
-                d_thr=d_thr,
-                delta=self.config.dominant_hand_delta,
-                min_window_frames=self.config.min_contact_window_frames
+            detections = [candidate.bbox for candidate in ranked]
+            frames_since_detection = 0
+        else:
+            frames_since_detection += 1
+        balls = self.multi_ball_tracker.update(
+            masked_frame,
+            detections,
+            lambda bbox: self._bbox_passes_checks(frame, bbox)
+        )
+        
+        poses = self.pose_detector.detect_all(
+            frame, timestamp_ms, frame_rgb=self.frame_buffers.rgb()
+        )
+        self.perception_stats.pose_calls += 1
+        players = self.player_tracker.update(poses)
+        ball_centers = self.player_tracker.assign_balls(balls)
+        
+        for player in players:
+            self.player_frame_data.setdefault(player.player_id, []).append(
+                self._frame_record(
+                    frame_index,
+                    timestamp_ms,
+                    ball_centers.get(player.player_id),
+                    player.pose
+                )
             )
-
-            dribble_cycles = self.cycle_detector.detect_cycles(valid_frames, fps)
-
-            labeled_by_frame = {frame.frame_index: frame for frame in labeled_frames}
-            cycles = []
-            for cycle_id, cycle_frames in enumerate(dribble_cycles):
-                labeled_cycle_frames = [
-                    labeled_by_frame[frame["frame_index"]]
-                    for frame in cycle_frames
-                    if frame["frame_index"] in labeled_by_frame
-                ]
-                if labeled_cycle_frames:
-                    cycles.append(
-                        self.cycle_metrics.compute_cycle_metrics(
-                            labeled_cycle_frames, cycle_id
-                        )
-                    )
-
-            summary = self.session_aggregator.compute_session_summary(
-                cycles=cycles,
-                total_frames=len(self.frame_data_list),
-                valid_frames=len(valid_frames),
-                shoulder_width_session=shoulder_width_session,
-                d_thr=d_thr
+        
+        if overlay is not None:
+            for ball in balls:
+                owner = f"P{ball.owner}" if ball.owner is not None else "?"
+                self.visualizer.draw_bounding_box(
+                    overlay, ball.bbox, (0, 255, 0), f"BALL {owner}"
+                )
+            for player in players:
+                if player.pose is not None:
+                    self.visualizer.draw_pose_landmarks(overlay, player.pose)
+            self.visualizer.draw_info(
+                overlay, frame_index, f"{len(players)} players", frames_since_detection
             )
+        if self.config.show_window:
+            cv2.imshow('Hybrid Ball Tracking', overlay)
+        if self.video_writer is not None:
+            self.video_writer.submit(overlay, frame_index)
+        
+        return frames_since_detection
 
+    def process_players(
+        self,
+        video_path: Optional[str] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> dict[int, SessionSummary]:
+        """
+        Processes a video with several players in one pass.
+        
+        Every frame is decoded and run through the detectors once; up to
+        Config.num_poses players and player_max_balls balls are tracked, and
+        each ball is assigned to the player whose wrists stay nearest to it.
+        
+        Args:
+            video_path: Video to process; defaults to reference_video_path.
+            should_stop: Polled once per frame; processing stops early when
+                it returns True.
+        
+        Returns:
+            SessionSummary per player id, for players seen in at least
+            player_min_frames frames.
+        """
+        with self._job() as job_start:
+            cap = cv2.VideoCapture(video_path or self.config.reference_video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frames_analyzed = 0
+            frames_since_detection = 0
+            sampler = self._frame_sampler()
+            capture = SampledCapture(cap, sampler, fps, self.config.decoder_timestamps)
+            self.video_writer = self._open_video_writer(self._output_fps(fps))
+            
+            print(f"Starting multi-player processing (up to {self.config.num_poses} players)...")
+            self._print_sampling(sampler)
             print("-" * 50)
-            print(
-                f"Final normalized dataset: {len(valid_frames)} valid frames"
-            )
-            print(f"Detected {len(dribble_cycles)} complete dribble cycles")
+            
+            try:
+                frame = None
+                while cap.isOpened():
+                    success, frame = capture.read(frame)
+                    if not success:
+                        print("End of video reached")
+                        break
+                    
+                    frames_since_detection = self._process_players_frame(
+                        frame, capture.frame_index, capture.timestamp_ms, frames_since_detection
+                    )
+                    self._record_first_frame(job_start)
+                    frames_analyzed += 1
+                    
+                    if self.config.show_window and cv2.waitKey(5) & 0xFF == 27:
+                        break
+                    if should_stop is not None and should_stop():
+                        print("Processing stopped early")
+                        break
+            finally:
+                cap.release()
+                if self.config.show_window:
+                    cv2.destroyAllWindows()
+                self._close_video_writer()
+            
             print("-" * 50)
-            print("Session Summary:")
-            print(f"  Total cycles: {len(summary.cycles)}")
-            print(f"  Avg duration: {summary.duration_mean:.1f}ms")
-            print(f"  Duration variance: {summary.duration_variance:.2f}")
-            print(f"  Max height mean: {summary.max_height_mean:.3f}")
-            print(f"  Controlled time ratio mean: {summary.controlled_time_ratio_mean:.3f}")
-            print(f"  Control deviation mean: {summary.control_deviation_mean:.4f}")
-            print(f"  Crossovers: {summary.crossovers_count}")
             print(
-                f"  Hand ratios (L/R): {summary.left_hand_ratio:.2f} / {summary.right_hand_ratio:.2f}"
+                f"Processing complete! {frames_analyzed} frames, "
+                f"{len(self.player_frame_data)} players seen."
             )
+            print(f"Perception: {self.perception_stats.summary_line()}")
+            
+            self.session_analyzer.set_time_thresholds(fps if sampler.active else None)
+            summaries = {}
+            for player_id, frame_data_list in sorted(self.player_frame_data.items()):
+                if len(frame_data_list) < self.config.player_min_frames:
+                    continue
+                summaries[player_id] = self.session_analyzer.analyze(
+                    frame_data_list, fps, quiet=True
+                )
+                print("-" * 50)
+                print(f"Player {player_id} ({len(frame_data_list)} frames)")
+                self._print_summary(summaries[player_id])
+            print("-" * 50)
+            return summaries
+
+    def process_live(self) -> LiveStats:
+        """
+        Processes a camera or network stream with a bounded end-to-end latency.
+        
+        Frames are read by a background grabber that keeps only the newest
+        frame, so frames are dropped rather than queued when inference falls
+        behind. Frames already older than live_latency_budget_ms when the
+        pipeline takes them are skipped. Rolling cycle metrics are computed
+        every live_metrics_every_n_frames processed frames over the last
+        live_metrics_window_frames frames; older frame records are not kept,
+        so memory stays bounded however long the stream runs.
+        
+        Returns:
+            LiveStats with latency and dropped-frame counters.
+        """
+        budget_ms = self.config.live_latency_budget_ms
+        self.live_stats = LiveStats()
+        rolling = RollingCycleAnalyzer(
+            self.config, window_frames=self.config.live_metrics_window_frames
+        )
+        source = LiveFrameSource(
+            parse_live_source(self.config.live_source), stats=self.live_stats
+        )
+        
+        # Taken before the grabber starts, so no capture time precedes it
+        start_time = time.monotonic()
+        with self._job() as job_start, source:
+            fps = source.fps() or 30.0
+            self.video_writer = self._open_video_writer(fps)
+            frame_index = 0
+            frames_since_detection = 0
+            
+            print(f"Starting live processing of {self.config.live_source}...")
+            print(f"Latency budget: {budget_ms:.0f}ms")
             print("-" * 50)
+            
+            try:
+                while source.is_running():
+                    item = source.read()
+                    if item is None:
+                        continue
+                    frame, capture_time = item
+                    
+                    if (time.monotonic() - capture_time) * 1000 > budget_ms:
+                        self.live_stats.frames_dropped_late += 1
+                        continue
+                    
+                    timestamp_ms = int((capture_time - start_time) * 1000)
+                    _, _, frames_since_detection = self._process_frame(
+                        frame, frame_index, fps, frames_since_detection,
+                        timestamp_ms=timestamp_ms
+                    )
+                    self._record_first_frame(job_start)
+                    rolling.push(self.frame_data_list[-1])
+                    # The rolling window holds what the metrics need; the last
+                    # record stays for duplicate frames to copy
+                    del self.frame_data_list[:-1]
+                    self.live_stats.record_latency(
+                        (time.monotonic() - capture_time) * 1000, budget_ms
+                    )
+                    frame_index += 1
+                    
+                    if frame_index % self.config.live_metrics_every_n_frames == 0:
+                        new_cycles, window_summary = rolling.update(fps)
+                        for cycle in new_cycles:
+                            print(
+                                f"[CYCLE] id={cycle.cycle_id} duration_ms={cycle.duration_ms} "
+                                f"hand={cycle.cycle_hand} "
+                                f"controlled={cycle.controlled_time_ratio:.2f}"
+                            )
+                        if window_summary is not None:
+                            print(
+                                f"[LIVE] cycles_in_window={len(window_summary.cycles)} "
+                                f"duration_mean={window_summary.duration_mean:.1f}ms "
+                                f"{self.live_stats.summary_line()}"
+                            )
+                    
+                    if self.config.show_window and cv2.waitKey(1) & 0xFF == 27:
+                        break
+            finally:
+                if self.config.show_window:
+                    cv2.destroyAllWindows()
+                self._close_video_writer()
+        
+        print("-" * 50)
+        print(f"Live processing stopped. {self.live_stats.summary_line()}")
+        print(f"Perception: {self.perception_stats.summary_line()}")
+        print("-" * 50)
+        return self.live_stats
+
+    def _stream_step(
+        self,
+        capture: SampledCapture,
+        frame,
+        fps: float,
+        frames_since_detection: int
+    ) -> Optional[tuple]:
+        """Decodes and processes one sampled frame; runs on the executor."""
+        success, frame = capture.read(frame)
+        if not success:
+            return None
+        _, _, frames_since_detection = self._process_frame(
+            frame, capture.frame_index, fps, frames_since_detection,
+            timestamp_ms=capture.timestamp_ms
+        )
+        return frame, frames_since_detection, self.frame_data_list[-1]
+
+    @staticmethod
+    async def _offload(executor: Optional[Executor], fn: Callable, *args):
+        """
+        Runs a blocking call on the executor.
+
+        The executor thread cannot be interrupted, so when the awaiting task
+        is cancelled the call is still awaited before cancellation
+        propagates; detectors and the capture are never released under a
+        running call.
+        """
+        future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait({future})
+            raise
+
+    async def _produce_events(
+        self,
+        queue: asyncio.Queue,
+        video_path: Optional[str],
+        executor: Optional[Executor],
+        stop: threading.Event
+    ) -> None:
+        error: Optional[Exception] = None
+        try:
+            with self._job():
+                cap = await self._offload(
+                    executor, cv2.VideoCapture,
+                    video_path or self.config.reference_video_path
+                )
+                analysis = None
+                analysis_thread: Optional[ThreadPoolExecutor] = None
+                records: SimpleQueue = SimpleQueue()
+                held: deque[dict] = deque()
+                try:
+                    fps = cap.get(cv2.CAP_PROP_FPS)
+                    sampler = self._frame_sampler()
+                    capture = SampledCapture(cap, sampler, fps, self.config.decoder_timestamps)
+                    self.session_analyzer.set_time_thresholds(fps if sampler.active else None)
+                    self.video_writer = self._open_video_writer(self._output_fps(fps))
+                    rolling = RollingCycleAnalyzer(
+                        self.config, window_frames=self.config.live_metrics_window_frames
+                    )
+                    rolling.session_analyzer.set_time_thresholds(
+                        fps if sampler.active else None
+                    )
+                    if self.config.stream_analysis:
+                        # Runs for the whole job on its own thread, off the
+                        # shared executor; None in records ends it
+                        analysis_thread = ThreadPoolExecutor(max_workers=1)
+                        analysis = analysis_thread.submit(
+                            self.session_analyzer.analyze_stream,
+                            iter(records.get, None), fps
+                        )
+                    frame = None
+                    frames_analyzed = 0
+                    frame_index = -1
+                    frames_since_detection = 0
+                    while not stop.is_set():
+                        step = await self._offload(
+                            executor, self._stream_step,
+                            capture, frame, fps, frames_since_detection
+                        )
+                        if step is None:
+                            break
+                        frame, frames_since_detection, frame_data = step
+                        frame_index = frame_data['frame_index']
+                        rolling.push(frame_data)
+                        # The final analysis cleans the records in place; the
+                        # consumer keeps the values as they were when yielded
+                        await queue.put(PipelineEvent(FRAME, frame_index, dict(frame_data)))
+                        if analysis is not None:
+                            held.append(frame_data)
+                            for record in self._release_settled(held):
+                                records.put(record)
+                        frames_analyzed += 1
+
+                        if frames_analyzed % self.config.live_metrics_every_n_frames == 0:
+                            new_cycles, _ = await self._offload(executor, rolling.update, fps)
+                            for cycle in new_cycles:
+                                await queue.put(PipelineEvent(CYCLE, frame_index, cycle))
+                finally:
+                    if analysis_thread is not None:
+                        for record in held:
+                            records.put(record)
+                        records.put(None)
+                        analysis_thread.shutdown(wait=False)
+                    cap.release()
+                    if self.video_writer is not None:
+                        await self._offload(executor, self.video_writer.close)
+                        self.video_writer = None
+
+                if analysis is not None:
+                    summary = await asyncio.wrap_future(analysis)
+                else:
+                    summary = await self._offload(
+                        executor, self.session_analyzer.analyze, self.frame_data_list, fps, True
+                    )
+                await queue.put(PipelineEvent(SUMMARY, frame_index, summary))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error = exc
+        # Only reached when not cancelled: the consumer is still waiting
+        await queue.put(None)
+        if error is not None:
+            raise error
+
+    async def stream(
+        self,
+        video_path: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        max_buffered: int = 32
+    ) -> AsyncIterator[PipelineEvent]:
+        """
+        Processes a video as an async iterator of frame records and cycles.
+
+        Decoding and inference run on executor threads, one call at a time
+        per processor, so many processors can stream concurrently from one
+        event loop sharing a small thread pool. At most max_buffered events
+        wait for the consumer; beyond that processing pauses.
+
+        Finished cycles are emitted every live_metrics_every_n_frames frames
+        by a RollingCycleAnalyzer; the last event is the SessionSummary of
+        the whole video. With stream_analysis, that summary is computed by
+        SessionAnalyzer.analyze_stream() on a thread of its own while frames
+        are processed, and frame records are not kept. Cancelling the consuming task or closing the
+        iterator stops processing after the frame in flight; wrap the call
+        in contextlib.aclosing() so leaving the loop early closes it at once
+        instead of when the generator is garbage collected.
+
+        Args:
+            video_path: Video to process; defaults to reference_video_path.
+            executor: Executor for blocking calls; None uses the loop default.
+            max_buffered: Maximum number of events waiting for the consumer.
+
+        Yields:
+            PipelineEvent of kind 'frame', 'cycle' or 'summary'.
+
+        Raises:
+            ValueError: If show_window is enabled (windows need the main thread).
+        """
+        if self.config.show_window:
+            raise ValueError("stream() requires show_window=False")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+        stop = threading.Event()
+        producer = asyncio.create_task(
+            self._produce_events(queue, video_path, executor, stop)
+        )
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await producer
+        finally:
+            stop.set()
+            if not producer.done():
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
 
 
 def main() -> None:
     """Main entry point for video processing."""
     config = Config()
-    processor = VideoProcessor(config)
-    processor.process()
+    with VideoProcessor(config) as processor:
+        if config.live_source is not None:
+            processor.process_live()
+        else:
+            processor.process()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+"""Models package for the dribble cycle metrics data structures."""
+
+from .contact_event import ContactEvent
+from .cycle import Cycle
+from .labeled_frame import LabeledFrame
+from .session_summary import SessionSummary
+
+__all__ = [
+    'LabeledFrame',
+    'ContactEvent',
+    'Cycle',
+    'SessionSummary'
+]
@@ -0,0 +1,34 @@
+"""Contact event model: a continuous window of same-hand contact."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ContactEvent:
+    """A continuous window of same-hand contact."""
+
+    # Identity
+    hand: str                 # 'L' or 'R'
+
+    # Frame boundaries
+    start_frame_index: int    # First frame of contact window
+    end_frame_index: int      # Last frame of contact window (inclusive)
+
+    # Time boundaries (absolute)
+    t_start_ms: float         # Start timestamp in ms
+    t_end_ms: float           # End timestamp in ms
+
+    # Time boundaries (normalized to cycle, optional)
+    t_norm_start: Optional[float]  # 0.0 to 1.0, position in cycle
+    t_norm_end: Optional[float]    # 0.0 to 1.0, position in cycle
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration of contact window in milliseconds."""
+        return self.t_end_ms - self.t_start_ms
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames in this contact window."""
+        return self.end_frame_index - self.start_frame_index + 1
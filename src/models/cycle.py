@@ -0,0 +1,78 @@
+"""Cycle model: a complete dribble cycle with its metrics."""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from models.contact_event import ContactEvent
+from models.labeled_frame import LabeledFrame
+
+
+@dataclass(slots=True)
+class Cycle:
+    """
+    A complete dribble cycle with metrics.
+
+    The cycle references its frames by frame index range instead of holding
+    a copy of them; frames() recovers them from the session's labeled frames.
+    """
+
+    # Identity
+    cycle_id: int
+
+    # Frame range (for traceability)
+    start_frame_index: int    # First frame of the cycle
+    end_frame_index: int      # Last frame of the cycle (inclusive)
+    frame_count: int          # Valid frames in the range
+    contact_events: list[ContactEvent]
+
+    # Timing metrics (FR-019)
+    start_time_ms: float
+    end_time_ms: float
+    duration_ms: float
+
+    # Ball height metrics (FR-020)
+    max_height: float         # Minimum ball_y (highest position)
+    min_height: float         # Maximum ball_y (lowest position, bounce)
+    avg_height: float         # Mean ball_y across cycle
+    height_range: float       # min_height - max_height
+
+    # Contact timing metrics (FR-021)
+    contact_time_fraction_left: float   # [0, 1]
+    contact_time_fraction_right: float  # [0, 1]
+    controlled_time_ratio: float        # [0, 1]
+
+    # Hand fields (FR-022)
+    start_hand: Optional[str]     # 'L', 'R', or None (optional descriptor)
+    end_hand: Optional[str]       # 'L', 'R', or None (optional descriptor)
+    is_crossover: Optional[bool]  # True if start_hand != end_hand (deprecated; see cycle_hand)
+    dominant_hand: Optional[str]  # 'L', 'R', or None (ambiguous)
+
+    # Per-cycle main hand for bounce-to-bounce crossover detection
+    cycle_hand: Optional[str]     # 'L', 'R', or None; hand with most contact time this cycle
+
+    # Crossover timing (FR-023)
+    switch_time_norm: Optional[float]  # [0, 1] if crossover
+
+    # Control deviation metrics (FR-024)
+    control_deviation_overall: Optional[float]
+    control_deviation_in_control: Optional[float]
+
+    def frames(self, labeled_frames: Sequence[LabeledFrame]) -> Sequence[LabeledFrame]:
+        """
+        Returns the cycle's frames from a session's labeled frames.
+
+        Args:
+            labeled_frames: Labeled frames ordered by frame_index, e.g. the
+                output of ContactLabeler.label_frames().
+
+        Returns:
+            Slice of labeled_frames within the cycle's frame range.
+        """
+        start = bisect_left(
+            labeled_frames, self.start_frame_index, key=lambda f: f.frame_index
+        )
+        end = bisect_right(
+            labeled_frames, self.end_frame_index, key=lambda f: f.frame_index
+        )
+        return labeled_frames[start:end]
@@ -0,0 +1,35 @@
+"""Labeled frame model: a normalized frame with hand contact labeling."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class LabeledFrame:
+    """
+    A normalized frame with contact labeling.
+
+    One instance exists per valid frame, so the class is slotted to avoid
+    a per-instance __dict__.
+    """
+
+    # Identity
+    frame_index: int          # Original frame number in video
+    timestamp_ms: float       # Timestamp in milliseconds
+    cycle_id: Optional[int]   # Assigned cycle (None if outside cycles)
+
+    # Contact labeling
+    contact_label: str        # 'L', 'R', 'None', or 'unknown'
+    d_left: Optional[float]   # Distance to left wrist (normalized)
+    d_right: Optional[float]  # Distance to right wrist (normalized)
+    d_min: Optional[float]    # min(d_left, d_right) when available
+
+    # Normalized positions (from NormalizedFrame)
+    ball_center: Optional[tuple[float, float]]
+    left_wrist: Optional[tuple[float, float]]
+    right_wrist: Optional[tuple[float, float]]
+    left_shoulder: Optional[tuple[float, float]]
+    right_shoulder: Optional[tuple[float, float]]
+    left_knee: Optional[tuple[float, float]]
+    right_knee: Optional[tuple[float, float]]
+    hip_center: tuple[float, float]  # Always (0.0, 0.0)
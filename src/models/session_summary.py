@@ -0,0 +1,47 @@
+"""Session summary model: aggregate statistics across a session's cycles."""
+
+from dataclasses import dataclass, field
+
+from models.cycle import Cycle
+
+
+@dataclass(slots=True)
+class SessionSummary:
+    """Session-level aggregate statistics."""
+
+    # Source data (for traceability)
+    cycles: list[Cycle]
+    total_frames: int
+    valid_frames: int
+
+    # Duration statistics (FR-025)
+    duration_mean: float
+    duration_variance: float
+
+    # Height statistics (FR-025)
+    max_height_mean: float
+    max_height_variance: float
+
+    # Control statistics (FR-025)
+    controlled_time_ratio_mean: float
+    controlled_time_ratio_variance: float
+    control_deviation_mean: float
+    control_deviation_variance: float
+
+    # Crossover count (FR-026)
+    # Number of hand-change transitions between consecutive cycles with known cycle_hand
+    crossovers_count: int
+
+    # Hand ratios (FR-027)
+    # Computed from cycle_hand across all cycles with known hand
+    left_hand_ratio: float      # [0, 1]
+    right_hand_ratio: float     # [0, 1]
+    hand_ratio_sample_size: int # cycles with known cycle_hand used for ratio calculation
+
+    # Metadata
+    shoulder_width_session: float  # Used for d_thr computation
+    d_thr: float                   # Control threshold used
+
+    # Quality trade-offs made to meet Config.quality_budget_s, one entry per
+    # level change (see QualityGovernor.decisions); empty without a budget
+    quality_decisions: list[dict] = field(default_factory=list)
@@ -6,6 +6,7 @@ from .cycle_detector import CycleDetector
 from .contact_labeler import ContactLabeler
 from .cycle_metrics import CycleMetrics
 from .session_aggregator import SessionAggregator
+from .parameter_sweep import ParameterSweep
 
 __all__ = [
     'DataCleaner',
@@ -14,4 +15,5 @@ __all__ = [
     'ContactLabeler',
     'CycleMetrics',
     'SessionAggregator',
+    'ParameterSweep',
 ]
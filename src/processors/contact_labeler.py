@@ -1,7 +1,8 @@
 """Contact labeler module for per-frame hand contact labeling."""
 
+from collections import deque
 from statistics import median
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from models.labeled_frame import LabeledFrame
 
@@ -14,16 +15,24 @@ class ContactLabeler:
     labels each frame as L, R, None, or unknown based on ball-wrist distance.
     """
 
-    def __init__(self, k: float = 0.5, min_window_frames: int = 3):
+    def __init__(
+        self,
+        k: float = 0.5,
+        min_window_frames: int = 3,
+        min_window_ms: Optional[float] = None
+    ):
         """
         Initializes the ContactLabeler.
 
         Args:
             k: Control threshold multiplier (d_thr = k * shoulder_width_session).
             min_window_frames: Minimum frames for a meaningful contact window.
+            min_window_ms: Minimum duration of a meaningful contact window;
+                overrides min_window_frames when set.
         """
         self.k = k
         self.min_window_frames = min_window_frames
+        self.min_window_ms = min_window_ms
 
     @staticmethod
     def _distance(
@@ -36,10 +45,19 @@ class ContactLabeler:
         dy = a[1] - b[1]
         return (dx ** 2 + dy ** 2) ** 0.5
 
-    def _compute_shoulder_width_session(
+    def compute_shoulder_width_session(
         self,
         normalized_frames: list[dict]
     ) -> float:
+        """
+        Computes the median shoulder width across the session.
+
+        Args:
+            normalized_frames: Valid normalized frame dictionaries.
+
+        Returns:
+            Median shoulder width, or 0.0 when no frame has both shoulders.
+        """
         widths = []
         for frame in normalized_frames:
             left = frame.get("left_shoulder")
@@ -49,72 +67,166 @@ class ContactLabeler:
                 widths.append(dist)
         return median(widths) if widths else 0.0
 
-    def label_frames(
+    def compute_distances(
         self,
         normalized_frames: list[dict]
+    ) -> list[tuple[Optional[float], Optional[float], Optional[float]]]:
+        """
+        Computes ball-wrist distances for each frame.
+
+        Distances do not depend on k, so callers that label the same frames
+        with several thresholds can compute them once and reuse them.
+
+        Args:
+            normalized_frames: Valid normalized frame dictionaries.
+
+        Returns:
+            List of (d_left, d_right, d_min) tuples, one per frame.
+        """
+        return [self._frame_distances(frame) for frame in normalized_frames]
+
+    def _frame_distances(
+        self,
+        frame: dict
+    ) -> tuple[Optional[float], Optional[float], Optional[float]]:
+        ball_center = frame.get("ball_center")
+        d_left = self._distance(ball_center, frame.get("left_wrist"))
+        d_right = self._distance(ball_center, frame.get("right_wrist"))
+        d_min = None
+        if d_left is not None and d_right is not None:
+            d_min = min(d_left, d_right)
+        elif d_left is not None:
+            d_min = d_left
+        elif d_right is not None:
+            d_min = d_right
+        return d_left, d_right, d_min
+
+    @staticmethod
+    def _contact_label(
+        frame: dict,
+        d_left: Optional[float],
+        d_right: Optional[float],
+        d_thr: float
+    ) -> str:
+        ball_center = frame.get("ball_center")
+        left_wrist = frame.get("left_wrist")
+        right_wrist = frame.get("right_wrist")
+
+        if ball_center is None or (left_wrist is None and right_wrist is None):
+            return "unknown"
+        if d_left is None and d_right is None:
+            return "unknown"
+        if d_left is not None and d_left < d_thr and (
+            d_right is None or d_left <= d_right
+        ):
+            return "L"
+        if d_right is not None and d_right < d_thr and (
+            d_left is None or d_right < d_left
+        ):
+            return "R"
+        return "None"
+
+    def label_frames(
+        self,
+        normalized_frames: list[dict],
+        distances: Optional[
+            list[tuple[Optional[float], Optional[float], Optional[float]]]
+        ] = None,
+        shoulder_width_session: Optional[float] = None
     ) -> tuple[list[LabeledFrame], float]:
         """
         Labels frames with hand contact and distances.
 
         Args:
             normalized_frames: Valid normalized frame dictionaries.
+            distances: Optional precomputed output of compute_distances().
+            shoulder_width_session: Optional precomputed session shoulder width.
 
         Returns:
             Tuple of (labeled_frames, shoulder_width_session).
         """
-        shoulder_width_session = self._compute_shoulder_width_session(normalized_frames)
+        if shoulder_width_session is None:
+            shoulder_width_session = self.compute_shoulder_width_session(
+                normalized_frames
+            )
+        if distances is None:
+            distances = self.compute_distances(normalized_frames)
         d_thr = self.k * shoulder_width_session
 
-        labeled_frames: list[LabeledFrame] = []
-        for frame in normalized_frames:
-            ball_center = frame.get("ball_center")
-            left_wrist = frame.get("left_wrist")
-            right_wrist = frame.get("right_wrist")
-
-            d_left = self._distance(ball_center, left_wrist)
-            d_right = self._distance(ball_center, right_wrist)
-            d_min = None
-            if d_left is not None and d_right is not None:
-                d_min = min(d_left, d_right)
-            elif d_left is not None:
-                d_min = d_left
-            elif d_right is not None:
-                d_min = d_right
-
-            if ball_center is None or (left_wrist is None and right_wrist is None):
-                contact_label = "unknown"
-            elif d_left is None and d_right is None:
-                contact_label = "unknown"
-            else:
-                if d_left is not None and d_left < d_thr and (
-                    d_right is None or d_left <= d_right
-                ):
-                    contact_label = "L"
-                elif d_right is not None and d_right < d_thr and (
-                    d_left is None or d_right < d_left
-                ):
-                    contact_label = "R"
-                else:
-                    contact_label = "None"
-
-            labeled_frames.append(
-                LabeledFrame(
-                    frame_index=frame["frame_index"],
-                    timestamp_ms=frame["timestamp_ms"],
-                    cycle_id=None,
-                    contact_label=contact_label,
-                    d_left=d_left,
-                    d_right=d_right,
-                    d_min=d_min,
-                    ball_center=ball_center,
-                    left_wrist=left_wrist,
-                    right_wrist=right_wrist,
-                    left_shoulder=frame.get("left_shoulder"),
-                    right_shoulder=frame.get("right_shoulder"),
-                    left_knee=frame.get("left_knee"),
-                    right_knee=frame.get("right_knee"),
-                    hip_center=frame.get("hip_center", (0.0, 0.0)),
-                )
-            )
+        labeled_frames = [
+            self._labeled_frame(frame, frame_distances, d_thr)
+            for frame, frame_distances in zip(normalized_frames, distances)
+        ]
 
         return labeled_frames, shoulder_width_session
+
+    def _labeled_frame(
+        self,
+        frame: dict,
+        frame_distances: tuple[Optional[float], Optional[float], Optional[float]],
+        d_thr: float
+    ) -> LabeledFrame:
+        d_left, d_right, d_min = frame_distances
+        return LabeledFrame(
+            frame_index=frame["frame_index"],
+            timestamp_ms=frame["timestamp_ms"],
+            cycle_id=None,
+            contact_label=self._contact_label(frame, d_left, d_right, d_thr),
+            d_left=d_left,
+            d_right=d_right,
+            d_min=d_min,
+            ball_center=frame.get("ball_center"),
+            left_wrist=frame.get("left_wrist"),
+            right_wrist=frame.get("right_wrist"),
+            left_shoulder=frame.get("left_shoulder"),
+            right_shoulder=frame.get("right_shoulder"),
+            left_knee=frame.get("left_knee"),
+            right_knee=frame.get("right_knee"),
+            hip_center=frame.get("hip_center", (0.0, 0.0)),
+        )
+
+    def label_stream(
+        self,
+        normalized_frames: Iterable[dict],
+        warmup_frames: int = 90,
+        window_frames: int = 300
+    ) -> Iterator[tuple[LabeledFrame, float]]:
+        """
+        Streaming variant of label_frames().
+
+        The session median shoulder width is replaced by the median over the
+        last window_frames shoulder widths. Frames are held back until
+        warmup_frames later frames have been seen, so early frames are not
+        labeled from a handful of widths; with a window covering the whole
+        recording, labels match label_frames() once the warm-up is satisfied.
+
+        Args:
+            normalized_frames: Iterable of valid normalized frame dictionaries.
+            warmup_frames: Look-ahead, in frames, before a frame is labeled.
+            window_frames: Look-behind of the shoulder width median.
+
+        Yields:
+            Tuples of (labeled_frame, shoulder_width) with the shoulder width
+            the frame was labeled with.
+        """
+        widths: deque[float] = deque(maxlen=window_frames)
+        held: deque[dict] = deque()
+
+        def release() -> tuple[LabeledFrame, float]:
+            frame = held.popleft()
+            shoulder_width = median(widths) if widths else 0.0
+            labeled = self._labeled_frame(
+                frame, self._frame_distances(frame), self.k * shoulder_width
+            )
+            return labeled, shoulder_width
+
+        for frame in normalized_frames:
+            width = self._distance(frame.get("left_shoulder"), frame.get("right_shoulder"))
+            if width is not None:
+                widths.append(width)
+            held.append(frame)
+            if len(held) > warmup_frames:
+                yield release()
+
+        while held:
+            yield release()
@@ -1,6 +1,8 @@
 """Cycle detector module for dribble cycle detection."""
 
-from scipy.signal import find_peaks
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
 
 
 class CycleDetector:
@@ -10,83 +12,278 @@ class CycleDetector:
     This class uses trough detection on ball height data to segment
     the video into individual dribble cycles.
     
+    With min_cycle_duration_ms set, cycles must last that long by their
+    timestamps, and the trough spacing passed to find_peaks is converted
+    to samples at the median sample interval, so subsampled or variable
+    frame rate data is segmented like full-rate data.
+    
+    Segment boundaries (timestamps where an idle stretch starts or ends)
+    can be passed in; a cycle never spans one, so the last trough before a
+    break and the first one after it are not paired.
+    
     Attributes:
         min_cycle_duration: Minimum frames between peaks.
+        min_cycle_duration_ms: Minimum time between peaks; overrides
+            min_cycle_duration when set.
     """
     
-    def __init__(self, min_cycle_duration: int = 10):
+    def __init__(self, min_cycle_duration: int = 10, min_cycle_duration_ms: Optional[float] = None):
         """
         Initializes the CycleDetector.
         
         Args:
             min_cycle_duration: Minimum frames between peaks to avoid splitting
                                one dribble into multiple cycles (default: 10).
+            min_cycle_duration_ms: Minimum milliseconds between peaks, or
+                None to use min_cycle_duration.
         """
         self.min_cycle_duration = min_cycle_duration
+        self.min_cycle_duration_ms = min_cycle_duration_ms
     
-    def detect_cycles(
+    def _min_samples(self, timestamps_ms: Optional[list[float]]) -> int:
+        """Returns the minimum trough spacing in samples."""
+        if self.min_cycle_duration_ms is None or not timestamps_ms or len(timestamps_ms) < 2:
+            return self.min_cycle_duration
+        intervals = sorted(b - a for a, b in zip(timestamps_ms, timestamps_ms[1:]))
+        interval_ms = max(1e-6, intervals[len(intervals) // 2])
+        return max(1, round(self.min_cycle_duration_ms / interval_ms))
+    
+    def _long_enough(
         self,
-        normalized_data_list: list[dict],
-        fps: float
-    ) -> list[list[dict]]:
+        start_idx: int,
+        end_idx: int,
+        timestamps_ms: Optional[list[float]]
+    ) -> bool:
+        if self.min_cycle_duration_ms is None or timestamps_ms is None:
+            return end_idx - start_idx >= self.min_cycle_duration
+        return timestamps_ms[end_idx] - timestamps_ms[start_idx] >= self.min_cycle_duration_ms
+    
+    @staticmethod
+    def _crosses_boundary(
+        start_ms: float,
+        end_ms: float,
+        boundaries_ms: Optional[Sequence[float]]
+    ) -> bool:
+        """Whether a sorted boundary lies in (start_ms, end_ms]."""
+        if not boundaries_ms:
+            return False
+        position = bisect_right(boundaries_ms, start_ms)
+        return position < len(boundaries_ms) and boundaries_ms[position] <= end_ms
+    
+    def find_troughs(self, normalized_data_list: list[dict]) -> Optional[list[int]]:
         """
-        Detects individual dribble cycles by finding troughs in ball height.
+        Finds dribble trough positions in ball height.
 
         Uses SciPy's find_peaks to identify local maxima in the ball's
-        vertical position (lowest point of the dribble). The frames between
-        consecutive troughs represent one complete dribble cycle.
-        
+        vertical position (lowest point of the dribble).
+
         Args:
             normalized_data_list: List of valid normalized frame dictionaries.
-            fps: Frames per second of the video.
-        
+
         Returns:
-            List of dribble cycles, where each cycle is a list of frame data.
+            Indices into normalized_data_list of each trough, or None when
+            there are not enough valid data points for cycle detection.
         """
-        print("Detecting dribble cycles...")
-        
+        return self._troughs_in(
+            [frame.get('ball_center') for frame in normalized_data_list],
+            [frame['timestamp_ms'] for frame in normalized_data_list]
+        )
+
+    def _troughs_in(
+        self,
+        ball_centers: list[Optional[tuple[float, float]]],
+        timestamps_ms: Optional[list[float]] = None
+    ) -> Optional[list[int]]:
         ball_heights = []
         valid_indices = []
 
-        for idx, frame in enumerate(normalized_data_list):
-            if frame.get('ball_center'):
-                ball_heights.append(frame['ball_center'][1])
+        for idx, ball_center in enumerate(ball_centers):
+            if ball_center:
+                ball_heights.append(ball_center[1])
                 valid_indices.append(idx)
-            else:
-                ball_heights.append(None)
 
-        valid_heights = [h for h in ball_heights if h is not None]
-        
-        if len(valid_heights) < self.min_cycle_duration:
-            print(f"  Not enough valid data points ({len(valid_heights)}) for cycle detection")
-            return []
-        
+        min_samples = self._min_samples(
+            [timestamps_ms[idx] for idx in valid_indices] if timestamps_ms else None
+        )
+        if len(ball_heights) < min_samples:
+            return None
+
+        # SciPy is imported here so only runs that detect cycles pay for it
+        from scipy.signal import find_peaks
+
         peaks, properties = find_peaks(
-            valid_heights,
-            distance=self.min_cycle_duration,
+            ball_heights,
+            distance=min_samples,
             prominence=0.1
         )
+
+        return [valid_indices[p] for p in peaks]
+
+    def cycle_bounds(
+        self,
+        trough_indices: list[int],
+        timestamps_ms: Optional[list[float]] = None,
+        boundaries_ms: Optional[Sequence[float]] = None
+    ) -> list[tuple[int, int]]:
+        """
+        Converts trough positions into cycle boundaries.
+
+        Args:
+            trough_indices: Output of find_troughs().
+            timestamps_ms: Timestamps of the frames find_troughs() ran on;
+                needed when min_cycle_duration_ms or boundaries_ms is set.
+            boundaries_ms: Sorted segment boundary timestamps.
+
+        Returns:
+            List of (start_idx, end_idx) slices, end exclusive, for every pair
+            of consecutive troughs at least min_cycle_duration frames (or
+            min_cycle_duration_ms) apart and not separated by a boundary.
+        """
+        bounds = []
+        for i in range(len(trough_indices) - 1):
+            start_idx = trough_indices[i]
+            end_idx = trough_indices[i + 1]
+            if timestamps_ms is not None and self._crosses_boundary(
+                timestamps_ms[start_idx], timestamps_ms[end_idx], boundaries_ms
+            ):
+                continue
+            if self._long_enough(start_idx, end_idx, timestamps_ms):
+                bounds.append((start_idx, end_idx))
+        return bounds
+
+    def detect_cycles(
+        self,
+        normalized_data_list: list[dict],
+        fps: float,
+        boundaries_ms: Optional[Sequence[float]] = None,
+        verbose: bool = True
+    ) -> list[list[dict]]:
+        """
+        Detects individual dribble cycles by finding troughs in ball height.
+
+        The frames between consecutive troughs represent one complete
+        dribble cycle.
         
-        peak_frame_indices = [valid_indices[p] for p in peaks]
+        Args:
+            normalized_data_list: List of valid normalized frame dictionaries.
+            fps: Frames per second of the video.
+            boundaries_ms: Sorted timestamps where idle stretches start or
+                end; no cycle spans one.
+            verbose: Print progress output.
+        
+        Returns:
+            List of dribble cycles, where each cycle is a list of frame data.
+        """
+        if verbose:
+            print("Detecting dribble cycles...")
         
-        print(f"  Found {len(peak_frame_indices)} troughs (dribble cycle markers)")
-        print(f"  Trough frames: {peak_frame_indices}")
+        peak_frame_indices = self.find_troughs(normalized_data_list)
+        if peak_frame_indices is None:
+            if verbose:
+                valid_count = sum(
+                    1 for frame in normalized_data_list if frame.get('ball_center')
+                )
+                print(f"  Not enough valid data points ({valid_count}) for cycle detection")
+            return []
+        
+        if verbose:
+            print(f"  Found {len(peak_frame_indices)} troughs (dribble cycle markers)")
+            print(f"  Trough frames: {peak_frame_indices}")
         
         dribble_cycles = []
         
-        for i in range(len(peak_frame_indices) - 1):
-            start_idx = peak_frame_indices[i]
-            end_idx = peak_frame_indices[i + 1]
-
+        timestamps_ms = [frame['timestamp_ms'] for frame in normalized_data_list]
+        for start_idx, end_idx in self.cycle_bounds(
+            peak_frame_indices, timestamps_ms, boundaries_ms
+        ):
             cycle_frames = normalized_data_list[start_idx:end_idx]
-
-            if len(cycle_frames) >= self.min_cycle_duration:
-                dribble_cycles.append(cycle_frames)
-                duration_ms = cycle_frames[-1]['timestamp_ms'] - cycle_frames[0]['timestamp_ms']
+            dribble_cycles.append(cycle_frames)
+            if verbose:
+                duration_ms = (
+                    cycle_frames[-1]['timestamp_ms'] - cycle_frames[0]['timestamp_ms']
+                )
                 print(
                     f"  Cycle {len(dribble_cycles)}: {len(cycle_frames)} frames ({duration_ms}ms)"
                 )
         
-        print(f"  Total dribble cycles detected: {len(dribble_cycles)}")
+        if verbose:
+            print(f"  Total dribble cycles detected: {len(dribble_cycles)}")
         
         return dribble_cycles
+
+    def detect_cycles_stream(
+        self,
+        frames: Iterable[Any],
+        lookahead_frames: int = 30,
+        window_frames: int = 300,
+        ball_center: Optional[Callable[[Any], Optional[tuple[float, float]]]] = None,
+        timestamp_ms: Optional[Callable[[Any], float]] = None,
+        boundaries_ms: Optional[Sequence[float]] = None
+    ) -> Iterator[list[Any]]:
+        """
+        Streaming variant of detect_cycles().
+
+        Troughs are searched in the last window_frames frames every
+        lookahead_frames frames. A trough is final once lookahead_frames
+        newer frames have been seen, and each final trough closes the cycle
+        that started at the previous one. Cycles longer than the window
+        cannot be assembled and are dropped; no real dribble comes close.
+
+        Args:
+            frames: Iterable of valid normalized frames, in order.
+            lookahead_frames: Frames seen after a trough before it is final.
+            window_frames: Frames kept for trough detection and cycle assembly.
+            ball_center: Returns the ball center of one item of frames;
+                defaults to frame.get('ball_center') for frame dictionaries.
+                Lets labeled frame tuples be chained directly.
+            timestamp_ms: Returns the timestamp of one item of frames;
+                defaults to frame['timestamp_ms'].
+            boundaries_ms: Sorted segment boundary timestamps; may be a
+                list that grows while frames are consumed.
+
+        Yields:
+            Dribble cycles as lists of the input items, in order.
+        """
+        if ball_center is None:
+            def ball_center(frame):
+                return frame.get('ball_center')
+        if timestamp_ms is None:
+            def timestamp_ms(frame):
+                return frame['timestamp_ms']
+
+        window: deque[Any] = deque(maxlen=window_frames)
+        centers: deque[Optional[tuple[float, float]]] = deque(maxlen=window_frames)
+        timestamps: deque[float] = deque(maxlen=window_frames)
+        last_trough: Optional[int] = None
+        seen = 0
+
+        def settled_cycles(final_before: int) -> Iterator[list[Any]]:
+            nonlocal last_trough
+            window_start = seen - len(window)
+            window_timestamps = list(timestamps)
+            for trough in self._troughs_in(list(centers), window_timestamps) or []:
+                position = window_start + trough
+                if last_trough is not None and position <= last_trough:
+                    continue
+                if position >= final_before:
+                    return
+                previous, last_trough = last_trough, position
+                if previous is None or previous < window_start:
+                    continue
+                start_idx, end_idx = previous - window_start, position - window_start
+                if self._crosses_boundary(
+                    window_timestamps[start_idx], window_timestamps[end_idx], boundaries_ms
+                ):
+                    continue
+                if self._long_enough(start_idx, end_idx, window_timestamps):
+                    yield list(window)[start_idx:end_idx]
+
+        for frame in frames:
+            window.append(frame)
+            centers.append(ball_center(frame))
+            timestamps.append(timestamp_ms(frame))
+            seen += 1
+            if seen % lookahead_frames == 0:
+                yield from settled_cycles(seen - lookahead_frames)
+
+        yield from settled_cycles(seen)
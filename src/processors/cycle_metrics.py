@@ -13,7 +13,13 @@ class CycleMetrics:
     Computes per-cycle metrics from labeled frames.
     """
 
-    def __init__(self, d_thr: float, delta: float = 0.1, min_window_frames: int = 3):
+    def __init__(
+        self,
+        d_thr: float,
+        delta: float = 0.1,
+        min_window_frames: int = 3,
+        min_window_ms: Optional[float] = None
+    ):
         """
         Initializes CycleMetrics.
 
@@ -21,10 +27,18 @@ class CycleMetrics:
             d_thr: Control threshold distance for contact labeling reference.
             delta: Dominant hand margin threshold.
             min_window_frames: Minimum frames for a meaningful contact window.
+            min_window_ms: Minimum duration of a meaningful contact window;
+                overrides min_window_frames when set.
         """
         self.d_thr = d_thr
         self.delta = delta
         self.min_window_frames = min_window_frames
+        self.min_window_ms = min_window_ms
+
+    def _is_meaningful(self, event: ContactEvent) -> bool:
+        if self.min_window_ms is not None:
+            return event.duration_ms >= self.min_window_ms
+        return event.frame_count >= self.min_window_frames
 
     @staticmethod
     def _mean(values: list[float]) -> float:
@@ -149,8 +163,7 @@ class CycleMetrics:
             - cycle_hand: Main hand for this bounce based on total contact event durations
         """
         meaningful_events = [
-            event for event in contact_events
-            if event.frame_count >= self.min_window_frames
+            event for event in contact_events if self._is_meaningful(event)
         ]
         start_hand = meaningful_events[0].hand if meaningful_events else None
         end_hand = meaningful_events[-1].hand if meaningful_events else None
@@ -297,7 +310,9 @@ class CycleMetrics:
 
         return Cycle(
             cycle_id=cycle_id,
-            frames=frames,
+            start_frame_index=frames[0].frame_index,
+            end_frame_index=frames[-1].frame_index,
+            frame_count=len(frames),
             contact_events=contact_events,
             start_time_ms=start_time_ms,
             end_time_ms=end_time_ms,
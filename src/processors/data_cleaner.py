@@ -1,6 +1,7 @@
 """Data cleaner module for outlier detection and interpolation."""
 
-from typing import Optional
+from collections import deque
+from typing import Iterable, Iterator, Optional
 
 
 class DataCleaner:
@@ -10,18 +11,40 @@ class DataCleaner:
     This class handles velocity-based outlier detection and linear
     interpolation to fix impossible ball movements in tracking data.
     
+    With max_velocity_px_per_s set, the limit scales with the time between
+    the two records and interpolation is weighted by timestamps, so the
+    result does not depend on the sampling rate.
+    
     Attributes:
         max_velocity: Maximum pixels the ball can move per frame.
+        max_velocity_px_per_s: Maximum ball speed in pixels per second;
+            overrides max_velocity when set.
     """
     
-    def __init__(self, max_velocity: int = 100):
+    def __init__(self, max_velocity: int = 100, max_velocity_px_per_s: Optional[float] = None):
         """
         Initializes the DataCleaner.
         
         Args:
             max_velocity: Maximum pixels the ball can move per frame (default: 100).
+            max_velocity_px_per_s: Maximum pixels per second, or None to use
+                max_velocity.
         """
         self.max_velocity = max_velocity
+        self.max_velocity_px_per_s = max_velocity_px_per_s
+    
+    def _max_distance(self, previous: dict, current: dict) -> float:
+        """Returns the largest plausible ball movement between two records."""
+        if self.max_velocity_px_per_s is None:
+            return self.max_velocity
+        elapsed_ms = max(1, current['timestamp_ms'] - previous['timestamp_ms'])
+        return self.max_velocity_px_per_s * elapsed_ms / 1000
+    
+    def _position(self, frame_data_list: list[dict], idx: int) -> float:
+        """Interpolation coordinate of a record: its index, or its timestamp."""
+        if self.max_velocity_px_per_s is None:
+            return idx
+        return frame_data_list[idx]['timestamp_ms']
     
     def detect_outliers_by_velocity(
         self, 
@@ -51,7 +74,7 @@ class DataCleaner:
                 dy = curr_pos[1] - prev_pos[1]
                 distance = (dx**2 + dy**2)**0.5
                 
-                if distance > self.max_velocity:
+                if distance > self._max_distance(frame_data_list[i-1], frame_data_list[i]):
                     outlier_indices.append(i)
         
         return outlier_indices
@@ -93,13 +116,15 @@ class DataCleaner:
                 next_pos = frame_data_list[next_idx]['ball_center']
                 
                 if prev_pos and next_pos:
-                    t = (idx - prev_idx) / (next_idx - prev_idx)
+                    prev_t = self._position(frame_data_list, prev_idx)
+                    span = self._position(frame_data_list, next_idx) - prev_t
+                    t = (self._position(frame_data_list, idx) - prev_t) / span if span else 0.5
                     interp_x = int(prev_pos[0] + t * (next_pos[0] - prev_pos[0]))
                     interp_y = int(prev_pos[1] + t * (next_pos[1] - prev_pos[1]))
                     
                     frame_data_list[idx]['ball_center'] = (interp_x, interp_y)
     
-    def clean(self, frame_data_list: list[dict]) -> list[dict]:
+    def clean(self, frame_data_list: list[dict], verbose: bool = True) -> list[dict]:
         """
         Cleans ball position data by detecting and correcting outliers.
         
@@ -108,17 +133,88 @@ class DataCleaner:
         
         Args:
             frame_data_list: List of frame dictionaries with ball_center data.
+            verbose: Print progress output.
         
         Returns:
             The cleaned frame_data_list (modified in-place, also returned).
         """
-        print("Cleaning ball position data...")
+        if verbose:
+            print("Cleaning ball position data...")
         
         outliers = self.detect_outliers_by_velocity(frame_data_list)
-        print(f"  Found {len(outliers)} outlier positions (moved >{self.max_velocity} pixels)")
+        if verbose:
+            if self.max_velocity_px_per_s is None:
+                limit = f"{self.max_velocity} pixels"
+            else:
+                limit = f"{self.max_velocity_px_per_s:.0f} pixels/s"
+            print(f"  Found {len(outliers)} outlier positions (moved >{limit})")
         
         if outliers:
             self.interpolate_outliers(frame_data_list, outliers)
-            print(f"  Corrected {len(outliers)} outlier positions using linear interpolation")
+            if verbose:
+                print(f"  Corrected {len(outliers)} outlier positions using linear interpolation")
         
         return frame_data_list
+
+    def clean_stream(
+        self,
+        frame_data_iter: Iterable[dict],
+        lookahead_frames: int = 30
+    ) -> Iterator[dict]:
+        """
+        Streaming variant of clean() yielding frames in order as they are final.
+
+        Outliers are detected exactly as in clean(). Frames are held back
+        only while an outlier waits for the next valid position to
+        interpolate against; if none arrives within lookahead_frames, the
+        oldest held frames are released uncorrected (clean() would
+        interpolate across the longer gap). Only the last valid position is
+        kept as look-behind.
+
+        Args:
+            frame_data_iter: Iterable of frame dictionaries with ball_center data.
+            lookahead_frames: Maximum number of frames held back.
+
+        Yields:
+            Frame dictionaries, outliers corrected in-place.
+        """
+        previous_frame: Optional[dict] = None
+        previous_raw: Optional[tuple[int, int]] = None
+        anchor: Optional[tuple[float, tuple[int, int]]] = None
+        pending: deque[tuple[float, dict, bool]] = deque()
+
+        for index, frame_data in enumerate(frame_data_iter):
+            position = index if self.max_velocity_px_per_s is None else frame_data['timestamp_ms']
+            current = frame_data['ball_center']
+            is_outlier = False
+            if previous_raw and current:
+                dx = current[0] - previous_raw[0]
+                dy = current[1] - previous_raw[1]
+                is_outlier = (dx**2 + dy**2)**0.5 > self._max_distance(previous_frame, frame_data)
+            previous_frame = frame_data
+            previous_raw = current
+
+            if current is not None and not is_outlier:
+                if anchor is not None:
+                    prev_idx, prev_pos = anchor
+                    for idx, held, held_is_outlier in pending:
+                        if held_is_outlier:
+                            span = position - prev_idx
+                            t = (idx - prev_idx) / span if span else 0.5
+                            held['ball_center'] = (
+                                int(prev_pos[0] + t * (current[0] - prev_pos[0])),
+                                int(prev_pos[1] + t * (current[1] - prev_pos[1]))
+                            )
+                while pending:
+                    yield pending.popleft()[1]
+                anchor = (position, current)
+                yield frame_data
+            elif is_outlier or pending:
+                pending.append((position, frame_data, is_outlier))
+                if len(pending) > lookahead_frames:
+                    yield pending.popleft()[1]
+            else:
+                yield frame_data
+
+        while pending:
+            yield pending.popleft()[1]
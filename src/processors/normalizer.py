@@ -1,6 +1,6 @@
 """Coordinate normalizer module for body-relative coordinate transformation."""
 
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 
 class CoordinateNormalizer:
@@ -43,7 +43,74 @@ class CoordinateNormalizer:
         
         return (norm_x, norm_y)
     
-    def normalize(self, frame_data_list: list[dict]) -> list[Optional[dict]]:
+    def normalize_frame(self, frame_data: dict) -> Optional[dict]:
+        """
+        Normalizes one frame relative to its hip center and body height.
+        
+        Args:
+            frame_data: Frame dictionary with absolute pixel coordinates.
+        
+        Returns:
+            Normalized frame dictionary, or None when pose data is missing.
+        """
+        hip_center = frame_data.get('hip_center')
+        left_shoulder = frame_data.get('left_shoulder')
+        right_shoulder = frame_data.get('right_shoulder')
+
+        if not hip_center or not left_shoulder or not right_shoulder:
+            return None
+
+        shoulder_center_x = (left_shoulder[0] + right_shoulder[0]) / 2
+        shoulder_center_y = (left_shoulder[1] + right_shoulder[1]) / 2
+
+        dx = shoulder_center_x - hip_center[0]
+        dy = shoulder_center_y - hip_center[1]
+        body_height = (dx**2 + dy**2)**0.5
+
+        if body_height < 10:
+            return None
+
+        normalized_frame = {
+            'frame_index': frame_data['frame_index'],
+            'timestamp_ms': frame_data['timestamp_ms'],
+            'ball_center': self._normalize_position(
+                frame_data.get('ball_center'), hip_center, body_height
+            ),
+            'left_wrist': self._normalize_position(
+                frame_data.get('left_wrist'), hip_center, body_height
+            ),
+            'right_wrist': self._normalize_position(
+                frame_data.get('right_wrist'), hip_center, body_height
+            ),
+            'left_elbow': self._normalize_position(
+                frame_data.get('left_elbow'), hip_center, body_height
+            ),
+            'right_elbow': self._normalize_position(
+                frame_data.get('right_elbow'), hip_center, body_height
+            ),
+            'left_shoulder': self._normalize_position(
+                frame_data.get('left_shoulder'), hip_center, body_height
+            ),
+            'right_shoulder': self._normalize_position(
+                frame_data.get('right_shoulder'), hip_center, body_height
+            ),
+            'left_knee': self._normalize_position(
+                frame_data.get('left_knee'), hip_center, body_height
+            ),
+            'right_knee': self._normalize_position(
+                frame_data.get('right_knee'), hip_center, body_height
+            ),
+            'hip_center': (0.0, 0.0),
+            'body_height': 1.0
+        }
+
+        return normalized_frame
+    
+    def normalize(
+        self,
+        frame_data_list: list[dict],
+        verbose: bool = True
+    ) -> list[Optional[dict]]:
         """
         Normalizes all position coordinates relative to hip center and body height.
         
@@ -57,76 +124,45 @@ class CoordinateNormalizer:
         
         Args:
             frame_data_list: List of frame dictionaries with absolute pixel coordinates.
+            verbose: Print progress output.
         
         Returns:
             New list with normalized coordinates, or None for frames without pose data.
         """
         normalized_data_list = []
         
-        print("Normalizing coordinates...")
+        if verbose:
+            print("Normalizing coordinates...")
         frames_normalized = 0
         frames_skipped = 0
         
         for frame_data in frame_data_list:
-            hip_center = frame_data.get('hip_center')
-            left_shoulder = frame_data.get('left_shoulder')
-            right_shoulder = frame_data.get('right_shoulder')
-            
-            if not hip_center or not left_shoulder or not right_shoulder:
-                normalized_data_list.append(None)
-                frames_skipped += 1
-                continue
-            
-            shoulder_center_x = (left_shoulder[0] + right_shoulder[0]) / 2
-            shoulder_center_y = (left_shoulder[1] + right_shoulder[1]) / 2
-            
-            dx = shoulder_center_x - hip_center[0]
-            dy = shoulder_center_y - hip_center[1]
-            body_height = (dx**2 + dy**2)**0.5
-            
-            if body_height < 10:
-                normalized_data_list.append(None)
-                frames_skipped += 1
-                continue
-            
-            normalized_frame = {
-                'frame_index': frame_data['frame_index'],
-                'timestamp_ms': frame_data['timestamp_ms'],
-                'ball_center': self._normalize_position(
-                    frame_data.get('ball_center'), hip_center, body_height
-                ),
-                'left_wrist': self._normalize_position(
-                    frame_data.get('left_wrist'), hip_center, body_height
-                ),
-                'right_wrist': self._normalize_position(
-                    frame_data.get('right_wrist'), hip_center, body_height
-                ),
-                'left_elbow': self._normalize_position(
-                    frame_data.get('left_elbow'), hip_center, body_height
-                ),
-                'right_elbow': self._normalize_position(
-                    frame_data.get('right_elbow'), hip_center, body_height
-                ),
-                'left_shoulder': self._normalize_position(
-                    frame_data.get('left_shoulder'), hip_center, body_height
-                ),
-                'right_shoulder': self._normalize_position(
-                    frame_data.get('right_shoulder'), hip_center, body_height
-                ),
-                'left_knee': self._normalize_position(
-                    frame_data.get('left_knee'), hip_center, body_height
-                ),
-                'right_knee': self._normalize_position(
-                    frame_data.get('right_knee'), hip_center, body_height
-                ),
-                'hip_center': (0.0, 0.0),
-                'body_height': 1.0
-            }
-            
+            normalized_frame = self.normalize_frame(frame_data)
             normalized_data_list.append(normalized_frame)
-            frames_normalized += 1
+            if normalized_frame is None:
+                frames_skipped += 1
+            else:
+                frames_normalized += 1
         
-        print(f"  Normalized {frames_normalized} frames")
-        print(f"  Skipped {frames_skipped} frames (missing pose data)")
+        if verbose:
+            print(f"  Normalized {frames_normalized} frames")
+            print(f"  Skipped {frames_skipped} frames (missing pose data)")
         
         return normalized_data_list
+    
+    def normalize_stream(
+        self,
+        frame_data_iter: Iterable[dict]
+    ) -> Iterator[Optional[dict]]:
+        """
+        Streaming variant of normalize(); every frame is independent.
+        
+        Args:
+            frame_data_iter: Iterable of frame dictionaries with absolute
+                pixel coordinates.
+        
+        Yields:
+            Normalized frame dictionaries, or None for frames without pose data.
+        """
+        for frame_data in frame_data_iter:
+            yield self.normalize_frame(frame_data)
@@ -0,0 +1,293 @@
+"""Parameter sweep module for grid-searching post-processing thresholds."""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from itertools import product
+from typing import Any, Optional, Sequence
+
+from models.session_summary import SessionSummary
+from processors.contact_labeler import ContactLabeler
+from processors.cycle_metrics import CycleMetrics
+from processors.normalizer import CoordinateNormalizer
+from processors.session_analyzer import SessionAnalyzer
+from utils.thread_budget import ThreadBudget
+
+
+SWEEPABLE_PARAMETERS = (
+    'contact_threshold_k',
+    'dominant_hand_delta',
+    'min_contact_window_frames',
+    'min_cycle_duration',
+    'crossover_hand_gap_tolerance',
+)
+
+# Shared inputs installed once per worker process by _init_worker.
+_shared_inputs: dict[str, Any] = {}
+
+
+def _init_worker(shared_inputs: dict[str, Any]) -> None:
+    _shared_inputs.clear()
+    _shared_inputs.update(shared_inputs)
+
+
+def _summary_row(summary: SessionSummary) -> dict[str, Any]:
+    row = {
+        field.name: getattr(summary, field.name)
+        for field in fields(summary)
+        if field.name not in ('cycles', 'quality_decisions')
+    }
+    row['cycles_count'] = len(summary.cycles)
+    return row
+
+
+def _evaluate_group(
+    k: float,
+    min_cycle_duration: int,
+    metric_params: Sequence[tuple[float, int]],
+    gap_tolerances: Sequence[int],
+) -> list[dict[str, Any]]:
+    """
+    Evaluates combinations that share one (k, min_cycle_duration) pair.
+
+    Labeling only depends on k and cycle boundaries only on
+    min_cycle_duration, so both are computed once per call. Cycle metrics
+    are computed once per (dominant_hand_delta, min_contact_window_frames)
+    pair of metric_params and aggregated for every gap tolerance.
+    """
+    valid_frames = _shared_inputs['valid_frames']
+    distances = _shared_inputs['distances']
+    shoulder_width_session = _shared_inputs['shoulder_width_session']
+    bounds = _shared_inputs['cycle_bounds'][min_cycle_duration]
+    min_window_ms = _shared_inputs['min_window_ms']
+    aggregators = _shared_inputs['aggregators']
+    total_frames = _shared_inputs['total_frames']
+
+    labeler = ContactLabeler(k=k)
+    labeled_frames, _ = labeler.label_frames(
+        valid_frames,
+        distances=distances,
+        shoulder_width_session=shoulder_width_session,
+    )
+    d_thr = k * shoulder_width_session
+
+    rows = []
+    for delta, min_window_frames in metric_params:
+        cycle_metrics = CycleMetrics(
+            d_thr=d_thr,
+            delta=delta,
+            min_window_frames=min_window_frames,
+            min_window_ms=min_window_ms[min_window_frames],
+        )
+        cycles = [
+            cycle_metrics.compute_cycle_metrics(
+                labeled_frames[start_idx:end_idx], cycle_id
+            )
+            for cycle_id, (start_idx, end_idx) in enumerate(bounds)
+        ]
+        for gap_tolerance in gap_tolerances:
+            summary = aggregators[gap_tolerance].compute_session_summary(
+                cycles=cycles,
+                total_frames=total_frames,
+                valid_frames=len(valid_frames),
+                shoulder_width_session=shoulder_width_session,
+                d_thr=d_thr,
+            )
+            row = {
+                'contact_threshold_k': k,
+                'dominant_hand_delta': delta,
+                'min_contact_window_frames': min_window_frames,
+                'min_cycle_duration': min_cycle_duration,
+                'crossover_hand_gap_tolerance': gap_tolerance,
+            }
+            row.update(_summary_row(summary))
+            rows.append(row)
+    return rows
+
+
+class ParameterSweep:
+    """
+    Grid search over post-processing thresholds on fixed per-frame data.
+
+    Cleaning, normalization, ball-wrist distances and shoulder width do not
+    depend on any swept parameter and are computed once per sweep. Cycle
+    boundaries are computed once per min_cycle_duration value and, as in
+    analyze(), never span an idle stretch; labeled frames are computed once
+    per contact_threshold_k value. The (dominant_hand_delta,
+    min_contact_window_frames) points of each (k, min_cycle_duration) group
+    are split into enough tasks to keep every worker process busy, so grids
+    varying a single parameter are parallel as well.
+
+    Thresholds are derived exactly as SessionAnalyzer derives them, from
+    the config with the swept values substituted, including the time-based
+    conversion of set_time_thresholds() for subsampled data.
+
+    Attributes:
+        config: Configuration providing defaults for parameters not swept.
+        max_workers: Number of worker processes (1 evaluates inline, None
+            uses os.cpu_count()).
+    """
+
+    def __init__(self, config, max_workers: Optional[int] = None):
+        """
+        Initializes the ParameterSweep.
+
+        Args:
+            config: Config object; non-swept parameters are read from it.
+            max_workers: Number of worker processes, or None for the cores
+                of the CPU budget when cpu_budget is set, else os.cpu_count().
+        """
+        self.config = config
+        if max_workers is None and config.cpu_budget:
+            max_workers = len(ThreadBudget(config).budget_cores())
+        self.max_workers = max_workers
+
+    def _grid_values(self, grid: dict[str, Sequence]) -> dict[str, list]:
+        unknown = set(grid) - set(SWEEPABLE_PARAMETERS)
+        if unknown:
+            raise ValueError(
+                f"Unsupported sweep parameters: {sorted(unknown)}; "
+                f"expected any of {list(SWEEPABLE_PARAMETERS)}"
+            )
+        values = {}
+        for name in SWEEPABLE_PARAMETERS:
+            if name in grid:
+                values[name] = list(grid[name])
+                if not values[name]:
+                    raise ValueError(f"Sweep parameter '{name}' has no values")
+            else:
+                values[name] = [getattr(self.config, name)]
+        return values
+
+    def _analyzer(self, source_fps: Optional[float], **overrides) -> SessionAnalyzer:
+        """Returns a SessionAnalyzer for the config with some parameters replaced."""
+        analyzer = SessionAnalyzer(replace(self.config, **overrides))
+        analyzer.set_time_thresholds(source_fps)
+        return analyzer
+
+    def run(
+        self,
+        frame_data_list: list[dict],
+        grid: dict[str, Sequence],
+        source_fps: Optional[float] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Evaluates every combination in the grid.
+
+        Args:
+            frame_data_list: Raw per-frame records as collected by VideoProcessor
+                (not modified).
+            grid: Mapping of parameter name to the values to try. Parameters
+                left out use the value from config.
+            source_fps: Source frame rate when the records were subsampled,
+                as passed to SessionAnalyzer.set_time_thresholds(); None
+                uses the configured thresholds as they are.
+
+        Returns:
+            One row per combination, holding the parameter values followed by
+            the scalar SessionSummary metrics and 'cycles_count'.
+        """
+        values = self._grid_values(grid)
+
+        boundaries_ms: list[int] = []
+        frames = [
+            dict(frame_data)
+            for frame_data in SessionAnalyzer.mark_boundaries(frame_data_list, boundaries_ms)
+        ]
+        frames = self._analyzer(source_fps).data_cleaner.clean(frames)
+        normalized = CoordinateNormalizer().normalize(frames)
+        valid_frames = [frame for frame in normalized if frame is not None]
+        timestamps_ms = [frame['timestamp_ms'] for frame in valid_frames]
+
+        labeler = ContactLabeler()
+        cycle_bounds = {}
+        for min_cycle_duration in values['min_cycle_duration']:
+            detector = self._analyzer(
+                source_fps, min_cycle_duration=min_cycle_duration
+            ).cycle_detector
+            troughs = detector.find_troughs(valid_frames)
+            cycle_bounds[min_cycle_duration] = (
+                detector.cycle_bounds(troughs, timestamps_ms, boundaries_ms)
+                if troughs is not None else []
+            )
+        min_window_ms = {
+            min_window_frames: self._analyzer(
+                source_fps, min_contact_window_frames=min_window_frames
+            ).contact_labeler.min_window_ms
+            for min_window_frames in values['min_contact_window_frames']
+        }
+        aggregators = {
+            gap_tolerance: self._analyzer(
+                source_fps, crossover_hand_gap_tolerance=gap_tolerance
+            ).session_aggregator
+            for gap_tolerance in values['crossover_hand_gap_tolerance']
+        }
+
+        shared_inputs = {
+            'valid_frames': valid_frames,
+            'distances': labeler.compute_distances(valid_frames),
+            'shoulder_width_session': labeler.compute_shoulder_width_session(
+                valid_frames
+            ),
+            'cycle_bounds': cycle_bounds,
+            'min_window_ms': min_window_ms,
+            'aggregators': aggregators,
+            'total_frames': len(frames),
+        }
+
+        groups = list(product(
+            values['contact_threshold_k'], values['min_cycle_duration']
+        ))
+        metric_params = list(product(
+            values['dominant_hand_delta'], values['min_contact_window_frames']
+        ))
+        workers = self.max_workers or os.cpu_count() or 1
+        # Groups with more points than their share of the workers are split
+        # by (delta, min_window) pair; each part recomputes only the labels
+        parts = min(len(metric_params), math.ceil(workers / len(groups)))
+        task_args = [
+            (
+                k,
+                min_cycle_duration,
+                metric_params[part::parts],
+                values['crossover_hand_gap_tolerance'],
+            )
+            for k, min_cycle_duration in groups
+            for part in range(parts)
+        ]
+
+        combinations = 1
+        for name in SWEEPABLE_PARAMETERS:
+            combinations *= len(values[name])
+
+        if workers == 1 or len(task_args) == 1:
+            reason = "max_workers=1" if workers == 1 else "a single task"
+            print(f"Sweeping {combinations} combinations inline ({reason})...")
+            _init_worker(shared_inputs)
+            group_rows = [_evaluate_group(*args) for args in task_args]
+        else:
+            workers = min(workers, len(task_args))
+            print(
+                f"Sweeping {combinations} combinations as {len(task_args)} tasks "
+                f"on {workers} worker processes..."
+            )
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared_inputs,),
+            ) as executor:
+                group_rows = list(executor.map(_evaluate_group, *zip(*task_args)))
+
+        rows_by_key = {}
+        for rows in group_rows:
+            for row in rows:
+                key = tuple(row[name] for name in SWEEPABLE_PARAMETERS)
+                rows_by_key[key] = row
+
+        return [
+            rows_by_key[combination]
+            for combination in product(
+                *(values[name] for name in SWEEPABLE_PARAMETERS)
+            )
+        ]
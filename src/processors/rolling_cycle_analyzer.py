@@ -0,0 +1,73 @@
+"""Rolling cycle analyzer module for incremental metrics on live data."""
+
+from collections import deque
+from typing import Optional
+
+from models.cycle import Cycle
+from models.session_summary import SessionSummary
+from processors.session_analyzer import SessionAnalyzer
+
+
+class RollingCycleAnalyzer:
+    """
+    Computes cycle metrics over a sliding window of recent frames.
+
+    The full evaluation chain is re-run on the window, so the cost of each
+    update is bounded by the window size rather than the session length.
+    Cycles are reported once, after their closing trough is far enough from
+    the window end that more data can no longer move it.
+
+    Attributes:
+        window_frames: Number of most recent frames analyzed per update.
+        settle_frames: Frames required after a cycle's end before it is final.
+    """
+
+    def __init__(self, config, window_frames: int = 300):
+        """
+        Initializes the RollingCycleAnalyzer.
+
+        Args:
+            config: Config object containing evaluation thresholds.
+            window_frames: Number of most recent frames analyzed per update.
+        """
+        self.window_frames = window_frames
+        self.settle_frames = max(1, config.min_cycle_duration)
+        self.session_analyzer = SessionAnalyzer(config)
+        self._window: deque[dict] = deque(maxlen=window_frames)
+        self._last_emitted_end: Optional[int] = None
+        self._cycles_emitted = 0
+
+    def push(self, frame_data: dict) -> None:
+        """Adds a raw per-frame record to the window."""
+        self._window.append(frame_data)
+
+    def update(self, fps: float) -> tuple[list[Cycle], Optional[SessionSummary]]:
+        """
+        Re-analyzes the window and returns cycles finished since the last update.
+
+        Args:
+            fps: Frames per second of the source.
+
+        Returns:
+            Tuple of (new_cycles, window_summary). window_summary is None when
+            the window is still empty.
+        """
+        if not self._window:
+            return [], None
+
+        window = [dict(frame_data) for frame_data in self._window]
+        summary = self.session_analyzer.analyze(window, fps, quiet=True)
+
+        settled_before = window[-1]['frame_index'] - self.settle_frames
+        new_cycles = []
+        for cycle in summary.cycles:
+            end_index = cycle.end_frame_index
+            if end_index > settled_before:
+                continue
+            if self._last_emitted_end is not None and end_index <= self._last_emitted_end:
+                continue
+            cycle.cycle_id = self._cycles_emitted
+            self._cycles_emitted += 1
+            self._last_emitted_end = end_index
+            new_cycles.append(cycle)
+        return new_cycles, summary
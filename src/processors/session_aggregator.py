@@ -1,16 +1,35 @@
 """Session aggregation module for dribble cycle metrics."""
 
-from statistics import mean, pvariance
+from statistics import mean, median, pvariance
+from typing import Optional
 
 from models.cycle import Cycle
 from models.session_summary import SessionSummary
 
 
 class SessionAggregator:
-    """Aggregates cycle metrics into session-level statistics."""
+    """
+    Aggregates cycle metrics into session-level statistics.
 
-    def __init__(self, crossover_hand_gap_tolerance: int = 0):
+    Attributes:
+        crossover_hand_gap_tolerance: Cycles with an unknown hand skipped
+            when counting hand transitions.
+        crossover_hand_gap_ms: Maximum time between two cycles with a known
+            hand for their transition to count; replaces the tolerance
+            when set.
+        derive_gap_ms: Without crossover_hand_gap_ms, bound the gap by
+            crossover_hand_gap_tolerance median cycle durations instead of
+            counting cycles (used for subsampled data).
+    """
+
+    def __init__(
+        self,
+        crossover_hand_gap_tolerance: int = 0,
+        crossover_hand_gap_ms: Optional[float] = None
+    ):
         self.crossover_hand_gap_tolerance = max(0, crossover_hand_gap_tolerance)
+        self.crossover_hand_gap_ms = crossover_hand_gap_ms
+        self.derive_gap_ms = False
 
     @staticmethod
     def _stats(values: list[float]) -> tuple[float, float]:
@@ -20,12 +39,27 @@ class SessionAggregator:
             return values[0], 0.0
         return mean(values), pvariance(values)
 
+    def _gap_limit_ms(self, cycles: list[Cycle]) -> Optional[float]:
+        """Returns the time limit between counted cycles, or None to count cycles."""
+        if self.crossover_hand_gap_ms is not None:
+            return self.crossover_hand_gap_ms
+        if not self.derive_gap_ms or not cycles:
+            return None
+        # Half a cycle of slack so skipped cycles a little longer than the
+        # median still fit
+        return (self.crossover_hand_gap_tolerance + 0.5) * median(
+            cycle.duration_ms for cycle in cycles
+        )
+
     def _count_crossovers(self, cycles: list[Cycle]) -> int:
         """
         Count crossover transitions between consecutive cycles.
         
         A crossover is when the cycle_hand changes from one cycle to the next,
-        and both cycles have a known (non-None) cycle_hand.
+        and both cycles have a known (non-None) cycle_hand. Cycles with an
+        unknown hand in between are skipped, up to crossover_hand_gap_tolerance
+        of them or, in time mode, as long as the next known cycle starts
+        within the gap limit after the current one ends.
         
         Args:
             cycles: List of cycles in order.
@@ -33,6 +67,7 @@ class SessionAggregator:
         Returns:
             Number of hand-change transitions between consecutive cycles.
         """
+        gap_ms = self._gap_limit_ms(cycles)
         crossovers = 0
         i = 0
         while i < len(cycles) - 1:
@@ -41,9 +76,12 @@ class SessionAggregator:
                 i += 1
                 continue
             next_idx = None
-            for offset in range(1, self.crossover_hand_gap_tolerance + 2):
+            for offset in range(1, len(cycles) - i):
                 j = i + offset
-                if j >= len(cycles):
+                if gap_ms is None:
+                    if offset > self.crossover_hand_gap_tolerance + 1:
+                        break
+                elif cycles[j].start_time_ms - cycles[i].end_time_ms > gap_ms:
                     break
                 hand_j1 = cycles[j].cycle_hand
                 if hand_j1 is not None:
@@ -0,0 +1,241 @@
+"""Session analyzer module running the frames -> cycles -> summary chain."""
+
+from typing import Iterable, Iterator, Optional
+
+from models.session_summary import SessionSummary
+from processors.contact_labeler import ContactLabeler
+from processors.cycle_detector import CycleDetector
+from processors.cycle_metrics import CycleMetrics
+from processors.data_cleaner import DataCleaner
+from processors.normalizer import CoordinateNormalizer
+from processors.session_aggregator import SessionAggregator
+
+
+class SessionAnalyzer:
+    """
+    Runs the evaluation chain on collected per-frame records.
+
+    Cleans, normalizes, labels contacts, detects cycles, computes per-cycle
+    metrics and aggregates them into a SessionSummary. Records marked
+    'idle' (skipped by idle detection) split the session into segments
+    that no cycle spans.
+
+    Attributes:
+        config: Configuration object with evaluation thresholds.
+        data_cleaner: Data cleaning component.
+        normalizer: Coordinate normalization component.
+        cycle_detector: Dribble cycle detection component.
+        contact_labeler: Hand contact labeling component.
+        session_aggregator: Session-level aggregation component.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the SessionAnalyzer.
+
+        Args:
+            config: Config object containing evaluation thresholds.
+        """
+        self.config = config
+        self.data_cleaner = DataCleaner(config.max_velocity, config.max_velocity_px_per_s)
+        self.normalizer = CoordinateNormalizer()
+        self.cycle_detector = CycleDetector(
+            config.min_cycle_duration, config.min_cycle_duration_ms
+        )
+        self.contact_labeler = ContactLabeler(
+            k=config.contact_threshold_k,
+            min_window_frames=config.min_contact_window_frames,
+            min_window_ms=config.min_contact_window_ms
+        )
+        self.session_aggregator = SessionAggregator(
+            crossover_hand_gap_tolerance=config.crossover_hand_gap_tolerance,
+            crossover_hand_gap_ms=config.crossover_hand_gap_ms
+        )
+
+    def set_time_thresholds(self, source_fps: Optional[float]) -> None:
+        """
+        Switches the frame-count thresholds to time units for subsampled data.
+
+        max_velocity, min_cycle_duration and min_contact_window_frames are
+        tuned per source frame; with frames skipped they are converted at the
+        source rate, unless max_velocity_px_per_s, min_cycle_duration_ms or
+        min_contact_window_ms are configured. crossover_hand_gap_tolerance
+        counts cycles, which no frame rate converts; unless
+        crossover_hand_gap_ms is configured, it becomes a time limit of that
+        many median cycle durations of the session.
+
+        Args:
+            source_fps: Frame rate the per-frame thresholds refer to, or None
+                to restore the configured values.
+        """
+        max_velocity_px_per_s = self.config.max_velocity_px_per_s
+        min_cycle_duration_ms = self.config.min_cycle_duration_ms
+        min_contact_window_ms = self.config.min_contact_window_ms
+        if source_fps:
+            if max_velocity_px_per_s is None:
+                max_velocity_px_per_s = self.config.max_velocity * source_fps
+            if min_cycle_duration_ms is None:
+                min_cycle_duration_ms = self.config.min_cycle_duration * 1000 / source_fps
+            if min_contact_window_ms is None:
+                # A window of n frames spans n - 1 frame intervals
+                min_contact_window_ms = (
+                    max(0, self.config.min_contact_window_frames - 1) * 1000 / source_fps
+                )
+        self.data_cleaner.max_velocity_px_per_s = max_velocity_px_per_s
+        self.cycle_detector.min_cycle_duration_ms = min_cycle_duration_ms
+        self.contact_labeler.min_window_ms = min_contact_window_ms
+        self.session_aggregator.derive_gap_ms = bool(source_fps)
+
+    @staticmethod
+    def mark_boundaries(
+        frame_data_iter: Iterable[dict],
+        boundaries_ms: list[int]
+    ) -> Iterator[dict]:
+        """
+        Passes records through, appending the timestamps where 'idle' toggles.
+
+        The collected boundaries are the segment limits no cycle may span,
+        as passed to CycleDetector.cycle_bounds().
+        """
+        idle = False
+        for frame_data in frame_data_iter:
+            if frame_data.get('idle', False) != idle:
+                idle = not idle
+                boundaries_ms.append(frame_data['timestamp_ms'])
+            yield frame_data
+
+    def analyze(
+        self,
+        frame_data_list: list[dict],
+        fps: float,
+        quiet: bool = False
+    ) -> SessionSummary:
+        """
+        Computes the session summary for a list of raw frame records.
+
+        Args:
+            frame_data_list: Raw per-frame records (cleaned in-place).
+            fps: Frames per second of the video.
+            quiet: Suppress the processors' progress output.
+
+        Returns:
+            SessionSummary with per-cycle metrics and session aggregates.
+        """
+        verbose = not quiet
+        boundaries_ms: list[int] = []
+        frame_data_list = self.data_cleaner.clean(
+            list(self.mark_boundaries(frame_data_list, boundaries_ms)), verbose=verbose
+        )
+
+        normalized_data_list = self.normalizer.normalize(frame_data_list, verbose=verbose)
+        valid_frames = [frame for frame in normalized_data_list if frame is not None]
+
+        labeled_frames, shoulder_width_session = self.contact_labeler.label_frames(
+            valid_frames
+        )
+        d_thr = self.config.contact_threshold_k * shoulder_width_session
+        cycle_metrics = CycleMetrics(
+            d_thr=d_thr,
+            delta=self.config.dominant_hand_delta,
+            min_window_frames=self.contact_labeler.min_window_frames,
+            min_window_ms=self.contact_labeler.min_window_ms
+        )
+
+        dribble_cycles = self.cycle_detector.detect_cycles(
+            valid_frames, fps, boundaries_ms, verbose=verbose
+        )
+
+        labeled_by_frame = {frame.frame_index: frame for frame in labeled_frames}
+        cycles = []
+        for cycle_id, cycle_frames in enumerate(dribble_cycles):
+            labeled_cycle_frames = [
+                labeled_by_frame[frame["frame_index"]]
+                for frame in cycle_frames
+                if frame["frame_index"] in labeled_by_frame
+            ]
+            if labeled_cycle_frames:
+                cycles.append(
+                    cycle_metrics.compute_cycle_metrics(
+                        labeled_cycle_frames, cycle_id
+                    )
+                )
+
+        return self.session_aggregator.compute_session_summary(
+            cycles=cycles,
+            total_frames=len(frame_data_list),
+            valid_frames=len(valid_frames),
+            shoulder_width_session=shoulder_width_session,
+            d_thr=d_thr
+        )
+
+    def analyze_stream(self, frame_data_iter: Iterable[dict], fps: float) -> SessionSummary:
+        """
+        Computes the session summary with the streaming processor variants.
+
+        Frames flow lazily through clean_stream(), normalize_stream(),
+        label_stream() and detect_cycles_stream(), so only bounded windows
+        of frames are held regardless of the recording length. Each cycle is
+        measured with the shoulder width in effect at its last frame; the
+        summary reports the width in effect at the last cycle.
+
+        Args:
+            frame_data_iter: Raw per-frame records, in order (cleaned in-place).
+            fps: Frames per second of the video.
+
+        Returns:
+            SessionSummary with per-cycle metrics and session aggregates.
+        """
+        counts = {'total': 0, 'valid': 0}
+
+        def count(frames, key):
+            for frame in frames:
+                counts[key] += 1
+                yield frame
+
+        boundaries_ms: list[int] = []
+        cleaned = self.data_cleaner.clean_stream(
+            self.mark_boundaries(count(frame_data_iter, 'total'), boundaries_ms),
+            lookahead_frames=self.config.stream_lookahead_frames
+        )
+        valid = (
+            frame for frame in self.normalizer.normalize_stream(cleaned)
+            if frame is not None
+        )
+        labeled = self.contact_labeler.label_stream(
+            count(valid, 'valid'),
+            warmup_frames=self.config.stream_warmup_frames,
+            window_frames=self.config.stream_window_frames
+        )
+        dribble_cycles = self.cycle_detector.detect_cycles_stream(
+            labeled,
+            lookahead_frames=self.config.stream_lookahead_frames,
+            window_frames=self.config.stream_window_frames,
+            ball_center=lambda item: item[0].ball_center,
+            timestamp_ms=lambda item: item[0].timestamp_ms,
+            boundaries_ms=boundaries_ms
+        )
+
+        cycles = []
+        shoulder_width_session = 0.0
+        for cycle_frames in dribble_cycles:
+            shoulder_width_session = cycle_frames[-1][1]
+            cycle_metrics = CycleMetrics(
+                d_thr=self.config.contact_threshold_k * shoulder_width_session,
+                delta=self.config.dominant_hand_delta,
+                min_window_frames=self.contact_labeler.min_window_frames,
+                min_window_ms=self.contact_labeler.min_window_ms
+            )
+            cycles.append(
+                cycle_metrics.compute_cycle_metrics(
+                    [labeled_frame for labeled_frame, _ in cycle_frames],
+                    len(cycles)
+                )
+            )
+
+        return self.session_aggregator.compute_session_summary(
+            cycles=cycles,
+            total_frames=counts['total'],
+            valid_frames=counts['valid'],
+            shoulder_width_session=shoulder_width_session,
+            d_thr=self.config.contact_threshold_k * shoulder_width_session
+        )
@@ -0,0 +1,12 @@
+"""Service package for the long-running analysis service."""
+
+from .analysis_service import AnalysisJob, AnalysisService, ServiceBusy
+from .http_api import AnalysisRequestHandler, create_server
+
+__all__ = [
+    'AnalysisJob',
+    'AnalysisService',
+    'ServiceBusy',
+    'AnalysisRequestHandler',
+    'create_server'
+]
@@ -0,0 +1,396 @@
+"""Analysis service module dispatching video jobs to preloaded workers."""
+
+import contextlib
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class ServiceBusy(Exception):
+    """Raised when a job is submitted while the pending queue is full."""
+
+
+@dataclass
+class AnalysisJob:
+    """
+    A video analysis job and its timing.
+
+    Attributes:
+        job_id: Service-assigned job identifier.
+        video_path: Path of the video to analyze.
+        status: One of 'queued', 'running', 'done', 'failed', 'cancelled'.
+        worker_id: Worker the job was assigned to, once dispatched.
+        submitted_at: time.time() of submission.
+        started_at: time.time() when a worker picked the job up.
+        finished_at: time.time() when the job finished.
+        run_ms: Processing time measured inside the worker.
+        frames: Number of frames processed.
+        perception: Perception counters of the run.
+        summary: SessionSummary as a dict, once done.
+        error: Error message, if failed.
+    """
+
+    job_id: str
+    video_path: str
+    status: str = QUEUED
+    worker_id: Optional[int] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    run_ms: Optional[float] = None
+    frames: int = 0
+    perception: Optional[str] = None
+    summary: Optional[dict] = None
+    error: Optional[str] = None
+
+    @property
+    def queue_ms(self) -> Optional[float]:
+        """Time spent waiting for a worker."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.submitted_at) * 1000
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self, include_summary: bool = True) -> dict[str, Any]:
+        """Returns the job as a JSON-serializable dict."""
+        data = asdict(self)
+        data['queue_ms'] = self.queue_ms
+        if not include_summary:
+            data.pop('summary')
+        return data
+
+
+def _worker_main(worker_id, config, task_queue, result_queue, cancel_event) -> None:
+    """Worker process: loads the detectors once, then runs jobs until None arrives."""
+    from main import VideoProcessor
+
+    processor = VideoProcessor(config, warm=True)
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            processor.warm_up()
+        result_queue.put(('ready', worker_id, dict(processor.startup_ms)))
+
+        while True:
+            job = task_queue.get()
+            if job is None:
+                break
+            job_id, video_path = job
+            result_queue.put(('started', worker_id, job_id))
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(devnull):
+                    summary = processor.process(video_path, should_stop=cancel_event.is_set)
+            except Exception as error:
+                result_queue.put(('failed', worker_id, job_id, repr(error)))
+                continue
+            run_ms = (time.perf_counter() - start) * 1000
+            if cancel_event.is_set():
+                result_queue.put(('cancelled', worker_id, job_id, run_ms))
+                continue
+            result_queue.put((
+                'done', worker_id, job_id, run_ms,
+                summary.total_frames,
+                processor.perception_stats.summary_line(),
+                asdict(summary)
+            ))
+    processor.close()
+
+
+class _Worker:
+    def __init__(self, worker_id: int, context, config, result_queue):
+        self.worker_id = worker_id
+        self.task_queue = context.Queue()
+        self.cancel_event = context.Event()
+        self.ready = False
+        self.job_id: Optional[str] = None
+        self.startup_ms: dict[str, float] = {}
+        self.process = context.Process(
+            target=_worker_main,
+            args=(worker_id, config, self.task_queue, result_queue, self.cancel_event),
+            daemon=True
+        )
+        self.process.start()
+
+
+class AnalysisService:
+    """
+    Runs video analyses on a pool of worker processes with preloaded models.
+
+    Each worker holds a warm VideoProcessor, so a job only pays for video
+    decoding and inference, not interpreter or model startup. Jobs wait in
+    a bounded pending queue; submit() raises ServiceBusy when it is full.
+    Queued jobs are cancelled by removing them from the queue, running jobs
+    by signalling their worker, which stops at the next frame.
+
+    With config.cpu_budget set, every worker takes its own slice of the
+    CPU budget (cpu_process_index is the worker id, cpu_process_count the
+    number of workers).
+
+    A dispatcher thread assigns queued jobs to idle workers and collects
+    results. A worker process that dies mid-job is replaced and its job is
+    marked failed; a worker that fails while loading its models is not restarted.
+
+    Attributes:
+        config: Configuration used by the workers (windows and video output
+            are disabled).
+        num_workers: Number of worker processes.
+        max_pending: Maximum number of queued jobs.
+    """
+
+    def __init__(self, config, num_workers: int = 2, max_pending: int = 8):
+        """
+        Initializes the AnalysisService.
+
+        Args:
+            config: Config object shared by all workers.
+            num_workers: Number of worker processes.
+            max_pending: Maximum number of queued (not yet running) jobs.
+        """
+        self.config = replace(config, show_window=False, output_video_path=None)
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self._context = multiprocessing.get_context('spawn')
+        self._result_queue = self._context.Queue()
+        self._workers: list[_Worker] = []
+        self._jobs: dict[str, AnalysisJob] = {}
+        self._pending: deque[str] = deque()
+        self._lock = threading.Condition()
+        self._ids = itertools.count(1)
+        self._running = False
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def _worker_config(self, worker_id: int):
+        return replace(
+            self.config, cpu_process_index=worker_id, cpu_process_count=self.num_workers
+        )
+
+    def start(self) -> "AnalysisService":
+        """Starts the worker processes and the dispatcher thread."""
+        self._workers = [
+            _Worker(worker_id, self._context, self._worker_config(worker_id), self._result_queue)
+            for worker_id in range(self.num_workers)
+        ]
+        self._running = True
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every worker has loaded its models.
+
+        Returns:
+            False if timeout passed or a worker exited while loading.
+        """
+        def settled() -> bool:
+            return all(
+                worker.ready or not worker.process.is_alive()
+                for worker in self._workers
+            )
+
+        with self._lock:
+            self._lock.wait_for(settled, timeout)
+            return all(worker.ready for worker in self._workers)
+
+    def submit(self, video_path: str) -> AnalysisJob:
+        """
+        Queues a video for analysis.
+
+        Args:
+            video_path: Path of the video file, as seen by the workers.
+
+        Returns:
+            The queued AnalysisJob.
+
+        Raises:
+            ServiceBusy: If max_pending jobs are already queued.
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                raise ServiceBusy(f"{len(self._pending)} jobs already queued")
+            job = AnalysisJob(job_id=str(next(self._ids)), video_path=video_path)
+            self._jobs[job.job_id] = job
+            self._pending.append(job.job_id)
+            self._assign_jobs()
+            return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """Returns the job with job_id, or None if unknown."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[AnalysisJob]:
+        """
+        Blocks until the job finishes or timeout seconds pass.
+
+        Returns:
+            The job (possibly still unfinished), or None if unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._lock.wait_for(lambda: job.finished, timeout)
+            return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels a queued or running job.
+
+        Returns:
+            False if the job is unknown or already finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            if job_id in self._pending:
+                self._pending.remove(job_id)
+                self._finish(job, CANCELLED)
+                return True
+            # Assigned: the worker may not have reported 'started' yet, but it
+            # checks the event from the first frame on
+            for worker in self._workers:
+                if worker.job_id == job_id:
+                    worker.cancel_event.set()
+            return True
+
+    def stats(self) -> dict[str, Any]:
+        """Returns queue depth, worker state and job timing aggregates."""
+        with self._lock:
+            done = [job for job in self._jobs.values() if job.status == DONE]
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'workers': [
+                    {
+                        'worker_id': worker.worker_id,
+                        'ready': worker.ready,
+                        'job_id': worker.job_id,
+                        'startup_ms': worker.startup_ms,
+                    }
+                    for worker in self._workers
+                ],
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'jobs': counts,
+                'run_ms_mean': (
+                    sum(job.run_ms for job in done) / len(done) if done else None
+                ),
+                'queue_ms_mean': (
+                    sum(job.queue_ms for job in done) / len(done) if done else None
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Cancels running jobs and stops the workers and the dispatcher."""
+        with self._lock:
+            self._running = False
+            for job_id in list(self._pending):
+                self._finish(self._jobs[job_id], CANCELLED)
+            self._pending.clear()
+            for worker in self._workers:
+                worker.cancel_event.set()
+                worker.task_queue.put(None)
+        for worker in self._workers:
+            worker.process.join(timeout=5.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._dispatcher is not None:
+            self._dispatcher.join(timeout=5.0)
+
+    def _finish(self, job: AnalysisJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._lock.notify_all()
+
+    def _assign_jobs(self) -> None:
+        """Hands queued jobs to idle ready workers; called with the lock held."""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.ready and worker.job_id is None:
+                job = self._jobs[self._pending.popleft()]
+                worker.job_id = job.job_id
+                job.worker_id = worker.worker_id
+                worker.cancel_event.clear()
+                worker.task_queue.put((job.job_id, job.video_path))
+
+    def _handle_message(self, message: tuple) -> None:
+        kind, worker_id = message[0], message[1]
+        worker = self._workers[worker_id]
+        if kind == 'ready':
+            worker.ready = True
+            worker.startup_ms = message[2]
+            self._lock.notify_all()
+            return
+        job = self._jobs[message[2]]
+        if kind == 'started':
+            job.status = RUNNING
+            job.worker_id = worker_id
+            job.started_at = time.time()
+            return
+        worker.job_id = None
+        if kind == 'done':
+            job.run_ms, job.frames, job.perception, job.summary = message[3:]
+            self._finish(job, DONE)
+        elif kind == 'cancelled':
+            job.run_ms = message[3]
+            self._finish(job, CANCELLED)
+        else:
+            job.error = message[3]
+            self._finish(job, FAILED)
+
+    def _replace_dead_workers(self) -> None:
+        for index, worker in enumerate(self._workers):
+            # A worker that dies before loading its models (bad model path,
+            # missing dependency) would die again; it is left down instead
+            if worker.process.is_alive() or not worker.ready:
+                continue
+            if worker.job_id is not None:
+                job = self._jobs[worker.job_id]
+                job.error = f"worker exited with code {worker.process.exitcode}"
+                self._finish(job, FAILED)
+            self._workers[index] = _Worker(
+                worker.worker_id, self._context,
+                self._worker_config(worker.worker_id), self._result_queue
+            )
+
+    def _dispatch_loop(self) -> None:
+        while self._running:
+            try:
+                message = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                message = None
+            with self._lock:
+                if not self._running:
+                    break
+                if message is not None:
+                    self._handle_message(message)
+                else:
+                    self._replace_dead_workers()
+                    self._lock.notify_all()
+                self._assign_jobs()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.shutdown()
@@ -0,0 +1,176 @@
+"""HTTP API module exposing the analysis service over TCP or a Unix socket."""
+
+import json
+import math
+import os
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from config import Config
+from service.analysis_service import AnalysisService, ServiceBusy
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON request handler for AnalysisService.
+
+    Endpoints:
+        POST /analyze {"video_path": ...}: run a job and return its
+            SessionSummary (503 when the queue is full, 504 and the job
+            cancelled when it takes longer than analyze_timeout seconds).
+        POST /jobs {"video_path": ...}: queue a job, returns 202 and the job.
+        GET /jobs/<id>[?wait=<seconds>]: job status, timing and summary.
+        DELETE /jobs/<id>: cancel a queued or running job.
+        GET /stats: queue depth, worker state and timing aggregates.
+    """
+
+    service: AnalysisService
+    analyze_timeout: Optional[float] = None
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_video_path(self) -> Optional[str]:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return None
+        video_path = body.get('video_path') if isinstance(body, dict) else None
+        return video_path if isinstance(video_path, str) else None
+
+    def _submit(self):
+        video_path = self._read_video_path()
+        if video_path is None:
+            self._send_json(400, {'error': 'expected JSON body with "video_path"'})
+            return None
+        if not os.path.exists(video_path):
+            self._send_json(404, {'error': f'no such file: {video_path}'})
+            return None
+        try:
+            return self.service.submit(video_path)
+        except ServiceBusy as error:
+            self._send_json(503, {'error': str(error)}, headers={'Retry-After': '1'})
+            return None
+
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        if path not in ('/jobs', '/analyze'):
+            self._send_json(404, {'error': 'not found'})
+            return
+        job = self._submit()
+        if job is None:
+            return
+        if path == '/jobs':
+            self._send_json(202, job.to_dict())
+            return
+        job = self.service.wait(job.job_id, timeout=self.analyze_timeout)
+        if not job.finished:
+            self.service.cancel(job.job_id)
+            self._send_json(504, {
+                'error': f'job {job.job_id} did not finish within '
+                         f'{self.analyze_timeout}s and was cancelled'
+            })
+            return
+        if job.summary is None:
+            self._send_json(500, job.to_dict())
+            return
+        self._send_json(200, job.summary)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            self._send_json(200, self.service.stats())
+            return
+        if not url.path.startswith('/jobs/'):
+            self._send_json(404, {'error': 'not found'})
+            return
+        job_id = url.path[len('/jobs/'):]
+        wait = parse_qs(url.query).get('wait')
+        if wait:
+            try:
+                timeout = float(wait[0])
+            except ValueError:
+                timeout = math.nan
+            if not math.isfinite(timeout) or timeout < 0:
+                self._send_json(400, {'error': f'wait must be a number of seconds, got {wait[0]!r}'})
+                return
+            job = self.service.wait(job_id, timeout=timeout)
+        else:
+            job = self.service.get(job_id)
+        if job is None:
+            self._send_json(404, {'error': f'unknown job {job_id}'})
+            return
+        self._send_json(200, job.to_dict())
+
+    def do_DELETE(self) -> None:
+        path = urlparse(self.path).path
+        if not path.startswith('/jobs/'):
+            self._send_json(404, {'error': 'not found'})
+            return
+        job_id = path[len('/jobs/'):]
+        if not self.service.cancel(job_id):
+            self._send_json(409, {'error': f'job {job_id} is unknown or finished'})
+            return
+        self._send_json(202, self.service.get(job_id).to_dict(include_summary=False))
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return 'unix'
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(service: AnalysisService, config: Config) -> socketserver.BaseServer:
+    """
+    Creates the HTTP server for a started AnalysisService.
+
+    Listens on config.service_unix_socket when set, otherwise on
+    config.service_host:config.service_port. POST /analyze gives up after
+    config.service_analyze_timeout_s.
+    """
+    handler = type('BoundAnalysisRequestHandler', (AnalysisRequestHandler,), {
+        'service': service,
+        'analyze_timeout': config.service_analyze_timeout_s,
+    })
+    if config.service_unix_socket is not None:
+        if os.path.exists(config.service_unix_socket):
+            os.unlink(config.service_unix_socket)
+        return _ThreadingUnixHTTPServer(config.service_unix_socket, handler)
+    return ThreadingHTTPServer((config.service_host, config.service_port), handler)
+
+
+def main() -> None:
+    """Entry point: starts the worker pool and serves until interrupted."""
+    config = Config()
+    with AnalysisService(
+        config,
+        num_workers=config.service_workers,
+        max_pending=config.service_max_pending
+    ) as service:
+        server = create_server(service, config)
+        address = config.service_unix_socket or f"http://{config.service_host}:{config.service_port}"
+        print(f"Analysis service listening on {address} with {config.service_workers} workers")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
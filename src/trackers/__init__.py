@@ -1,5 +1,7 @@
 """Trackers package for ball tracking."""
 
 from .ball_tracker import BallTracker
+from .multi_ball_tracker import BallTrack, MultiBallTracker
+from .player_tracker import PlayerTrack, PlayerTracker
 
-__all__ = ['BallTracker']
+__all__ = ['BallTracker', 'BallTrack', 'MultiBallTracker', 'PlayerTrack', 'PlayerTracker']
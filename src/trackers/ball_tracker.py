@@ -1,28 +1,59 @@
-"""Ball tracker module using OpenCV TrackerCSRT."""
+"""Ball tracker module using OpenCV legacy trackers (CSRT by default)."""
 
 import cv2
 import numpy as np
 from typing import Optional
 
+# Ordered from most accurate to fastest
+TRACKER_FACTORIES = {
+    'csrt': lambda: cv2.legacy.TrackerCSRT_create(),
+    'kcf': lambda: cv2.legacy.TrackerKCF_create(),
+    'mosse': lambda: cv2.legacy.TrackerMOSSE_create(),
+}
+
 
 class BallTracker:
     """
     Ball tracker using OpenCV TrackerCSRT for basketball tracking.
     
     This class wraps the OpenCV TrackerCSRT to track a basketball
-    across video frames after initial detection.
+    across video frames after initial detection. KCF and MOSSE trade
+    accuracy for speed; a backend change takes effect at the next
+    initialize().
     
     Attributes:
-        tracker: OpenCV TrackerCSRT instance, or None if not initialized.
+        tracker: OpenCV tracker instance, or None if not initialized.
         tracking_active: Boolean indicating if tracking is currently active.
+        backend: Tracker backend, a key of TRACKER_FACTORIES.
     """
     
-    def __init__(self):
-        """Initializes the BallTracker."""
+    def __init__(self, backend: str = 'csrt'):
+        """
+        Initializes the BallTracker.
+        
+        Args:
+            backend: 'csrt', 'kcf' or 'mosse'.
+        
+        Raises:
+            ValueError: If backend is unknown.
+        """
+        self.backend = backend
         self.tracker: Optional[cv2.legacy.Tracker] = None
         self.tracking_active: bool = False
         self.last_bbox: Optional[tuple[int, int, int, int]] = None
     
+    @property
+    def backend(self) -> str:
+        return self._backend
+    
+    @backend.setter
+    def backend(self, backend: str) -> None:
+        if backend not in TRACKER_FACTORIES:
+            raise ValueError(
+                f"Unknown tracker backend {backend!r}; expected one of {list(TRACKER_FACTORIES)}"
+            )
+        self._backend = backend
+    
     def initialize(self, frame: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
         """
         Initializes the tracker with a frame and bounding box.
@@ -31,7 +62,7 @@ class BallTracker:
             frame: Video frame as numpy array (BGR format).
             bbox: Tuple of (x, y, w, h) bounding box coordinates.
         """
-        self.tracker = cv2.legacy.TrackerCSRT_create()
+        self.tracker = TRACKER_FACTORIES[self.backend]()
         self.tracker.init(frame, bbox)
         self.tracking_active = True
         self.last_bbox = bbox
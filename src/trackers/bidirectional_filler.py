@@ -0,0 +1,186 @@
+"""Bidirectional gap filler module tracking between sparse detection anchors."""
+
+from typing import Optional
+
+import numpy as np
+
+from trackers.ball_tracker import BallTracker
+from utils.video_utils import bbox_area_ratio, bbox_center, bbox_orange_ratio
+
+
+class BidirectionalGapFiller:
+    """
+    Fills the frames between two detection anchors by tracking both ways.
+
+    Frames after an anchor are tracked forward as they arrive and buffered.
+    When the next anchor arrives, the segment is resolved: if the forward
+    track covered every frame and ends near the new anchor, it is used as
+    is. Otherwise the buffered frames are tracked backward from the new
+    anchor and both tracks are reconciled per frame. Where they agree their
+    centers are blended, weighted by the distance to each anchor; where they
+    disagree the track started from the nearer anchor wins; where only one
+    exists it is used.
+
+    Attributes:
+        config: Configuration object with validation bounds.
+        tracker_backend: BallTracker backend of the forward and backward
+            trackers.
+        agreement_distance: Maximum pixel distance between forward and
+            backward centers that counts as agreement.
+        disagreements: Frames where forward and backward tracks disagreed.
+        backward_passes: Segments that needed a backward pass.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the BidirectionalGapFiller.
+
+        Args:
+            config: Config object containing validation bounds,
+                tracker_backend and offline_agreement_distance.
+        """
+        self.config = config
+        self.tracker_backend = config.tracker_backend
+        self.agreement_distance = config.offline_agreement_distance
+        self.disagreements = 0
+        self.backward_passes = 0
+        self._forward = BallTracker(self.tracker_backend)
+        self._masked_frames: list[np.ndarray] = []
+        self._forward_bboxes: list[Optional[tuple[int, int, int, int]]] = []
+
+    def _passes_checks(
+        self,
+        masked_frame: np.ndarray,
+        bbox: tuple[int, int, int, int]
+    ) -> bool:
+        area_ratio = bbox_area_ratio(bbox, masked_frame.shape)
+        if (
+            area_ratio < self.config.min_ball_area_ratio or
+            area_ratio > self.config.max_ball_area_ratio
+        ):
+            return False
+        return bbox_orange_ratio(masked_frame, bbox) >= self.config.min_orange_ratio
+
+    def _track(
+        self,
+        tracker: BallTracker,
+        masked_frame: np.ndarray
+    ) -> Optional[tuple[int, int, int, int]]:
+        bbox = tracker.update(masked_frame)
+        if bbox and not self._passes_checks(masked_frame, bbox):
+            bbox = None
+        if bbox is None:
+            tracker.reset()
+        return bbox
+
+    def start_segment(
+        self,
+        masked_frame: np.ndarray,
+        anchor_bbox: Optional[tuple[int, int, int, int]]
+    ) -> None:
+        """Starts forward tracking from an anchor frame (no-op without a ball)."""
+        if anchor_bbox is None:
+            self._forward.reset()
+        else:
+            self._forward.initialize(masked_frame, anchor_bbox)
+
+    def push(self, masked_frame: np.ndarray) -> None:
+        """Tracks a frame between anchors forward and buffers it."""
+        bbox = None
+        if self._forward.is_active():
+            bbox = self._track(self._forward, masked_frame)
+        self._masked_frames.append(masked_frame.copy())
+        self._forward_bboxes.append(bbox)
+
+    def close_segment(
+        self,
+        masked_frame: np.ndarray,
+        anchor_bbox: Optional[tuple[int, int, int, int]]
+    ) -> list[Optional[tuple[int, int]]]:
+        """
+        Resolves the buffered frames against the next anchor and starts a
+        new segment from it.
+
+        Args:
+            masked_frame: Orange-masked anchor frame.
+            anchor_bbox: Ball detected on the anchor frame, if any.
+
+        Returns:
+            Ball center (or None) for every frame pushed since the last anchor.
+        """
+        forward = [bbox_center(bbox) if bbox else None for bbox in self._forward_bboxes]
+        if forward and anchor_bbox is not None and not self._forward_reaches(
+            masked_frame, anchor_bbox
+        ):
+            centers = self._reconcile(forward, self._track_backward(masked_frame, anchor_bbox))
+        else:
+            centers = forward
+        self._masked_frames = []
+        self._forward_bboxes = []
+        self.start_segment(masked_frame, anchor_bbox)
+        return centers
+
+    def flush(self) -> list[Optional[tuple[int, int]]]:
+        """Resolves frames after the last anchor from the forward track only."""
+        centers = [bbox_center(bbox) if bbox else None for bbox in self._forward_bboxes]
+        self._masked_frames = []
+        self._forward_bboxes = []
+        self._forward.reset()
+        return centers
+
+    def _forward_reaches(
+        self,
+        masked_frame: np.ndarray,
+        anchor_bbox: tuple[int, int, int, int]
+    ) -> bool:
+        """Checks whether the forward track covered the segment and lands on the anchor."""
+        if None in self._forward_bboxes or not self._forward.is_active():
+            return False
+        bbox = self._track(self._forward, masked_frame)
+        if bbox is None:
+            return False
+        center = bbox_center(bbox)
+        anchor_center = bbox_center(anchor_bbox)
+        dx = center[0] - anchor_center[0]
+        dy = center[1] - anchor_center[1]
+        return (dx ** 2 + dy ** 2) ** 0.5 <= self.agreement_distance
+
+    def _track_backward(
+        self,
+        masked_frame: np.ndarray,
+        anchor_bbox: tuple[int, int, int, int]
+    ) -> list[Optional[tuple[int, int]]]:
+        self.backward_passes += 1
+        backward: list[Optional[tuple[int, int]]] = [None] * len(self._masked_frames)
+        tracker = BallTracker(self.tracker_backend)
+        tracker.initialize(masked_frame, anchor_bbox)
+        for idx in range(len(self._masked_frames) - 1, -1, -1):
+            bbox = self._track(tracker, self._masked_frames[idx])
+            if bbox is None:
+                break
+            backward[idx] = bbox_center(bbox)
+        return backward
+
+    def _reconcile(
+        self,
+        forward: list[Optional[tuple[int, int]]],
+        backward: list[Optional[tuple[int, int]]]
+    ) -> list[Optional[tuple[int, int]]]:
+        count = len(forward)
+        centers = []
+        for idx, (f, b) in enumerate(zip(forward, backward)):
+            if f is None or b is None:
+                centers.append(f or b)
+                continue
+            # Relative position between the previous (0) and next (1) anchor
+            t = (idx + 1) / (count + 1)
+            distance = ((f[0] - b[0]) ** 2 + (f[1] - b[1]) ** 2) ** 0.5
+            if distance <= self.agreement_distance:
+                centers.append((
+                    int(round((1 - t) * f[0] + t * b[0])),
+                    int(round((1 - t) * f[1] + t * b[1]))
+                ))
+            else:
+                self.disagreements += 1
+                centers.append(f if t <= 0.5 else b)
+        return centers
@@ -0,0 +1,155 @@
+"""Multi-ball tracker module following several balls with one tracker each."""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from trackers.ball_tracker import BallTracker
+from utils.video_utils import bbox_center, match_nearest
+
+
+@dataclass
+class BallTrack:
+    """
+    One ball followed across frames.
+
+    Attributes:
+        track_id: Identifier, stable while the ball is followed.
+        tracker: Tracker following the ball between detections.
+        bbox: Bounding box in the current frame, or None when missed.
+        center: Last known ball center.
+        missed_frames: Consecutive frames without a bounding box.
+        wrist_costs: Smoothed ball-to-nearest-wrist distance per player id.
+        owner: Player id the ball is currently assigned to.
+    """
+
+    track_id: int
+    tracker: BallTracker
+    bbox: Optional[tuple[int, int, int, int]]
+    center: tuple[int, int]
+    missed_frames: int = 0
+    wrist_costs: dict[int, float] = field(default_factory=dict)
+    owner: Optional[int] = None
+
+
+class MultiBallTracker:
+    """
+    Tracks several balls at once.
+
+    On detection frames, validated detections are matched to existing
+    tracks by nearest center; matched tracks are re-initialized on the
+    detection, unmatched detections start new tracks. Between detections
+    every track is advanced by its own tracker. A track that misses
+    more than max_missed_frames consecutive frames is dropped.
+
+    Attributes:
+        max_balls: Maximum number of simultaneous tracks.
+        match_distance: Maximum pixel distance between a track and a detection.
+        max_missed_frames: Missed frames before a track is dropped.
+        tracker_backend: BallTracker backend of new tracks.
+        tracks: Current tracks, visible or missed.
+    """
+
+    def __init__(
+        self,
+        max_balls: int = 4,
+        match_distance: float = 120.0,
+        max_missed_frames: int = 15,
+        tracker_backend: str = 'csrt'
+    ):
+        """
+        Initializes the MultiBallTracker.
+
+        Args:
+            max_balls: Maximum number of simultaneous tracks.
+            match_distance: Maximum pixel distance between a track and a detection.
+            max_missed_frames: Missed frames before a track is dropped.
+            tracker_backend: 'csrt', 'kcf' or 'mosse', as for BallTracker.
+        """
+        self.max_balls = max_balls
+        self.match_distance = match_distance
+        self.max_missed_frames = max_missed_frames
+        self.tracker_backend = tracker_backend
+        self.tracks: list[BallTrack] = []
+        self._ids = itertools.count()
+
+    def needs_detection(self) -> bool:
+        """Returns True when no ball is tracked or a track is currently missed."""
+        return not self.tracks or any(track.missed_frames for track in self.tracks)
+
+    def update(
+        self,
+        masked_frame: np.ndarray,
+        detections: Optional[list[tuple[int, int, int, int]]],
+        passes_checks: Callable[[tuple[int, int, int, int]], bool]
+    ) -> list[BallTrack]:
+        """
+        Advances all tracks by one frame.
+
+        Args:
+            masked_frame: Orange-masked frame the trackers run on.
+            detections: Validated detection bboxes on detection frames,
+                None on tracking-only frames.
+            passes_checks: Validates tracker bboxes (area and orange ratio).
+
+        Returns:
+            Tracks with a bounding box in this frame.
+        """
+        matched: set[int] = set()
+        if detections:
+            pairs = match_nearest(
+                [track.center for track in self.tracks],
+                [bbox_center(bbox) for bbox in detections],
+                self.match_distance
+            )
+            for track_idx, detection_idx in pairs:
+                self._set_bbox(self.tracks[track_idx], masked_frame, detections[detection_idx])
+                matched.add(track_idx)
+            new_detections = set(range(len(detections))) - {j for _, j in pairs}
+        else:
+            new_detections = set()
+
+        for idx, track in enumerate(self.tracks):
+            if idx in matched:
+                continue
+            bbox = track.tracker.update(masked_frame)
+            if bbox and not passes_checks(bbox):
+                track.tracker.reset()
+                bbox = None
+            track.bbox = bbox
+            if bbox:
+                track.center = bbox_center(bbox)
+                track.missed_frames = 0
+            else:
+                track.missed_frames += 1
+
+        for detection_idx in sorted(new_detections):
+            if len(self.tracks) >= self.max_balls:
+                break
+            track = BallTrack(
+                track_id=next(self._ids),
+                tracker=BallTracker(self.tracker_backend),
+                bbox=None,
+                center=bbox_center(detections[detection_idx])
+            )
+            self._set_bbox(track, masked_frame, detections[detection_idx])
+            self.tracks.append(track)
+
+        self.tracks = [
+            track for track in self.tracks
+            if track.missed_frames <= self.max_missed_frames
+        ]
+        return [track for track in self.tracks if track.bbox is not None]
+
+    @staticmethod
+    def _set_bbox(
+        track: BallTrack,
+        masked_frame: np.ndarray,
+        bbox: tuple[int, int, int, int]
+    ) -> None:
+        track.tracker.initialize(masked_frame, bbox)
+        track.bbox = bbox
+        track.center = bbox_center(bbox)
+        track.missed_frames = 0
@@ -0,0 +1,165 @@
+"""Player tracker module keeping pose identities and assigning balls to players."""
+
+import itertools
+from dataclasses import dataclass
+from typing import Optional
+
+from trackers.multi_ball_tracker import BallTrack
+from utils.video_utils import match_nearest
+
+
+@dataclass
+class PlayerTrack:
+    """
+    One player followed across frames.
+
+    Attributes:
+        player_id: Identifier, stable while the player is followed.
+        pose: Landmarks in the current frame, or None when missed.
+        hip_center: Last known hip center, used for matching.
+        missed_frames: Consecutive frames without a pose.
+    """
+
+    player_id: int
+    pose: Optional[dict[str, tuple[int, int]]]
+    hip_center: tuple[int, int]
+    missed_frames: int = 0
+
+
+class PlayerTracker:
+    """
+    Keeps player identities across frames and assigns balls to players.
+
+    PoseLandmarker returns poses in no particular order, so each frame's
+    poses are matched to the players of the previous frames by nearest hip
+    center. A ball belongs to the player whose nearest wrist has stayed
+    closest to it: per ball and player the wrist distance is smoothed
+    exponentially, so a pass or a defender reaching in does not flip the
+    assignment for a single frame.
+
+    Attributes:
+        max_players: Maximum number of simultaneous players.
+        match_distance: Maximum hip center movement between frames, in pixels.
+        max_missed_frames: Missed frames before a player is dropped.
+        smoothing: Weight of the previous smoothed distance (0 uses only the
+            current frame).
+        players: Current players, visible or missed.
+    """
+
+    def __init__(
+        self,
+        max_players: int = 2,
+        match_distance: float = 120.0,
+        max_missed_frames: int = 15,
+        smoothing: float = 0.8
+    ):
+        """
+        Initializes the PlayerTracker.
+
+        Args:
+            max_players: Maximum number of simultaneous players.
+            match_distance: Maximum hip center movement between frames, in pixels.
+            max_missed_frames: Missed frames before a player is dropped.
+            smoothing: Weight of the previous smoothed wrist distance.
+        """
+        self.max_players = max_players
+        self.match_distance = match_distance
+        self.max_missed_frames = max_missed_frames
+        self.smoothing = smoothing
+        self.players: list[PlayerTrack] = []
+        self._ids = itertools.count()
+
+    def update(self, poses: list[dict[str, tuple[int, int]]]) -> list[PlayerTrack]:
+        """
+        Matches this frame's poses to players.
+
+        Args:
+            poses: Output of PoseDetector.detect_all().
+
+        Returns:
+            All current players; missed players have pose None.
+        """
+        poses = [pose for pose in poses if pose.get('hip_center')]
+        pairs = match_nearest(
+            [player.hip_center for player in self.players],
+            [pose['hip_center'] for pose in poses],
+            self.match_distance
+        )
+        matched = {player_idx: pose_idx for player_idx, pose_idx in pairs}
+
+        for idx, player in enumerate(self.players):
+            if idx in matched:
+                player.pose = poses[matched[idx]]
+                player.hip_center = player.pose['hip_center']
+                player.missed_frames = 0
+            else:
+                player.pose = None
+                player.missed_frames += 1
+
+        for pose_idx in sorted(set(range(len(poses))) - set(matched.values())):
+            if len(self.players) >= self.max_players:
+                break
+            pose = poses[pose_idx]
+            self.players.append(
+                PlayerTrack(player_id=next(self._ids), pose=pose, hip_center=pose['hip_center'])
+            )
+
+        self.players = [
+            player for player in self.players
+            if player.missed_frames <= self.max_missed_frames
+        ]
+        return self.players
+
+    @staticmethod
+    def _wrist_distance(
+        ball_center: tuple[int, int],
+        pose: dict[str, tuple[int, int]]
+    ) -> Optional[float]:
+        distances = [
+            ((ball_center[0] - wrist[0]) ** 2 + (ball_center[1] - wrist[1]) ** 2) ** 0.5
+            for wrist in (pose.get('left_wrist'), pose.get('right_wrist'))
+            if wrist is not None
+        ]
+        return min(distances) if distances else None
+
+    def assign_balls(self, balls: list[BallTrack]) -> dict[int, tuple[int, int]]:
+        """
+        Updates ball ownership and returns each player's ball for this frame.
+
+        Args:
+            balls: Visible ball tracks of this frame.
+
+        Returns:
+            Mapping of player_id to the center of the ball assigned to that
+            player; when several balls are assigned to one player, the one
+            with the smallest smoothed wrist distance is used.
+        """
+        player_ids = {player.player_id for player in self.players}
+        assignments: dict[int, tuple[int, int]] = {}
+        best_costs: dict[int, float] = {}
+
+        for ball in balls:
+            for player_id in list(ball.wrist_costs):
+                if player_id not in player_ids:
+                    del ball.wrist_costs[player_id]
+            for player in self.players:
+                if player.pose is None:
+                    continue
+                distance = self._wrist_distance(ball.center, player.pose)
+                if distance is None:
+                    continue
+                previous = ball.wrist_costs.get(player.player_id)
+                ball.wrist_costs[player.player_id] = (
+                    distance if previous is None
+                    else self.smoothing * previous + (1 - self.smoothing) * distance
+                )
+            if not ball.wrist_costs:
+                ball.owner = None
+                continue
+            ball.owner = min(ball.wrist_costs, key=ball.wrist_costs.get)
+            cost = ball.wrist_costs[ball.owner]
+            if cost < best_costs.get(ball.owner, float('inf')):
+                best_costs[ball.owner] = cost
+                assignments[ball.owner] = ball.center
+
+        return assignments
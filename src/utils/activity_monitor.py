@@ -0,0 +1,110 @@
+"""Activity monitor module detecting idle stretches between drills."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class ActivityMonitor:
+    """
+    Two-state (active / idle) detector driven by cheap per-frame features.
+
+    A frame counts as active when its motion energy reaches
+    idle_motion_ratio and the orange mask covers at least
+    idle_min_orange_ratio of the frame: a moving scene without a ball
+    (walking off) and a ball lying still (rest) are both inactive. Motion
+    energy is the fraction of grayscale thumbnail pixels that changed by
+    more than idle_pixel_diff since the previous measured thumbnail; a
+    mean difference would let a small moving ball drown in the static
+    background.
+
+    After idle_enter_frames consecutive inactive frames the monitor turns
+    idle. While idle, only every idle_probe_every_n_frames-th frame is
+    measured; the first active probe turns the monitor active again.
+
+    Attributes:
+        config: Configuration object with the idle_* settings.
+        idle: Whether the monitor is in the idle state.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the ActivityMonitor.
+
+        Args:
+            config: Config object containing the idle_* settings.
+        """
+        self.config = config
+        self.idle = False
+        self._inactive_frames = 0
+        self._frames_since_probe = 0
+        self._reference: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+
+    def probe_due(self) -> bool:
+        """
+        Returns True when the current frame should be measured.
+
+        Always True while active; while idle, True once every
+        idle_probe_every_n_frames calls.
+        """
+        if not self.idle:
+            return True
+        self._frames_since_probe += 1
+        if self._frames_since_probe >= self.config.idle_probe_every_n_frames:
+            self._frames_since_probe = 0
+            return True
+        return False
+
+    def motion_energy(self, thumbnail: np.ndarray) -> Optional[float]:
+        """
+        Returns the fraction of pixels changed since the previous measured thumbnail.
+
+        The thumbnail becomes the reference for the next measurement.
+
+        Returns:
+            Changed-pixel fraction (0-1), or None for the first measurement
+            or after a frame size change.
+        """
+        energy = None
+        if self._reference is not None and self._reference.shape == thumbnail.shape:
+            cv2.absdiff(thumbnail, self._reference, dst=self._diff)
+            cv2.threshold(
+                self._diff, self.config.idle_pixel_diff, 255, cv2.THRESH_BINARY, dst=self._diff
+            )
+            energy = cv2.countNonZero(self._diff) / self._diff.size
+            np.copyto(self._reference, thumbnail)
+        else:
+            self._reference = thumbnail.copy()
+            self._diff = np.empty_like(thumbnail)
+        return energy
+
+    def update(self, thumbnail: np.ndarray, orange_ratio: float) -> bool:
+        """
+        Measures one frame and advances the state.
+
+        Args:
+            thumbnail: Grayscale thumbnail of the frame.
+            orange_ratio: Fraction of the frame covered by the orange mask.
+
+        Returns:
+            True when the state changed with this frame.
+        """
+        energy = self.motion_energy(thumbnail)
+        active = energy is None or (
+            energy >= self.config.idle_motion_ratio and
+            orange_ratio >= self.config.idle_min_orange_ratio
+        )
+        if self.idle:
+            if not active:
+                return False
+            self.idle = False
+            self._inactive_frames = 0
+        else:
+            self._inactive_frames = 0 if active else self._inactive_frames + 1
+            if self._inactive_frames < self.config.idle_enter_frames:
+                return False
+            self.idle = True
+            self._frames_since_probe = 0
+        return True
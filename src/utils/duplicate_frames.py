@@ -0,0 +1,84 @@
+"""Duplicate frame module detecting repeated frames before any perception work."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class DuplicateFrameDetector:
+    """
+    Detects frames that repeat the last analyzed frame.
+
+    Variable frame rate phone recordings and screen captures repeat frames
+    to fill their nominal rate. Each frame is reduced to a small grayscale
+    fingerprint (INTER_AREA downsampling, so encoder noise averages out)
+    and compared with the fingerprint of the last frame that was not a
+    duplicate. The largest per-pixel difference is used rather than the
+    mean: a small moving ball changes only a few fingerprint pixels, but
+    changes them a lot.
+
+    Comparing against the last analyzed frame rather than the previous one
+    keeps slow changes from accumulating unnoticed over a run of
+    near-duplicates.
+
+    Attributes:
+        max_diff: Largest fingerprint pixel difference (0-255) that still
+            counts as a duplicate.
+        thumbnail_width: Fingerprint width in pixels.
+    """
+
+    def __init__(self, max_diff: float = 2.0, thumbnail_width: int = 160):
+        """
+        Initializes the DuplicateFrameDetector.
+
+        Args:
+            max_diff: Largest fingerprint pixel difference that still counts
+                as a duplicate.
+            thumbnail_width: Fingerprint width in pixels.
+        """
+        self.max_diff = max_diff
+        self.thumbnail_width = thumbnail_width
+        self._small: Optional[np.ndarray] = None
+        self._current: Optional[np.ndarray] = None
+        self._reference: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._source_shape: Optional[tuple[int, int]] = None
+        self._has_reference = False
+
+    def _allocate(self, shape: tuple[int, ...]) -> None:
+        height, width = shape[:2]
+        thumb_width = min(width, self.thumbnail_width)
+        thumb_height = max(1, round(height * thumb_width / width))
+        self._small = np.empty((thumb_height, thumb_width, 3), dtype=np.uint8)
+        self._current = np.empty((thumb_height, thumb_width), dtype=np.uint8)
+        self._reference = np.empty_like(self._current)
+        self._diff = np.empty_like(self._current)
+        self._source_shape = shape[:2]
+        self._has_reference = False
+
+    def reset(self) -> None:
+        """Forgets the reference frame; the next frame is never a duplicate."""
+        self._has_reference = False
+
+    def is_duplicate(self, frame: np.ndarray) -> bool:
+        """
+        Returns True when frame repeats the last analyzed frame.
+
+        Frames that are not duplicates become the new reference.
+
+        Args:
+            frame: Video frame as numpy array (BGR format).
+        """
+        if self._source_shape != frame.shape[:2]:
+            self._allocate(frame.shape)
+        height, width = self._current.shape
+        cv2.resize(frame, (width, height), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._current)
+        if self._has_reference:
+            cv2.absdiff(self._current, self._reference, dst=self._diff)
+            if cv2.minMaxLoc(self._diff)[1] <= self.max_diff:
+                return True
+        self._current, self._reference = self._reference, self._current
+        self._has_reference = True
+        return False
@@ -0,0 +1,102 @@
+"""Frame batch module decoding groups of frames into reused buffers."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from utils.frame_sampler import SampledCapture
+
+
+class FrameBatch:
+    """
+    Preallocated BGR and RGB buffers for a group of decoded frames.
+
+    Frames are decoded straight into the batch slots, and the RGB
+    conversion for the whole group is a single cvtColor call over the
+    stacked slots. Buffers are allocated on the first read and reused until
+    the frame size changes.
+
+    Attributes:
+        batch_size: Maximum frames per batch.
+        bgr: Decoded frames, shape (batch_size, height, width, 3).
+        rgb: RGB conversion of the decoded frames.
+        count: Frames decoded by the last read().
+        frame_indices: Source frame index of each decoded frame.
+        timestamps_ms: Timestamp of each decoded frame.
+    """
+
+    def __init__(self, batch_size: int):
+        """
+        Initializes the FrameBatch.
+
+        Args:
+            batch_size: Maximum frames per batch.
+        """
+        self.batch_size = batch_size
+        self.bgr: Optional[np.ndarray] = None
+        self.rgb: Optional[np.ndarray] = None
+        self.count = 0
+        self.frame_indices: list[int] = []
+        self.timestamps_ms: list[int] = []
+        self._carry: Optional[tuple[np.ndarray, int, int]] = None
+
+    def _allocate(self, shape: tuple[int, ...]) -> None:
+        self.bgr = np.empty((self.batch_size, *shape), dtype=np.uint8)
+        self.rgb = np.empty_like(self.bgr)
+
+    def read(self, cap: SampledCapture) -> int:
+        """
+        Decodes up to batch_size frames into the batch.
+
+        Args:
+            cap: Capture providing the frames with their index and timestamp.
+
+        Returns:
+            Number of frames decoded; fewer than batch_size at the end of
+            the video.
+        """
+        self.count = 0
+        self.frame_indices = []
+        self.timestamps_ms = []
+        if self._carry is not None:
+            frame, frame_index, timestamp_ms = self._carry
+            self._allocate(frame.shape)
+            self.bgr[0] = frame
+            self.frame_indices.append(frame_index)
+            self.timestamps_ms.append(timestamp_ms)
+            self._carry = None
+            self.count = 1
+        while self.count < self.batch_size:
+            if self.bgr is None:
+                success, frame = cap.read()
+                if not success:
+                    break
+                self._allocate(frame.shape)
+                self.bgr[0] = frame
+            else:
+                success, frame = cap.read(self.bgr[self.count])
+                if not success:
+                    break
+                if frame.shape != self.bgr.shape[1:]:
+                    # Resolution changed mid-stream: the frame starts the next batch
+                    self._carry = (frame, cap.frame_index, cap.timestamp_ms)
+                    break
+                if not np.shares_memory(frame, self.bgr):
+                    self.bgr[self.count] = frame
+            self.frame_indices.append(cap.frame_index)
+            self.timestamps_ms.append(cap.timestamp_ms)
+            self.count += 1
+        return self.count
+
+    def convert_rgb(self) -> np.ndarray:
+        """Converts the decoded frames to RGB in one call and returns them."""
+        if self.count == 0:
+            return np.empty((0, 0, 0, 3), dtype=np.uint8)
+        height, width = self.bgr.shape[1:3]
+        cv2.cvtColor(
+            self.bgr[:self.count].reshape(self.count * height, width, 3),
+            cv2.COLOR_BGR2RGB,
+            dst=self.rgb[:self.count].reshape(self.count * height, width, 3)
+        )
+        return self.rgb[:self.count]
@@ -0,0 +1,180 @@
+"""Reusable per-frame buffers for color conversions and masks."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from utils.video_utils import (
+    apply_orange_mask,
+    bbox_integral_ratio,
+    bbox_mask_ratio,
+    mask_integral
+)
+
+
+class FrameBuffers:
+    """
+    Preallocated work buffers shared by all per-frame pipeline stages.
+
+    prepare() converts each frame to HSV, builds the orange mask and the
+    masked BGR frame into buffers that are reused for every frame of the
+    same size. The RGB conversion used by pose detection is done lazily,
+    at most once per frame. Stages read the buffers instead of running
+    their own conversions.
+
+    Orange ratios of bboxes are counted directly on the mask for the first
+    few queries of a frame. Once a frame gets more than integral_after
+    queries (several detection candidates, tracker hypotheses), a
+    summed-area table of the mask is built and every further bbox costs
+    O(1). Building the table costs about as much as a few dozen direct ROI
+    counts, so it only pays off for frames that are queried many times.
+
+    Attributes:
+        hsv: HSV conversion of the current frame.
+        mask: Binary orange mask (0 or 255) of the current frame.
+        masked: Current frame with non-orange pixels zeroed.
+    """
+
+    def __init__(
+        self,
+        lower_hsv: tuple[int, int, int],
+        upper_hsv: tuple[int, int, int],
+        integral_after: int = 8,
+        thumbnail_width: int = 160
+    ):
+        """
+        Initializes the FrameBuffers.
+
+        Args:
+            lower_hsv: Lower HSV bound tuple for orange color.
+            upper_hsv: Upper HSV bound tuple for orange color.
+            integral_after: Orange-ratio queries per frame answered by direct
+                counting before switching to the summed-area table.
+            thumbnail_width: Width of the grayscale thumbnail used for cheap
+                motion measurements.
+        """
+        self.lower_hsv = lower_hsv
+        self.upper_hsv = upper_hsv
+        self.integral_after = integral_after
+        self.thumbnail_width = thumbnail_width
+        self.hsv: Optional[np.ndarray] = None
+        self.mask: Optional[np.ndarray] = None
+        self.masked: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        self._overlay: Optional[np.ndarray] = None
+        self._binary: Optional[np.ndarray] = None
+        self._integral: Optional[np.ndarray] = None
+        self._small: Optional[np.ndarray] = None
+        self._thumbnail: Optional[np.ndarray] = None
+        self._frame: Optional[np.ndarray] = None
+        self._rgb_ready = False
+        self._integral_ready = False
+        self._thumbnail_ready = False
+        self._ratio_queries = 0
+
+    def _allocate(self, shape: tuple[int, ...]) -> None:
+        height, width = shape[:2]
+        self.hsv = np.empty((height, width, 3), dtype=np.uint8)
+        self.mask = np.empty((height, width), dtype=np.uint8)
+        self.masked = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._binary = np.empty((height, width), dtype=np.uint8)
+        self._integral = np.empty((height + 1, width + 1), dtype=np.int32)
+        thumb_width = min(width, self.thumbnail_width)
+        thumb_height = max(1, round(height * thumb_width / width))
+        self._small = np.empty((thumb_height, thumb_width, 3), dtype=np.uint8)
+        self._thumbnail = np.empty((thumb_height, thumb_width), dtype=np.uint8)
+        self._overlay = None
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Computes the HSV image, orange mask and masked frame for a new frame.
+
+        Args:
+            frame: Video frame as numpy array (BGR format).
+
+        Returns:
+            The masked frame buffer.
+        """
+        if self.hsv is None or self.hsv.shape[:2] != frame.shape[:2]:
+            self._allocate(frame.shape)
+        self._frame = frame
+        self._rgb_ready = False
+        self._integral_ready = False
+        self._thumbnail_ready = False
+        self._ratio_queries = 0
+        return apply_orange_mask(
+            frame,
+            self.lower_hsv,
+            self.upper_hsv,
+            hsv=self.hsv,
+            mask=self.mask,
+            dst=self.masked
+        )
+
+    def rgb(self) -> np.ndarray:
+        """
+        Returns the RGB conversion of the current frame, converting once per frame.
+        """
+        if not self._rgb_ready:
+            cv2.cvtColor(self._frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+            self._rgb_ready = True
+        return self._rgb
+
+    def thumbnail(self) -> np.ndarray:
+        """
+        Returns a small grayscale copy of the current frame, computed once per frame.
+
+        Used for cheap motion measurements; its scale relative to the frame
+        is thumbnail_scale().
+        """
+        if not self._thumbnail_ready:
+            height, width = self._thumbnail.shape
+            cv2.resize(
+                self._frame, (width, height), dst=self._small,
+                interpolation=cv2.INTER_AREA
+            )
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._thumbnail)
+            self._thumbnail_ready = True
+        return self._thumbnail
+
+    def thumbnail_scale(self) -> float:
+        """Returns thumbnail width divided by frame width."""
+        return self._thumbnail.shape[1] / self._frame.shape[1]
+
+    def orange_integral(self) -> np.ndarray:
+        """
+        Returns the summed-area table of the orange mask, building it once per frame.
+        """
+        if not self._integral_ready:
+            mask_integral(self.mask, binary=self._binary, integral=self._integral)
+            self._integral_ready = True
+        return self._integral
+
+    def orange_ratio(self, bbox: tuple[int, int, int, int]) -> float:
+        """
+        Returns the ratio of orange pixels inside bbox for the current frame.
+
+        Args:
+            bbox: Tuple of (x, y, w, h) bounding box coordinates.
+        """
+        self._ratio_queries += 1
+        if self._integral_ready or self._ratio_queries > self.integral_after:
+            return bbox_integral_ratio(self.orange_integral(), bbox)
+        return bbox_mask_ratio(self.mask, bbox)
+
+    def overlay(self, owned: bool) -> np.ndarray:
+        """
+        Returns a copy of the current frame to draw annotations on.
+
+        Args:
+            owned: Return a new array the caller may keep (e.g. to hand to a
+                background writer) instead of the reused overlay buffer.
+        """
+        if owned:
+            return self._frame.copy()
+        if self._overlay is None:
+            self._overlay = np.empty_like(self._frame)
+        np.copyto(self._overlay, self._frame)
+        return self._overlay
@@ -0,0 +1,139 @@
+"""Frame sampler module choosing which decoded frames are analyzed."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameSampler:
+    """
+    Temporal subsampling by frame stride and/or target analysis FPS.
+
+    The stride keeps every Nth decoded frame. The target FPS keeps a frame
+    once its timestamp reaches the next due time, so variable frame rate
+    clips are sampled evenly in time rather than in frames. With both set,
+    the target applies to the frames the stride keeps.
+
+    Attributes:
+        stride: Keep every stride-th frame.
+        target_fps: Analysis rate in frames per second, or None.
+    """
+
+    def __init__(self, stride: int = 1, target_fps: Optional[float] = None):
+        """
+        Initializes the FrameSampler.
+
+        Args:
+            stride: Keep every stride-th frame.
+            target_fps: Analysis rate in frames per second, or None.
+        """
+        self.stride = max(1, stride)
+        self.target_fps = target_fps
+        self._next_due_ms: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether any frames are skipped."""
+        return self.stride > 1 or self.target_fps is not None
+
+    def keep(self, frame_index: int, timestamp_ms: float) -> bool:
+        """Decides whether the frame with this index and timestamp is analyzed."""
+        if frame_index % self.stride:
+            return False
+        if self.target_fps is None:
+            return True
+        interval_ms = 1000.0 / self.target_fps
+        if self._next_due_ms is not None and timestamp_ms < self._next_due_ms:
+            return False
+        if self._next_due_ms is None or timestamp_ms - self._next_due_ms >= interval_ms:
+            # First frame, or a gap longer than the interval: restart the schedule
+            self._next_due_ms = timestamp_ms + interval_ms
+        else:
+            self._next_due_ms += interval_ms
+        return True
+
+
+class SampledCapture:
+    """
+    cv2.VideoCapture wrapper that returns only sampled frames.
+
+    Skipped frames are only grabbed, not converted. Every frame keeps its
+    index in the source and its decoder presentation timestamp
+    (CAP_PROP_POS_MSEC); when the decoder reports no usable timestamp
+    (negative or not increasing) the nominal frame_index / fps is used
+    instead.
+
+    Attributes:
+        cap: Wrapped capture.
+        sampler: Sampling decision.
+        fps: Nominal source frame rate.
+        decoder_timestamps: Use CAP_PROP_POS_MSEC timestamps.
+        frame_index: Source index of the last returned frame.
+        timestamp_ms: Timestamp of the last returned frame.
+        frames_decoded: Frames grabbed from the source.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        sampler: FrameSampler,
+        fps: float,
+        decoder_timestamps: bool = True
+    ):
+        """
+        Initializes the SampledCapture.
+
+        Args:
+            cap: Opened capture.
+            sampler: Sampling decision.
+            fps: Nominal source frame rate.
+            decoder_timestamps: Use CAP_PROP_POS_MSEC timestamps.
+        """
+        self.cap = cap
+        self.sampler = sampler
+        self.fps = fps
+        self.decoder_timestamps = decoder_timestamps
+        self.frame_index = -1
+        self.timestamp_ms = 0
+        self.frames_decoded = 0
+        self._last_pts_ms: Optional[float] = None
+        self._last_timestamp_ms = -1
+
+    def _timestamp_ms(self, frame_index: int) -> int:
+        timestamp_ms = None
+        if self.decoder_timestamps:
+            pts_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            usable = (
+                pts_ms > self._last_pts_ms if self._last_pts_ms is not None
+                else pts_ms >= 0
+            )
+            if usable:
+                self._last_pts_ms = pts_ms
+                # Rounded to the microsecond first so 99.99999 does not become 99
+                timestamp_ms = int(round(pts_ms, 3))
+        if timestamp_ms is None:
+            timestamp_ms = max(int(frame_index / self.fps * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def read(self, image: Optional[np.ndarray] = None) -> tuple[bool, Optional[np.ndarray]]:
+        """
+        Grabs frames until the next sampled one and decodes it.
+
+        Args:
+            image: Buffer to decode into, as for cv2.VideoCapture.read().
+
+        Returns:
+            Tuple of (success, frame); success is False at the end of the video.
+        """
+        while self.cap.grab():
+            frame_index = self.frames_decoded
+            self.frames_decoded += 1
+            timestamp_ms = self._timestamp_ms(frame_index)
+            if not self.sampler.keep(frame_index, timestamp_ms):
+                continue
+            self.frame_index = frame_index
+            self.timestamp_ms = timestamp_ms
+            return self.cap.retrieve(image)
+        return False, None
@@ -0,0 +1,190 @@
+"""Live frame source module for camera and network streams."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+
+def parse_live_source(source: str) -> Union[int, str]:
+    """
+    Converts a live source string into a cv2.VideoCapture argument.
+
+    Args:
+        source: Camera index (e.g. "0") or stream URL (rtsp://, http://, ...).
+
+    Returns:
+        Integer camera index, or the URL string unchanged.
+    """
+    return int(source) if source.isdigit() else source
+
+
+@dataclass
+class LiveStats:
+    """
+    Latency and frame-drop counters for a live session.
+
+    Attributes:
+        frames_captured: Frames read from the source by the grabber thread.
+        frames_processed: Frames that went through the full pipeline.
+        frames_dropped_stale: Frames overwritten before the pipeline took them.
+        frames_dropped_late: Frames taken but skipped because they were
+            already older than the latency budget.
+        budget_violations: Processed frames whose end-to-end latency
+            exceeded the budget.
+        latencies_ms: Recent end-to-end latencies (capture to record).
+    """
+
+    frames_captured: int = 0
+    frames_processed: int = 0
+    frames_dropped_stale: int = 0
+    frames_dropped_late: int = 0
+    budget_violations: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    max_samples: int = 1000
+
+    def record_latency(self, latency_ms: float, budget_ms: float) -> None:
+        self.frames_processed += 1
+        if latency_ms > budget_ms:
+            self.budget_violations += 1
+        self.latencies_ms.append(latency_ms)
+        if len(self.latencies_ms) > self.max_samples:
+            self.latencies_ms.pop(0)
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        idx = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def summary_line(self) -> str:
+        median_ms = median(self.latencies_ms) if self.latencies_ms else 0.0
+        return (
+            f"processed={self.frames_processed} captured={self.frames_captured} "
+            f"dropped_stale={self.frames_dropped_stale} "
+            f"dropped_late={self.frames_dropped_late} "
+            f"latency_ms p50={median_ms:.1f} p95={self.latency_percentile(95):.1f} "
+            f"max={max(self.latencies_ms, default=0.0):.1f} "
+            f"over_budget={self.budget_violations}"
+        )
+
+
+class LiveFrameSource:
+    """
+    Latest-frame reader for cameras and RTSP/HTTP streams.
+
+    A background thread reads the source as fast as it delivers frames and
+    keeps only the newest one, so the pipeline always works on the freshest
+    frame and older frames are dropped instead of queueing up latency.
+
+    Attributes:
+        source: Camera index or stream URL passed to cv2.VideoCapture.
+        stats: LiveStats updated with capture and drop counters.
+    """
+
+    def __init__(self, source: Union[int, str], stats: Optional[LiveStats] = None):
+        """
+        Initializes the LiveFrameSource.
+
+        Args:
+            source: Camera index or stream URL.
+            stats: Optional LiveStats instance to update.
+        """
+        self.source = source
+        self.stats = stats or LiveStats()
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._thread: Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+        self._latest: Optional[tuple[np.ndarray, float]] = None
+        self._latest_seq = 0
+        self._taken_seq = 0
+        self._running = False
+
+    def start(self) -> "LiveFrameSource":
+        """
+        Opens the source and starts the grabber thread.
+
+        Returns:
+            The started source.
+
+        Raises:
+            RuntimeError: If the source cannot be opened.
+        """
+        self._cap = cv2.VideoCapture(self.source)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Could not open live source: {self.source}")
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def fps(self) -> float:
+        """Returns the nominal source FPS, or 0.0 when the source does not report it."""
+        if self._cap is None:
+            return 0.0
+        return self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def _grab_loop(self) -> None:
+        while self._running:
+            success, frame = self._cap.read()
+            capture_time = time.monotonic()
+            with self._condition:
+                if not success:
+                    self._running = False
+                    self._condition.notify_all()
+                    break
+                self.stats.frames_captured += 1
+                if self._latest_seq > self._taken_seq:
+                    self.stats.frames_dropped_stale += 1
+                self._latest = (frame, capture_time)
+                self._latest_seq += 1
+                self._condition.notify_all()
+
+    def read(self, timeout: float = 1.0) -> Optional[tuple[np.ndarray, float]]:
+        """
+        Waits for a frame newer than the last one returned.
+
+        Args:
+            timeout: Maximum seconds to wait for a new frame.
+
+        Returns:
+            Tuple of (frame, capture_time) where capture_time is a
+            time.monotonic() value, or None when the source has ended or
+            no frame arrived within the timeout.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._latest_seq > self._taken_seq or not self._running,
+                timeout=timeout
+            )
+            if self._latest_seq <= self._taken_seq:
+                return None
+            self._taken_seq = self._latest_seq
+            return self._latest
+
+    def is_running(self) -> bool:
+        """Returns True while the grabber thread is receiving frames."""
+        return self._running
+
+    def stop(self) -> None:
+        """Stops the grabber thread and releases the source."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
@@ -0,0 +1,62 @@
+"""Perception statistics module for per-session work counters."""
+
+from dataclasses import dataclass, fields
+
+
+@dataclass
+class PerceptionStats:
+    """
+    Counters describing how much perception work a session needed.
+
+    Attributes:
+        frames: Frames that went through _process_frame.
+        duplicate_frames: Frames skipped as repeats of the previous frame,
+            whose record was copied.
+        idle_frames: Frames skipped during idle stretches.
+        idle_periods: Idle stretches entered.
+        detector_calls: Neural ball detector invocations.
+        blob_fast_path_hits: Detection frames resolved from the orange mask
+            alone, without a neural detector call.
+        detector_candidates: Candidates returned by the detector.
+        detector_pixels: Pixels the neural detector was run on (full frames
+            and region crops).
+        proposal_hits: Detection frames resolved inside motion region
+            proposals.
+        proposal_fallbacks: Detection frames whose proposals held no valid
+            ball and fell back to full-frame detection.
+        proposal_pixels_saved: Full-frame detector pixels avoided by
+            proposal hits.
+        tracker_inits: Tracker (re)initializations.
+        detection_reinits: Detections that disagreed with the active tracker.
+        fallback_recoveries: Tracker failures recovered from a runner-up
+            candidate instead of a forced re-detection burst.
+        pose_calls: Pose landmarker invocations.
+        pose_inferred: Frames whose landmarks were inferred by pose gating.
+        ball_lost_frames: Frames without a ball position.
+        offline_backward_passes: Offline segments that needed backward tracking.
+        offline_disagreements: Offline frames where forward and backward
+            tracking disagreed.
+    """
+
+    frames: int = 0
+    duplicate_frames: int = 0
+    idle_frames: int = 0
+    idle_periods: int = 0
+    detector_calls: int = 0
+    blob_fast_path_hits: int = 0
+    detector_candidates: int = 0
+    detector_pixels: int = 0
+    proposal_hits: int = 0
+    proposal_fallbacks: int = 0
+    proposal_pixels_saved: int = 0
+    tracker_inits: int = 0
+    detection_reinits: int = 0
+    fallback_recoveries: int = 0
+    pose_calls: int = 0
+    pose_inferred: int = 0
+    ball_lost_frames: int = 0
+    offline_backward_passes: int = 0
+    offline_disagreements: int = 0
+
+    def summary_line(self) -> str:
+        return " ".join(f"{field.name}={getattr(self, field.name)}" for field in fields(self))
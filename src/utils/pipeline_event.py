@@ -0,0 +1,26 @@
+"""Pipeline event module for streamed analysis results."""
+
+from dataclasses import dataclass
+from typing import Any
+
+FRAME = 'frame'
+CYCLE = 'cycle'
+SUMMARY = 'summary'
+
+
+@dataclass
+class PipelineEvent:
+    """
+    One item yielded by VideoProcessor.stream().
+
+    Attributes:
+        kind: 'frame' (data is the raw frame record dict), 'cycle' (data is
+            a finished Cycle) or 'summary' (data is the SessionSummary,
+            always the last event).
+        frame_index: Index of the newest processed frame when emitted.
+        data: Event payload.
+    """
+
+    kind: str
+    frame_index: int
+    data: Any
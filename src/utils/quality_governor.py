@@ -0,0 +1,254 @@
+"""Quality governor module trading analysis quality for a processing deadline."""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Rough per-frame cost of each tracker relative to CSRT; only ratios are used
+TRACKER_COST = {
+    'csrt': 1.0,
+    'kcf': 0.35,
+    'mosse': 0.1,
+}
+
+
+@dataclass
+class QualityLevel:
+    """
+    One rung of the quality ladder.
+
+    Attributes:
+        name: Level name recorded in the decisions.
+        detect_interval_factor: Multiplier of Config.detect_every_n_frames.
+        analysis_scale: Frame scale the per-frame stages run at.
+        pose_every_n_frames: Pose is measured on every n-th frame and
+            interpolated in between.
+        tracker_backend: Tracker used from the next (re)initialization, or
+            None for Config.tracker_backend.
+    """
+
+    name: str
+    detect_interval_factor: float
+    analysis_scale: float
+    pose_every_n_frames: int
+    tracker_backend: Optional[str]
+
+
+# Ordered from most accurate to cheapest; the governor picks the first level
+# whose predicted frame cost fits the remaining budget, like MODEL_PROFILES
+QUALITY_LEVELS = [
+    QualityLevel('full', 1.0, 1.0, 1, None),
+    QualityLevel('reduced', 1.5, 1.0, 2, None),
+    QualityLevel('fast', 2.0, 0.75, 2, 'kcf'),
+    QualityLevel('fastest', 3.0, 0.5, 3, 'mosse'),
+]
+
+
+class QualityGovernor:
+    """
+    Picks the quality level that finishes a recorded video within a time budget.
+
+    The cost model keeps exponential averages of the cost per call of the
+    ball detector and pose landmarker, of the tracker and orange-mask
+    stages per frame, and of the whole frame (decode and bookkeeping
+    included), all measured live at the current level. A level's frame
+    cost is predicted from them: detection and pose calls scale with how
+    often they run, tracker and mask cost with the analyzed pixel count
+    and the tracker's relative cost, and the remainder stays fixed. These
+    priors miss second-order effects (a cheaper tracker loses the ball
+    more often and triggers more detections), so once a level has run,
+    its measured frame cost replaces the prediction.
+
+    Every governor_check_every_n_frames frames, the time left until
+    quality_budget_s (counted from job start) is spread over the frames
+    left, and the most accurate level whose prediction fits it with
+    governor_margin to spare is chosen; moving to a more accurate level
+    additionally needs governor_upgrade_headroom, so the choice does not
+    flap. Every change is recorded in decisions.
+
+    Attributes:
+        config: Configuration object with the quality_* / governor_* settings.
+        total_frames: Source frames of the video.
+        level: Current quality level.
+        decisions: One entry per level change, including the initial one.
+    """
+
+    def __init__(self, config, total_frames: int, job_start: float):
+        """
+        Initializes the QualityGovernor.
+
+        Args:
+            config: Config object containing the governor settings.
+            total_frames: Source frame count of the video.
+            job_start: time.perf_counter() value the budget counts from.
+        """
+        self.config = config
+        self.total_frames = total_frames
+        self.job_start = job_start
+        self.level = QUALITY_LEVELS[0]
+        self.decisions: list[dict] = []
+        self._call_ms: dict[str, Optional[float]] = {'detect': None, 'pose': None}
+        self._frame_stage_ms = {'track': 0.0, 'mask': 0.0}
+        self._stage_ms = {'track': None, 'mask': None}
+        self._frame_ms: Optional[float] = None
+        self._calls = {'detect': 0, 'pose': 0}
+        self._frames = 0
+        self._frames_analyzed = 0
+        self._frames_total = 0
+        self._last_frame_end: Optional[float] = None
+        self._measured_ms: dict[str, float] = {}
+        self._record(0, None, None)
+
+    def _average(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        alpha = self.config.governor_smoothing
+        return (1 - alpha) * previous + alpha * value
+
+    def detect_every_n_frames(self, level: Optional[QualityLevel] = None) -> int:
+        """Returns the detection interval of a level (default: the current one)."""
+        level = level or self.level
+        return max(1, round(self.config.detect_every_n_frames * level.detect_interval_factor))
+
+    def tracker_backend(self, level: Optional[QualityLevel] = None) -> str:
+        """Returns the tracker backend of a level (default: the current one)."""
+        level = level or self.level
+        return level.tracker_backend or self.config.tracker_backend
+
+    def record_stage(self, stage: str, elapsed_ms: float) -> None:
+        """
+        Adds the time of one stage call to the current frame.
+
+        Args:
+            stage: 'detect', 'pose', 'track' or 'mask'.
+            elapsed_ms: Duration of the call.
+        """
+        if stage in self._call_ms:
+            self._call_ms[stage] = self._average(self._call_ms[stage], elapsed_ms)
+            self._calls[stage] += 1
+        else:
+            self._frame_stage_ms[stage] += elapsed_ms
+
+    def frame_done(self, analyzed: bool = True) -> None:
+        """
+        Closes the current frame's measurements.
+
+        Args:
+            analyzed: Whether the frame ran through perception (False for
+                duplicate and idle frames, which are still timed).
+        """
+        now = time.perf_counter()
+        if self._last_frame_end is not None:
+            self._frame_ms = self._average(
+                self._frame_ms, (now - self._last_frame_end) * 1000
+            )
+        self._last_frame_end = now
+        self._frames += 1
+        self._frames_total += 1
+        if analyzed:
+            self._frames_analyzed += 1
+            for stage, elapsed_ms in self._frame_stage_ms.items():
+                self._stage_ms[stage] = self._average(self._stage_ms[stage], elapsed_ms)
+        self._frame_stage_ms = dict.fromkeys(self._frame_stage_ms, 0.0)
+
+    def predict_frame_ms(self, level: QualityLevel) -> float:
+        """
+        Predicts the average wall time per frame at a level.
+
+        Levels that ran before use their measured frame cost; for the others
+        the call rates and stage costs measured at the current level are
+        scaled to the given one.
+        """
+        if level is not self.level and level.name in self._measured_ms:
+            return self._measured_ms[level.name]
+        frames = max(1, self._frames)
+        current = self.level
+        detect_rate = self._calls['detect'] / frames * (
+            self.detect_every_n_frames(current) / self.detect_every_n_frames(level)
+        )
+        pose_rate = self._calls['pose'] / frames * (
+            current.pose_every_n_frames / level.pose_every_n_frames
+        )
+        analyzed_share = self._frames_analyzed / frames
+        area = (level.analysis_scale / current.analysis_scale) ** 2
+        tracker = (
+            TRACKER_COST[self.tracker_backend(level)] /
+            TRACKER_COST[self.tracker_backend(current)]
+        )
+        detect_ms = (self._call_ms['detect'] or 0.0) * self._calls['detect'] / frames
+        pose_ms = (self._call_ms['pose'] or 0.0) * self._calls['pose'] / frames
+        track_ms = (self._stage_ms['track'] or 0.0) * analyzed_share
+        mask_ms = (self._stage_ms['mask'] or 0.0) * analyzed_share
+        fixed_ms = max(0.0, (self._frame_ms or 0.0) - detect_ms - pose_ms - track_ms - mask_ms)
+        return (
+            fixed_ms +
+            (self._call_ms['detect'] or 0.0) * detect_rate +
+            (self._call_ms['pose'] or 0.0) * pose_rate +
+            track_ms * area * tracker +
+            mask_ms * area
+        )
+
+    def _record(
+        self,
+        frame_index: int,
+        predicted_ms: Optional[float],
+        allowed_ms: Optional[float]
+    ) -> None:
+        self.decisions.append({
+            'frame_index': frame_index,
+            'level': self.level.name,
+            'detect_every_n_frames': self.detect_every_n_frames(),
+            'analysis_scale': self.level.analysis_scale,
+            'pose_every_n_frames': self.level.pose_every_n_frames,
+            'tracker_backend': self.tracker_backend(),
+            'predicted_frame_ms': predicted_ms,
+            'allowed_frame_ms': allowed_ms,
+        })
+
+    def update(self, frame_index: int) -> Optional[QualityLevel]:
+        """
+        Re-plans after a frame, every governor_check_every_n_frames frames.
+
+        Args:
+            frame_index: Source index of the frame just processed.
+
+        Returns:
+            The new level when it changed, else None.
+        """
+        if self._frames_total % self.config.governor_check_every_n_frames:
+            return None
+        self._measured_ms[self.level.name] = self.predict_frame_ms(self.level)
+        # Frames left in the analyzed stream, from the share of source frames
+        # analyzed so far (subsampling skips the rest)
+        source_done = frame_index + 1
+        source_left = max(0, self.total_frames - source_done)
+        frames_left = source_left * self._frames_total / source_done
+        if frames_left < 1:
+            return None
+        elapsed_s = time.perf_counter() - self.job_start
+        remaining_ms = (self.config.quality_budget_s - elapsed_s) * 1000
+        allowed_ms = remaining_ms * (1 - self.config.governor_margin) / frames_left
+
+        current_index = QUALITY_LEVELS.index(self.level)
+        chosen = QUALITY_LEVELS[-1]
+        for index, level in enumerate(QUALITY_LEVELS):
+            limit = allowed_ms
+            if index < current_index:
+                limit *= 1 - self.config.governor_upgrade_headroom
+            if self.predict_frame_ms(level) <= limit:
+                chosen = level
+                break
+        if chosen is self.level:
+            return None
+        predicted_ms = self.predict_frame_ms(chosen)
+        self.level = chosen
+        self._record(frame_index, predicted_ms, allowed_ms)
+        # Rates are re-measured at the new level
+        self._calls = {'detect': 0, 'pose': 0}
+        self._frames = 0
+        self._frames_analyzed = 0
+        print(
+            f"[GOVERNOR] frame={frame_index} level={chosen.name} "
+            f"predicted_ms={predicted_ms:.1f} allowed_ms={allowed_ms:.1f}"
+        )
+        return chosen
@@ -0,0 +1,272 @@
+"""Shared frame ring module passing decoded frames between processes without copies."""
+
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Header fields, followed by the per-slot ready, free and timestamp arrays
+_NUM_SLOTS, _HEIGHT, _WIDTH, _CHANNELS, _END_SEQ, _STOPPED = range(6)
+_HEADER_FIELDS = 6
+_NO_END = np.iinfo(np.int64).max
+
+
+class SharedFrameRing:
+    """
+    Fixed-slot frame ring in a multiprocessing.shared_memory block.
+
+    Frames are identified by sequence numbers (normally the frame index);
+    frame seq lives in slot seq % num_slots. Each slot carries two sequence
+    numbers: ready is the frame currently readable from it, and free is the
+    next frame that may be written to it. A writer of frame seq waits until
+    the slot's free number reaches seq, decodes straight into the slot and
+    publishes it by setting ready; the reader waits for ready, works on the
+    slot as a NumPy view, and releases it by advancing free by num_slots.
+    Since every sequence number has exactly one writer and one reader, the
+    hand-off needs no locks and frames are never copied or pickled.
+
+    The ring is picklable (by block name), so it can be passed to
+    multiprocessing.Process arguments; the receiving process attaches to
+    the same block. Only the creating process unlinks it.
+
+    Attributes:
+        num_slots: Number of frame slots.
+        frame_shape: (height, width, channels) of every frame.
+        name: Shared memory block name.
+    """
+
+    poll_interval = 0.0005
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        Wraps an existing block; use create() or attach() instead.
+
+        Args:
+            shm: Shared memory block holding the header and slots.
+            owner: Whether this process created the block and unlinks it.
+        """
+        self._shm = shm
+        self._owner = owner
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self.num_slots = int(header[_NUM_SLOTS])
+        self.frame_shape = (int(header[_HEIGHT]), int(header[_WIDTH]), int(header[_CHANNELS]))
+        self._header = header
+        counters = np.ndarray(
+            (3, self.num_slots), dtype=np.int64, buffer=shm.buf, offset=header.nbytes
+        )
+        self._ready, self._free, self._timestamps = counters
+        self._slots = np.ndarray(
+            (self.num_slots, *self.frame_shape), dtype=np.uint8, buffer=shm.buf,
+            offset=self._data_offset(self.num_slots)
+        )
+
+    @staticmethod
+    def _data_offset(num_slots: int) -> int:
+        header_bytes = (_HEADER_FIELDS + 3 * num_slots) * 8
+        # Slots start on a cache line boundary
+        return (header_bytes + 63) // 64 * 64
+
+    @classmethod
+    def create(cls, num_slots: int, frame_shape: tuple[int, int, int]) -> "SharedFrameRing":
+        """
+        Allocates a new ring.
+
+        Args:
+            num_slots: Number of frame slots.
+            frame_shape: (height, width, channels) of every frame.
+
+        Returns:
+            The ring, owned by the calling process.
+
+        Raises:
+            ValueError: If num_slots is less than 1.
+        """
+        if num_slots < 1:
+            raise ValueError("num_slots must be at least 1")
+        size = cls._data_offset(num_slots) + num_slots * int(np.prod(frame_shape))
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (num_slots, *frame_shape, _NO_END, 0)
+        counters = np.ndarray(
+            (3, num_slots), dtype=np.int64, buffer=shm.buf, offset=header.nbytes
+        )
+        counters[0] = -1
+        counters[1] = np.arange(num_slots)
+        counters[2] = 0
+        del header, counters
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """Attaches to a ring created by another process."""
+        try:
+            # The creator unlinks the block; the attaching process must not
+            # have its resource tracker remove it on exit
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching always registers the block; processes
+            # spawned by the creator share its tracker, so that is harmless
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __reduce__(self):
+        return SharedFrameRing.attach, (self.name,)
+
+    def _wait(self, counters: np.ndarray, slot: int, seq: int, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while counters[slot] != seq:
+            if self._header[_STOPPED] or seq >= self._header[_END_SEQ]:
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def acquire(self, seq: int, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Waits until frame seq may be written and returns its slot.
+
+        Decode into the returned view (cap.read(view)) and call commit().
+
+        Returns:
+            Writable view of the slot, or None on timeout, stop() or when
+            seq is past the end of the stream.
+        """
+        slot = seq % self.num_slots
+        if not self._wait(self._free, slot, seq, timeout):
+            return None
+        return self._slots[slot]
+
+    def commit(self, seq: int, timestamp_ms: int) -> None:
+        """Publishes frame seq, written into the slot from acquire()."""
+        slot = seq % self.num_slots
+        self._timestamps[slot] = timestamp_ms
+        self._ready[slot] = seq
+
+    def write(
+        self,
+        seq: int,
+        frame: np.ndarray,
+        timestamp_ms: int,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Copies a frame into its slot and publishes it.
+
+        Returns:
+            False on timeout, stop() or when seq is past the end.
+
+        Raises:
+            ValueError: If the frame does not match frame_shape.
+        """
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match ring {self.frame_shape}")
+        view = self.acquire(seq, timeout)
+        if view is None:
+            return False
+        view[...] = frame
+        self.commit(seq, timestamp_ms)
+        return True
+
+    def read(self, seq: int, timeout: Optional[float] = None) -> Optional[tuple[np.ndarray, int]]:
+        """
+        Waits for frame seq.
+
+        The view stays valid until release(seq); the slot is not written
+        again before that.
+
+        Returns:
+            Tuple of (frame view, timestamp_ms), or None on timeout, stop()
+            or when seq is past the end of the stream.
+        """
+        slot = seq % self.num_slots
+        if not self._wait(self._ready, slot, seq, timeout):
+            return None
+        return self._slots[slot], int(self._timestamps[slot])
+
+    def release(self, seq: int) -> None:
+        """Hands the slot of frame seq back to the writers."""
+        self._free[seq % self.num_slots] = seq + self.num_slots
+
+    def mark_end(self, seq: int) -> None:
+        """Records that the stream has no frame seq (nor any later one)."""
+        self._header[_END_SEQ] = min(int(self._header[_END_SEQ]), seq)
+
+    def ended(self, seq: int) -> bool:
+        """Whether seq is past the end of the stream."""
+        return seq >= self._header[_END_SEQ]
+
+    def stop(self) -> None:
+        """Wakes all waiting writers and readers, which return None/False."""
+        self._header[_STOPPED] = 1
+
+    def close(self) -> None:
+        """
+        Detaches this process; the owner also unlinks the block.
+
+        Frame views still referenced elsewhere keep the mapping alive until
+        they are dropped.
+        """
+        if self._owner:
+            self._shm.unlink()
+        del self._header, self._ready, self._free, self._timestamps, self._slots
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+
+def decode_to_ring(
+    video_path: str,
+    ring: SharedFrameRing,
+    decoder_index: int,
+    decoder_count: int,
+    chunk_frames: int
+) -> None:
+    """
+    Decoder process: decodes its share of a video into the ring.
+
+    The video is cut into chunks of chunk_frames frames, assigned round
+    robin, so decoder_count decoders fill the ring in parallel while the
+    reader consumes it in order. A decoder seeks to each of its chunks,
+    which decodes from the previous keyframe, so chunks should span at
+    least a keyframe interval. Frames are decoded straight into the slots.
+
+    Args:
+        video_path: Video file to decode.
+        ring: Ring shared with the reader.
+        decoder_index: Index of this decoder.
+        decoder_count: Number of decoders.
+        chunk_frames: Frames per chunk.
+    """
+    cap = cv2.VideoCapture(video_path)
+    position = 0
+    chunk = decoder_index
+    try:
+        while True:
+            start = chunk * chunk_frames
+            if position != start:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+                position = start
+            for seq in range(start, start + chunk_frames):
+                view = ring.acquire(seq)
+                if view is None:
+                    return
+                success, frame = cap.read(view)
+                if not success:
+                    ring.mark_end(seq)
+                    return
+                if not np.shares_memory(frame, view):
+                    view[...] = frame
+                ring.commit(seq, int(round(cap.get(cv2.CAP_PROP_POS_MSEC), 3)))
+                position += 1
+            chunk += decoder_count
+    finally:
+        cap.release()
+        ring.close()
@@ -0,0 +1,179 @@
+"""Thread budget module splitting CPU cores across processes and stages."""
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import Optional
+
+import cv2
+
+# Cores at import time, before apply() pins the process, so allocating
+# again in the same process slices the same budget
+_STARTUP_CORES = (
+    sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity')
+    else list(range(os.cpu_count() or 1))
+)
+
+
+@dataclass
+class ThreadAllocation:
+    """
+    Cores and thread counts assigned to one process.
+
+    Attributes:
+        process_index: Index of this process among process_count.
+        process_count: Processes sharing the budget.
+        cores: CPU ids of this process's slice of the budget.
+        opencv_threads: cv2.setNumThreads value.
+        inference_threads: Intra-op threads of the detection backend.
+        background_threads: Cores reserved for stages running alongside the
+            frame loop (video encoder, live grabber).
+        pinned: Whether the process is pinned to its cores.
+        warnings: Oversubscription found while allocating.
+    """
+
+    process_index: int
+    process_count: int
+    cores: list[int]
+    opencv_threads: int
+    inference_threads: int
+    background_threads: int
+    pinned: bool = False
+    warnings: list[str] = field(default_factory=list)
+
+    def summary_line(self) -> str:
+        """Returns the allocation as one log line."""
+        return (
+            f"process={self.process_index + 1}/{self.process_count} "
+            f"cores={','.join(map(str, self.cores))} "
+            f"opencv={self.opencv_threads} inference={self.inference_threads} "
+            f"background={self.background_threads} pinned={self.pinned}"
+        )
+
+
+class ThreadBudget:
+    """
+    Splits the CPU budget across processes and the stages of each process.
+
+    The budget (cpu_budget_cores of the cores this process may run on, or
+    all of them) is cut into cpu_process_count contiguous slices, one per
+    process. Within a slice, stages that run alongside the frame loop (the
+    background video encoder, the live grabber thread) reserve a core each;
+    OpenCV and detector inference run one after the other inside the frame
+    loop, so both default to the remaining cores.
+
+    MediaPipe Tasks does not expose a thread count, and its graphs size
+    their pools from the machine's core count; pinning keeps those threads
+    inside the slice, which is why pinning is on by default.
+
+    Oversubscription (more processes than cores, a budget larger than the
+    available cores, more background stages than spare cores, or explicit
+    thread counts above the slice) is reported in the allocation's warnings
+    and printed.
+
+    Attributes:
+        config: Configuration object with the cpu_* budget settings.
+        allocation: Allocation of the last apply(), or None.
+    """
+
+    def __init__(self, config):
+        """
+        Initializes the ThreadBudget.
+
+        Args:
+            config: Config object containing the cpu_* budget settings.
+        """
+        self.config = config
+        self.allocation: Optional[ThreadAllocation] = None
+
+    @staticmethod
+    def available_cores() -> list[int]:
+        """Returns the CPU ids this process could run on before pinning."""
+        return list(_STARTUP_CORES)
+
+    def budget_cores(self) -> list[int]:
+        """Returns the CPU ids of the whole budget, shared by all processes."""
+        available = self.available_cores()
+        if self.config.cpu_budget_cores is None:
+            return available
+        return available[:max(1, self.config.cpu_budget_cores)]
+
+    def allocate(self) -> ThreadAllocation:
+        """
+        Computes this process's slice and thread counts without applying them.
+
+        Raises:
+            ValueError: If cpu_process_index is outside cpu_process_count.
+        """
+        index = self.config.cpu_process_index
+        count = max(1, self.config.cpu_process_count)
+        if not 0 <= index < count:
+            raise ValueError(f"cpu_process_index {index} outside cpu_process_count {count}")
+
+        warnings = []
+        available = self.available_cores()
+        if self.config.cpu_budget_cores is not None and self.config.cpu_budget_cores > len(available):
+            warnings.append(
+                f"budget of {self.config.cpu_budget_cores} cores exceeds the "
+                f"{len(available)} available"
+            )
+        budget = self.budget_cores()
+        if count > len(budget):
+            warnings.append(f"{count} processes share {len(budget)} cores")
+            cores = [budget[index % len(budget)]]
+        else:
+            cores = budget[index * len(budget) // count:(index + 1) * len(budget) // count]
+
+        background = int(self.config.output_video_path is not None)
+        background += int(self.config.live_source is not None)
+        if background > len(cores) - 1:
+            warnings.append(f"{background} background stages share {len(cores)} cores")
+            background = len(cores) - 1
+        loop_cores = len(cores) - background
+        opencv_threads = self.config.cpu_opencv_threads or loop_cores
+        inference_threads = self.config.cpu_inference_threads or loop_cores
+        if max(opencv_threads, inference_threads) > loop_cores:
+            warnings.append(
+                f"opencv={opencv_threads}/inference={inference_threads} threads "
+                f"on {loop_cores} frame-loop cores"
+            )
+
+        return ThreadAllocation(
+            process_index=index,
+            process_count=count,
+            cores=cores,
+            opencv_threads=opencv_threads,
+            inference_threads=inference_threads,
+            background_threads=background,
+            warnings=warnings
+        )
+
+    def apply(self):
+        """
+        Applies this process's allocation and returns the config to use.
+
+        Sets the OpenCV thread count, pins the process to its cores when
+        cpu_pin_workers is set and the platform supports it, and prints the
+        allocation with any oversubscription warnings. Call it before the
+        detectors are created so their threads inherit the affinity.
+
+        Returns:
+            A copy of the config with detection_num_threads set from the
+            allocation, unless it was set explicitly.
+        """
+        allocation = self.allocate()
+        cv2.setNumThreads(allocation.opencv_threads)
+        if self.config.cpu_pin_workers:
+            if hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, allocation.cores)
+                allocation.pinned = True
+            else:
+                print("[CPU] pinning is not supported on this platform")
+        self.allocation = allocation
+
+        print(f"[CPU] {allocation.summary_line()}")
+        for warning in allocation.warnings:
+            print(f"[CPU] oversubscribed: {warning}")
+
+        if self.config.detection_num_threads is not None:
+            return self.config
+        return replace(self.config, detection_num_threads=allocation.inference_threads)
@@ -1,5 +1,7 @@
 """Video utility functions for video processing."""
 
+from typing import Optional
+
 import cv2
 import numpy as np
 
@@ -7,7 +9,10 @@ import numpy as np
 def apply_orange_mask(
     frame: np.ndarray,
     lower_hsv: tuple[int, int, int],
-    upper_hsv: tuple[int, int, int]
+    upper_hsv: tuple[int, int, int],
+    hsv: Optional[np.ndarray] = None,
+    mask: Optional[np.ndarray] = None,
+    dst: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Applies color masking to isolate orange objects (basketball) in the frame.
@@ -16,16 +21,23 @@ def apply_orange_mask(
         frame: Video frame as numpy array (BGR format).
         lower_hsv: Lower HSV bound tuple for orange color.
         upper_hsv: Upper HSV bound tuple for orange color.
+        hsv: Optional preallocated HSV buffer (same shape as frame).
+        mask: Optional preallocated single-channel mask buffer; holds the
+            binary orange mask on return.
+        dst: Optional preallocated output buffer (same shape as frame).
     
     Returns:
         Masked frame showing only orange-colored regions.
     """
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    lower_orange = np.array(lower_hsv)
-    upper_orange = np.array(upper_hsv)
-    mask = cv2.inRange(hsv, lower_orange, upper_orange)
-    masked_frame = cv2.bitwise_and(frame, frame, mask=mask)
-    return masked_frame
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+    lower_orange = np.array(lower_hsv, dtype=np.uint8)
+    upper_orange = np.array(upper_hsv, dtype=np.uint8)
+    mask = cv2.inRange(hsv, lower_orange, upper_orange, dst=mask)
+    if dst is None:
+        return cv2.bitwise_and(frame, frame, mask=mask)
+    # bitwise_and leaves dst untouched outside the mask, so clear it first
+    dst.fill(0)
+    return cv2.bitwise_and(frame, frame, dst=dst, mask=mask)
 
 
 def clamp_bbox(
@@ -67,6 +79,60 @@ def bbox_orange_ratio(
     return orange_pixels / (w * h)
 
 
+def bbox_mask_ratio(
+    mask: np.ndarray,
+    bbox: tuple[int, int, int, int]
+) -> float:
+    """
+    Returns ratio of non-zero pixels inside bbox of a single-channel mask.
+    
+    Equivalent to bbox_orange_ratio on the masked frame, without the
+    per-ROI grayscale conversion.
+    """
+    x, y, w, h = clamp_bbox(bbox, mask.shape)
+    if w == 0 or h == 0:
+        return 0.0
+    return cv2.countNonZero(mask[y:y + h, x:x + w]) / (w * h)
+
+
+def mask_integral(
+    mask: np.ndarray,
+    binary: Optional[np.ndarray] = None,
+    integral: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Builds a summed-area table counting non-zero mask pixels.
+    
+    Args:
+        mask: Single-channel 0/255 mask.
+        binary: Optional preallocated buffer for the 0/1 mask (mask shape).
+        integral: Optional preallocated int32 buffer of shape (h + 1, w + 1).
+    
+    Returns:
+        Summed-area table where integral[y, x] is the number of mask pixels
+        above and left of (x, y).
+    """
+    _, binary = cv2.threshold(mask, 0, 1, cv2.THRESH_BINARY, dst=binary)
+    return cv2.integral(binary, sum=integral, sdepth=cv2.CV_32S)
+
+
+def bbox_integral_ratio(
+    integral: np.ndarray,
+    bbox: tuple[int, int, int, int]
+) -> float:
+    """Returns ratio of mask pixels inside bbox in O(1) from a summed-area table."""
+    height, width = integral.shape[0] - 1, integral.shape[1] - 1
+    x, y, w, h = clamp_bbox(bbox, (height, width))
+    if w == 0 or h == 0:
+        return 0.0
+    x2, y2 = x + w, y + h
+    count = (
+        int(integral[y2, x2]) - int(integral[y, x2]) -
+        int(integral[y2, x]) + int(integral[y, x])
+    )
+    return count / (w * h)
+
+
 def bbox_iou(
     bbox_a: tuple[int, int, int, int],
     bbox_b: tuple[int, int, int, int]
@@ -89,3 +155,45 @@ def bbox_iou(
     if union_area <= 0:
         return 0.0
     return inter_area / union_area
+
+
+def bbox_center(bbox: tuple[int, int, int, int]) -> tuple[int, int]:
+    """Returns the integer center of a bbox."""
+    x, y, w, h = bbox
+    return (x + w // 2, y + h // 2)
+
+
+def match_nearest(
+    points_a: list[tuple[float, float]],
+    points_b: list[tuple[float, float]],
+    max_distance: float
+) -> list[tuple[int, int]]:
+    """
+    Greedily pairs points of two sets, closest pairs first.
+
+    Args:
+        points_a: First point set.
+        points_b: Second point set.
+        max_distance: Pairs farther apart than this are never matched.
+
+    Returns:
+        List of (index_a, index_b) pairs; every index appears at most once.
+    """
+    pairs = sorted(
+        (
+            ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5, i, j
+        )
+        for i, a in enumerate(points_a)
+        for j, b in enumerate(points_b)
+    )
+    used_a, used_b = set(), set()
+    matches = []
+    for distance, i, j in pairs:
+        if distance > max_distance:
+            break
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        matches.append((i, j))
+    return matches
@@ -0,0 +1,174 @@
+"""Annotated video writer module with background encoding."""
+
+import queue
+import subprocess
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class AnnotatedVideoWriter:
+    """
+    Writes annotated frames to a video file on a background thread.
+
+    Frames are handed over through a bounded queue so encoding never runs
+    on the analysis loop. When the queue is full, frames are dropped (and
+    counted) unless block_when_full is set.
+
+    Two backends are supported:
+        - 'opencv': cv2.VideoWriter with a FourCC codec (e.g. 'mp4v', 'avc1').
+        - 'ffmpeg': raw BGR frames piped to an ffmpeg process, which allows
+          hardware encoders such as 'h264_videotoolbox', 'h264_nvenc' or
+          'h264_qsv' as well as 'libx264'.
+
+    Attributes:
+        output_path: Path of the output video file.
+        fps: Output frame rate (source FPS divided by frame_stride).
+        frames_written: Number of frames encoded so far.
+        frames_dropped: Number of frames dropped because the queue was full.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        fps: float,
+        codec: str = 'mp4v',
+        frame_size: Optional[tuple[int, int]] = None,
+        frame_stride: int = 1,
+        queue_size: int = 64,
+        backend: str = 'opencv',
+        block_when_full: bool = False
+    ):
+        """
+        Initializes the AnnotatedVideoWriter and starts its encoder thread.
+
+        Args:
+            output_path: Path of the output video file.
+            fps: Frame rate of the source frames.
+            codec: FourCC code for 'opencv', or ffmpeg encoder name for 'ffmpeg'.
+            frame_size: Output (width, height); None keeps the source size.
+            frame_stride: Write every Nth submitted frame.
+            queue_size: Maximum number of frames waiting to be encoded.
+            backend: 'opencv' or 'ffmpeg'.
+            block_when_full: Block the caller instead of dropping frames when
+                the queue is full.
+
+        Raises:
+            ValueError: If backend or frame_stride is invalid.
+        """
+        if backend not in ('opencv', 'ffmpeg'):
+            raise ValueError(f"Unknown video writer backend: {backend}")
+        if frame_stride < 1:
+            raise ValueError("frame_stride must be at least 1")
+        self.output_path = output_path
+        self.fps = fps / frame_stride
+        self.codec = codec
+        self.frame_size = frame_size
+        self.frame_stride = frame_stride
+        self.backend = backend
+        self.block_when_full = block_when_full
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._ffmpeg: Optional[subprocess.Popen] = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray, frame_index: int) -> None:
+        """
+        Queues a frame for encoding.
+
+        The writer takes ownership of the frame; the caller must not draw on
+        it afterwards.
+
+        Args:
+            frame: Annotated BGR frame.
+            frame_index: Index of the frame in the source, used for striding.
+        """
+        if frame_index % self.frame_stride != 0:
+            return
+        if self.block_when_full:
+            self._queue.put(frame)
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _open(self, width: int, height: int) -> None:
+        if self.backend == 'opencv':
+            fourcc = cv2.VideoWriter_fourcc(*self.codec)
+            self._writer = cv2.VideoWriter(
+                self.output_path, fourcc, self.fps, (width, height)
+            )
+            if not self._writer.isOpened():
+                raise RuntimeError(
+                    f"Could not open video writer for {self.output_path} "
+                    f"with codec {self.codec}"
+                )
+        else:
+            command = [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+                '-s', f"{width}x{height}", '-r', f"{self.fps}",
+                '-i', '-',
+                '-c:v', self.codec, '-pix_fmt', 'yuv420p',
+                self.output_path
+            ]
+            self._ffmpeg = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def _encode_loop(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                if self.frame_size is not None:
+                    frame = cv2.resize(
+                        frame, self.frame_size, interpolation=cv2.INTER_AREA
+                    )
+                if self._writer is None and self._ffmpeg is None:
+                    height, width = frame.shape[:2]
+                    self._open(width, height)
+                if self._writer is not None:
+                    self._writer.write(frame)
+                else:
+                    self._ffmpeg.stdin.write(frame.tobytes())
+                self.frames_written += 1
+            except (OSError, RuntimeError, cv2.error) as error:
+                self._error = error
+
+    def close(self) -> None:
+        """
+        Flushes queued frames and finalizes the output file.
+
+        Raises:
+            RuntimeError: If encoding failed on the background thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if self._ffmpeg is not None:
+            self._ffmpeg.stdin.close()
+            self._ffmpeg.wait()
+            self._ffmpeg = None
+        if self._error is not None:
+            raise RuntimeError(
+                f"Annotated video encoding failed: {self._error}"
+            ) from self._error
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()